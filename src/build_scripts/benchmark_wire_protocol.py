@@ -0,0 +1,125 @@
+"""Compare the cost of encoding and decoding layout messages with each subprotocol
+
+Updates are taken from a table which re-renders all of its rows after each event. Run
+with ``hatch run python:benchmark_wire_protocol``.
+"""
+
+import asyncio
+import timeit
+import zlib
+
+import msgpack
+import orjson
+
+import reactpy
+from reactpy.core._compact import CompactModelDecoder, CompactModelEncoder
+from reactpy.core.layout import Layout
+from reactpy.executors.asgi.middleware import COMPRESSION_DICTIONARY
+from reactpy.testing import StaticEventHandler
+
+ROWS = 500
+UPDATES = 20
+REPEAT = 5
+
+handler = StaticEventHandler()
+
+
+@reactpy.component
+def Table():
+    count, set_count = reactpy.hooks.use_state(0)
+    return reactpy.html.table(
+        reactpy.html.button({"onClick": handler.use(lambda: set_count(count + 1))}),
+        reactpy.html.tbody(
+            [
+                reactpy.html.tr(
+                    {"key": i, "className": "row", "data-count": count},
+                    reactpy.html.td(f"Row {i}"),
+                    reactpy.html.td({"style": {"textAlign": "right"}}, i * count),
+                    reactpy.html.td(round(i / (count + 1), 3)),
+                )
+                for i in range(ROWS)
+            ]
+        ),
+    )
+
+
+async def render_updates() -> list[dict]:
+    updates = []
+    async with Layout(Table()) as layout:
+        updates.append(await layout.render())
+        for _ in range(UPDATES):
+            await layout.deliver(
+                {"type": "layout-event", "target": handler.target, "data": []}
+            )
+            updates.append(await layout.render())
+    return updates
+
+
+def compact(encode, decode):
+    """Make a codec which sends models in their compact form"""
+
+    def make_codec():
+        encoder = CompactModelEncoder()
+        decoder = CompactModelDecoder()
+        return (
+            lambda update: encode(encoder.encode_message(update)),
+            lambda frame: decoder.decode_message(decode(frame)),
+        )
+
+    return make_codec
+
+
+def deflate(encode, decode):
+    """Make a codec which compresses encoded messages with one DEFLATE stream"""
+
+    def make_codec():
+        compressor = zlib.compressobj(
+            wbits=-zlib.MAX_WBITS, zdict=COMPRESSION_DICTIONARY
+        )
+        decompressor = zlib.decompressobj(
+            wbits=-zlib.MAX_WBITS, zdict=COMPRESSION_DICTIONARY
+        )
+
+        def compress(update):
+            message = compressor.compress(encode(update))
+            return message + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        return compress, lambda frame: decode(decompressor.decompress(frame))
+
+    return make_codec
+
+
+def measure(name, make_codec, updates):
+    # codecs are made for each run since compressed streams keep state between frames
+    encode, _ = make_codec()
+    frames = [encode(u) for u in updates]
+    size = sum(len(f) for f in frames)
+
+    def encode_all():
+        encode, _ = make_codec()
+        return [encode(u) for u in updates]
+
+    def decode_all():
+        _, decode = make_codec()
+        return [decode(f) for f in frames]
+
+    encode_time = min(timeit.repeat(encode_all, number=1, repeat=REPEAT))
+    decode_time = min(timeit.repeat(decode_all, number=1, repeat=REPEAT))
+    print(  # noqa: T201
+        f"{name:<24}{size:>12,}{encode_time * 1000:>14.2f}{decode_time * 1000:>14.2f}"
+    )
+
+
+def json_encode(update):
+    return orjson.dumps(update).decode()
+
+
+updates = asyncio.run(render_updates())
+print(f"{len(updates)} updates of a table with {ROWS} rows\n")  # noqa: T201
+print(f"{'subprotocol':<24}{'bytes':>12}{'encode (ms)':>14}{'decode (ms)':>14}")  # noqa: T201
+measure("reactpy.json", lambda: (json_encode, orjson.loads), updates)
+measure("reactpy.msgpack", lambda: (msgpack.packb, msgpack.unpackb), updates)
+measure("reactpy.json+compact", compact(json_encode, orjson.loads), updates)
+measure("reactpy.msgpack+compact", compact(msgpack.packb, msgpack.unpackb), updates)
+measure("reactpy.json+deflate", deflate(orjson.dumps, orjson.loads), updates)
+measure("reactpy.msgpack+deflate", deflate(msgpack.packb, msgpack.unpackb), updates)
@@ -1,8 +1,11 @@
 import logger from "./logger";
+import { MessageCodec, SUBPROTOCOLS } from "./protocol";
 import type {
   ReactPyClientInterface,
   ReactPyModule,
   GenericReactPyClientProps,
+  MultiplexedReactPyClientProps,
+  ReconnectOptions,
   ReactPyUrls,
 } from "./types";
 import { createReconnectingWebSocket } from "./websocket";
@@ -59,6 +62,7 @@ export class ReactPyClient
   urls: ReactPyUrls;
   socket: { current?: WebSocket };
   mountElement: HTMLElement;
+  private readonly codec = new MessageCodec();
 
   constructor(props: GenericReactPyClientProps) {
     super();
@@ -67,17 +71,142 @@ export class ReactPyClient
     this.mountElement = props.mountElement;
     this.socket = createReconnectingWebSocket({
       url: this.urls.componentUrl,
+      protocols: SUBPROTOCOLS,
       readyPromise: this.ready,
       ...props.reconnectOptions,
-      onMessage: async ({ data }) => this.handleIncoming(JSON.parse(data)),
+      onOpen: () => this.codec.reset(),
+      onMessage: async ({ data }) =>
+        this.handleIncoming(
+          this.codec.decode(this.socket.current?.protocol || "", data),
+        ),
     });
   }
 
   sendMessage(message: any): void {
-    this.socket.current?.send(JSON.stringify(message));
+    const socket = this.socket.current;
+    socket?.send(this.codec.encode(socket.protocol, message));
   }
 
   loadModule(moduleName: string): Promise<ReactPyModule> {
     return import(`${this.urls.jsModulesPath}${moduleName}`);
   }
 }
+
+/**
+ * A client for one of several root components which are rendered over one socket.
+ *
+ * Messages to and from the server are tagged with the `mountId` of the client.
+ */
+export class MultiplexedReactPyClient
+  extends BaseReactPyClient
+  implements ReactPyClientInterface
+{
+  urls: ReactPyUrls;
+  mountElement: HTMLElement;
+  mountId: string;
+  componentPath: string;
+  connection: MultiplexedConnection;
+
+  constructor(props: MultiplexedReactPyClientProps) {
+    super();
+
+    this.urls = props.urls;
+    this.mountElement = props.mountElement;
+    this.mountId = props.mountId;
+    this.componentPath = props.componentPath;
+    this.connection = getMultiplexedConnection(
+      this.urls.componentUrl,
+      props.reconnectOptions,
+    );
+    this.ready.then(() => this.connection.attach(this));
+  }
+
+  sendMessage(message: any): void {
+    this.connection.send({ ...message, mountId: this.mountId });
+  }
+
+  loadModule(moduleName: string): Promise<ReactPyModule> {
+    return import(`${this.urls.jsModulesPath}${moduleName}`);
+  }
+
+  receive(message: any): void {
+    if (message.type === "layout-mount-error") {
+      logger.error(`Failed to mount ${this.componentPath}:`, message.error);
+      return;
+    }
+    this.handleIncoming(message);
+  }
+}
+
+/**
+ * A socket shared by every multiplexed client with the same URL.
+ *
+ * Clients are mounted once they are ready, and again whenever the socket reconnects.
+ */
+export class MultiplexedConnection {
+  socket: { current?: WebSocket };
+  private readonly clients = new Map<string, MultiplexedReactPyClient>();
+  private readonly codec = new MessageCodec();
+  private resolveReady: (value: undefined) => void = () => {};
+
+  constructor(url: URL, reconnectOptions: ReconnectOptions) {
+    const ready = new Promise<void>((resolve) => (this.resolveReady = resolve));
+    this.socket = createReconnectingWebSocket({
+      url,
+      protocols: SUBPROTOCOLS,
+      readyPromise: ready,
+      ...reconnectOptions,
+      onOpen: () => {
+        this.codec.reset();
+        this.clients.forEach((client) => this.mount(client));
+      },
+      onMessage: async ({ data }) => {
+        const message = this.codec.decode(
+          this.socket.current?.protocol || "",
+          data,
+        );
+        const client = this.clients.get(message.mountId);
+        if (client) {
+          client.receive(message);
+        } else {
+          logger.warn("Received message for unknown mount", message);
+        }
+      },
+    });
+  }
+
+  attach(client: MultiplexedReactPyClient): void {
+    this.clients.set(client.mountId, client);
+    this.resolveReady(undefined);
+    if (this.socket.current?.readyState === WebSocket.OPEN) {
+      this.mount(client);
+    }
+  }
+
+  send(message: any): void {
+    const socket = this.socket.current;
+    socket?.send(this.codec.encode(socket.protocol, message));
+  }
+
+  private mount(client: MultiplexedReactPyClient): void {
+    this.send({
+      type: "layout-mount",
+      mountId: client.mountId,
+      componentPath: client.componentPath,
+    });
+  }
+}
+
+const multiplexedConnections = new Map<string, MultiplexedConnection>();
+
+function getMultiplexedConnection(
+  url: URL,
+  reconnectOptions: ReconnectOptions,
+): MultiplexedConnection {
+  let connection = multiplexedConnections.get(url.href);
+  if (!connection) {
+    connection = new MultiplexedConnection(url, reconnectOptions);
+    multiplexedConnections.set(url.href, connection);
+  }
+  return connection;
+}
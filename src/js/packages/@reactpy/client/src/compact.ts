@@ -0,0 +1,139 @@
+// Expands the compact form of models which the server sends when a "+compact"
+// subprotocol is negotiated. This must match `reactpy.core._compact` on the server.
+
+const ELEMENT_FIELDS: { [key: string]: string } = {
+  t: "tagName",
+  k: "key",
+  a: "attributes",
+  c: "children",
+  e: "eventHandlers",
+  j: "inlineJavaScript",
+  i: "importSource",
+  x: "error",
+};
+
+const EVENT_HANDLER_FIELDS: { [key: string]: string } = {
+  t: "target",
+  p: "preventDefault",
+  s: "stopPropagation",
+  r: "throttle",
+  d: "debounce",
+  f: "fields",
+};
+
+export class CompactModelDecoder {
+  // strings referred to by index, which are kept for the lifetime of a connection
+  private readonly strings: string[] = [];
+
+  decodeMessage(message: any): any {
+    if (message.type === "layout-update-batch") {
+      return {
+        ...message,
+        updates: message.updates.map((u: any) => this.decodeUpdate(u)),
+      };
+    }
+    if (message.type === "layout-update") {
+      return this.decodeUpdate(message);
+    }
+    return message;
+  }
+
+  private decodeUpdate({ strings, ...update }: any): any {
+    if (strings) {
+      this.strings.push(...strings);
+    }
+    const { model, changes } = update;
+    if (model !== undefined) {
+      update.model = this.decodeElement(model);
+    }
+    if (changes !== undefined) {
+      update.changes = changes.map((c: any) => this.decodeChange(c));
+    }
+    return update;
+  }
+
+  private decodeChange(change: any): any {
+    if (!("vdom" in change)) {
+      return change;
+    }
+    const { vdom, ...decoded } = change;
+    decoded.value = Array.isArray(vdom)
+      ? this.decodeChildren(vdom)
+      : this.decodeElement(vdom);
+    return decoded;
+  }
+
+  private decodeElement(element: any): any {
+    const decoded: any = {};
+    for (const [key, value] of Object.entries(element)) {
+      const field = ELEMENT_FIELDS[key] || key;
+      switch (field) {
+        case "tagName":
+          decoded.tagName = this.deref(value);
+          break;
+        case "attributes":
+          decoded.attributes = this.decodeAttributes(value as any[]);
+          break;
+        case "children":
+          decoded.children = this.decodeChildren(value as any[]);
+          break;
+        case "eventHandlers":
+          decoded.eventHandlers = this.decodeEventHandlers(value as any[]);
+          break;
+        default:
+          decoded[field] = value;
+      }
+    }
+    return decoded;
+  }
+
+  private decodeChildren(children: any[]): any[] {
+    return children.map((child) =>
+      typeof child === "object" && child !== null
+        ? this.decodeElement(child)
+        : child,
+    );
+  }
+
+  private decodeAttributes(attributes: any[]): any {
+    const decoded: any = {};
+    for (let i = 0; i < attributes.length; i += 2) {
+      const name = this.deref(attributes[i]);
+      let value = attributes[i + 1];
+      if (
+        (name === "style" || name === "className") &&
+        Array.isArray(value) &&
+        value.length === 1
+      ) {
+        // a class name or style which the server did not encode
+        value = value[0];
+      } else if (name === "style") {
+        const style: any = {};
+        for (let j = 0; j < value.length; j += 2) {
+          style[this.deref(value[j])] = value[j + 1];
+        }
+        value = style;
+      } else if (name === "className") {
+        value = this.deref(value);
+      }
+      decoded[name] = value;
+    }
+    return decoded;
+  }
+
+  private decodeEventHandlers(handlers: any[]): any {
+    const decoded: any = {};
+    for (let i = 0; i < handlers.length; i += 2) {
+      const handler: any = { preventDefault: false, stopPropagation: false };
+      for (const [key, value] of Object.entries(handlers[i + 1])) {
+        handler[EVENT_HANDLER_FIELDS[key] || key] = value;
+      }
+      decoded[this.deref(handlers[i])] = handler;
+    }
+    return decoded;
+  }
+
+  private deref(ref: any): any {
+    return typeof ref === "number" ? this.strings[ref] : ref;
+  }
+}
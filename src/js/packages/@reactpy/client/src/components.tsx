@@ -1,4 +1,3 @@
-import { set as setJsonPointer } from "json-pointer";
 import type { MutableRefObject } from "preact/compat";
 import {
   createContext,
@@ -10,10 +9,12 @@ import {
 import { useContext, useEffect, useRef, useState } from "preact/hooks";
 import type {
   ImportSourceBinding,
+  LayoutUpdateMessage,
   ReactPyComponent,
   ReactPyVdom,
 } from "./types";
 import { createAttributes, createChildren, loadImportSource } from "./vdom";
+import { applyLayoutUpdate } from "./patch";
 import type { ReactPyClient } from "./client";
 
 const ClientContext = createContext<ReactPyClient>(null as any);
@@ -22,18 +23,29 @@ export function Layout(props: { client: ReactPyClient }): JSX.Element {
   const currentModel: ReactPyVdom = useState({ tagName: "" })[0];
   const forceUpdate = useForceUpdate();
 
-  useEffect(
-    () =>
-      props.client.onMessage("layout-update", ({ path, model }) => {
-        if (path === "") {
-          Object.assign(currentModel, model);
-        } else {
-          setJsonPointer(currentModel, path, model);
-        }
+  useEffect(() => {
+    const unsubscribeUpdate = props.client.onMessage(
+      "layout-update",
+      (message) => {
+        applyLayoutUpdate(currentModel, message);
         forceUpdate();
-      }),
-    [currentModel, props.client],
-  );
+      },
+    );
+    // apply every update in a batch before rendering once
+    const unsubscribeBatch = props.client.onMessage(
+      "layout-update-batch",
+      ({ updates }) => {
+        updates.forEach((message: LayoutUpdateMessage) =>
+          applyLayoutUpdate(currentModel, message),
+        );
+        forceUpdate();
+      },
+    );
+    return () => {
+      unsubscribeUpdate();
+      unsubscribeBatch();
+    };
+  }, [currentModel, props.client]);
 
   return (
     <ClientContext.Provider value={props.client}>
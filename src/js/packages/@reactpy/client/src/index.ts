@@ -1,6 +1,7 @@
 export * from "./client";
 export * from "./components";
 export * from "./mount";
+export * from "./patch";
 export * from "./types";
 export * from "./vdom";
 export * from "./websocket";
@@ -0,0 +1,245 @@
+// Decompresses the raw DEFLATE stream of a connection. The server flushes the stream
+// after each message, so every message holds whole blocks. These may refer back to the
+// output of earlier messages, or to the preset dictionary before them.
+
+const WINDOW_SIZE = 32768;
+const LENGTH_BASE = [
+  3, 4, 5, 6, 7, 8, 9, 10, 11, 13, 15, 17, 19, 23, 27, 31, 35, 43, 51, 59, 67,
+  83, 99, 115, 131, 163, 195, 227, 258,
+];
+const LENGTH_EXTRA = [
+  0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3, 4, 4, 4, 4, 5, 5,
+  5, 5, 0,
+];
+const DISTANCE_BASE = [
+  1, 2, 3, 4, 5, 7, 9, 13, 17, 25, 33, 49, 65, 97, 129, 193, 257, 385, 513, 769,
+  1025, 1537, 2049, 3073, 4097, 6145, 8193, 12289, 16385, 24577,
+];
+const DISTANCE_EXTRA = [
+  0, 0, 0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6, 7, 7, 8, 8, 9, 9, 10, 10, 11,
+  11, 12, 12, 13, 13,
+];
+const CODE_LENGTH_ORDER = [
+  16, 17, 18, 0, 8, 7, 9, 6, 10, 5, 11, 4, 12, 3, 13, 2, 14, 1, 15,
+];
+
+type Huffman = { counts: Uint16Array; symbols: Uint16Array };
+
+function buildHuffman(lengths: ArrayLike<number>): Huffman {
+  /* Make a canonical Huffman code from the code length of each symbol */
+  const counts = new Uint16Array(16);
+  for (let i = 0; i < lengths.length; i++) {
+    counts[lengths[i]]++;
+  }
+  counts[0] = 0;
+  const offsets = new Uint16Array(16);
+  for (let length = 1; length < 15; length++) {
+    offsets[length + 1] = offsets[length] + counts[length];
+  }
+  const symbols = new Uint16Array(lengths.length);
+  for (let i = 0; i < lengths.length; i++) {
+    if (lengths[i]) {
+      symbols[offsets[lengths[i]]++] = i;
+    }
+  }
+  return { counts, symbols };
+}
+
+const FIXED_LITERALS = buildHuffman(
+  new Uint8Array(288).fill(8).fill(9, 144, 256).fill(7, 256, 280),
+);
+const FIXED_DISTANCES = buildHuffman(new Array(30).fill(5));
+
+export class Inflater {
+  // the end of the output so far, which later blocks may copy from
+  private window: Uint8Array;
+  private input = new Uint8Array(0);
+  private inputOffset = 0;
+  private bitBuffer = 0;
+  private bitCount = 0;
+  private output = new Uint8Array(0);
+  private outputOffset = 0;
+
+  constructor(dictionary: Uint8Array) {
+    this.window = dictionary.slice(-WINDOW_SIZE);
+  }
+
+  inflate(input: Uint8Array): Uint8Array {
+    this.input = input;
+    this.inputOffset = 0;
+    this.bitBuffer = 0;
+    this.bitCount = 0;
+    const start = this.window.length;
+    this.output = new Uint8Array(start + input.length * 4 + 1024);
+    this.output.set(this.window);
+    this.outputOffset = start;
+
+    while (this.inputOffset < input.length) {
+      const isFinal = this.readBits(1);
+      const type = this.readBits(2);
+      if (type === 0) {
+        this.inflateStoredBlock();
+      } else if (type === 1) {
+        this.inflateBlock(FIXED_LITERALS, FIXED_DISTANCES);
+      } else if (type === 2) {
+        const [literals, distances] = this.readDynamicCodes();
+        this.inflateBlock(literals, distances);
+      } else {
+        throw new Error("Invalid DEFLATE block type");
+      }
+      if (isFinal) {
+        break;
+      }
+    }
+
+    const end = this.outputOffset;
+    this.window = this.output.slice(Math.max(0, end - WINDOW_SIZE), end);
+    return this.output.slice(start, end);
+  }
+
+  private inflateStoredBlock(): void {
+    // stored blocks begin at the next byte
+    this.bitBuffer = 0;
+    this.bitCount = 0;
+    const offset = this.inputOffset;
+    if (offset + 4 > this.input.length) {
+      throw new Error("Unexpected end of DEFLATE data");
+    }
+    const length = this.input[offset] | (this.input[offset + 1] << 8);
+    const start = offset + 4;
+    if (start + length > this.input.length) {
+      throw new Error("Unexpected end of DEFLATE data");
+    }
+    this.reserve(length);
+    this.output.set(
+      this.input.subarray(start, start + length),
+      this.outputOffset,
+    );
+    this.outputOffset += length;
+    this.inputOffset = start + length;
+  }
+
+  private inflateBlock(literals: Huffman, distances: Huffman): void {
+    while (true) {
+      const symbol = this.readSymbol(literals);
+      if (symbol < 256) {
+        this.reserve(1);
+        this.output[this.outputOffset++] = symbol;
+      } else if (symbol === 256) {
+        return;
+      } else {
+        const lengthIndex = symbol - 257;
+        if (lengthIndex >= LENGTH_BASE.length) {
+          throw new Error("Invalid DEFLATE length");
+        }
+        const length =
+          LENGTH_BASE[lengthIndex] + this.readBits(LENGTH_EXTRA[lengthIndex]);
+        const distanceIndex = this.readSymbol(distances);
+        if (distanceIndex >= DISTANCE_BASE.length) {
+          throw new Error("Invalid DEFLATE distance");
+        }
+        const distance =
+          DISTANCE_BASE[distanceIndex] +
+          this.readBits(DISTANCE_EXTRA[distanceIndex]);
+        if (distance > this.outputOffset) {
+          throw new Error("DEFLATE distance is too far back");
+        }
+        this.reserve(length);
+        // copied one byte at a time since the source may overlap the destination
+        const from = this.outputOffset - distance;
+        for (let i = 0; i < length; i++) {
+          this.output[this.outputOffset + i] = this.output[from + i];
+        }
+        this.outputOffset += length;
+      }
+    }
+  }
+
+  private readDynamicCodes(): [Huffman, Huffman] {
+    const literalCount = this.readBits(5) + 257;
+    const distanceCount = this.readBits(5) + 1;
+    const codeLengthCount = this.readBits(4) + 4;
+
+    const codeLengthLengths = new Uint8Array(19);
+    for (let i = 0; i < codeLengthCount; i++) {
+      codeLengthLengths[CODE_LENGTH_ORDER[i]] = this.readBits(3);
+    }
+    const codeLengths = buildHuffman(codeLengthLengths);
+
+    const lengths = new Uint8Array(literalCount + distanceCount);
+    let index = 0;
+    while (index < lengths.length) {
+      const symbol = this.readSymbol(codeLengths);
+      if (symbol < 16) {
+        lengths[index++] = symbol;
+        continue;
+      }
+      let length = 0;
+      let repeat: number;
+      if (symbol === 16) {
+        if (index === 0) {
+          throw new Error("Invalid DEFLATE code lengths");
+        }
+        length = lengths[index - 1];
+        repeat = 3 + this.readBits(2);
+      } else if (symbol === 17) {
+        repeat = 3 + this.readBits(3);
+      } else {
+        repeat = 11 + this.readBits(7);
+      }
+      if (index + repeat > lengths.length) {
+        throw new Error("Invalid DEFLATE code lengths");
+      }
+      lengths.fill(length, index, index + repeat);
+      index += repeat;
+    }
+
+    return [
+      buildHuffman(lengths.subarray(0, literalCount)),
+      buildHuffman(lengths.subarray(literalCount)),
+    ];
+  }
+
+  private readSymbol(huffman: Huffman): number {
+    /* Read one code, a bit at a time, of a canonical Huffman code */
+    let code = 0;
+    let first = 0;
+    let index = 0;
+    for (let length = 1; length < 16; length++) {
+      code |= this.readBits(1);
+      const count = huffman.counts[length];
+      if (code - first < count) {
+        return huffman.symbols[index + code - first];
+      }
+      index += count;
+      first = (first + count) << 1;
+      code <<= 1;
+    }
+    throw new Error("Invalid DEFLATE code");
+  }
+
+  private readBits(count: number): number {
+    while (this.bitCount < count) {
+      if (this.inputOffset >= this.input.length) {
+        throw new Error("Unexpected end of DEFLATE data");
+      }
+      this.bitBuffer |= this.input[this.inputOffset++] << this.bitCount;
+      this.bitCount += 8;
+    }
+    const bits = this.bitBuffer & ((1 << count) - 1);
+    this.bitBuffer >>>= count;
+    this.bitCount -= count;
+    return bits;
+  }
+
+  private reserve(size: number): void {
+    if (this.outputOffset + size <= this.output.length) {
+      return;
+    }
+    const output = new Uint8Array(
+      Math.max(this.output.length * 2, this.outputOffset + size),
+    );
+    output.set(this.output);
+    this.output = output;
+  }
+}
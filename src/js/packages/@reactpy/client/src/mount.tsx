@@ -1,14 +1,18 @@
 import { render } from "preact";
-import { ReactPyClient } from "./client";
+import { MultiplexedReactPyClient, ReactPyClient } from "./client";
 import { Layout } from "./components";
 import type { MountProps } from "./types";
 
+let nextMountId = 0;
+
 export function mountReactPy(props: MountProps) {
   // WebSocket route for component rendering
   const wsProtocol = `ws${window.location.protocol === "https:" ? "s" : ""}:`;
   const wsOrigin = `${wsProtocol}//${window.location.host}`;
   const componentUrl = new URL(
-    `${wsOrigin}${props.pathPrefix}${props.componentPath || ""}`,
+    props.multiplex
+      ? `${wsOrigin}${props.pathPrefix}multiplex`
+      : `${wsOrigin}${props.pathPrefix}${props.componentPath || ""}`,
   );
 
   // Embed the initial HTTP path into the WebSocket URL
@@ -21,7 +25,7 @@ export function mountReactPy(props: MountProps) {
   }
 
   // Configure a new ReactPy client
-  const client = new ReactPyClient({
+  const clientProps = {
     urls: {
       componentUrl: componentUrl,
       jsModulesPath: `${window.location.origin}${props.pathPrefix}modules/`,
@@ -33,7 +37,14 @@ export function mountReactPy(props: MountProps) {
       backoffMultiplier: props.reconnectBackoffMultiplier || 1.25,
     },
     mountElement: props.mountElement,
-  });
+  };
+  const client = props.multiplex
+    ? new MultiplexedReactPyClient({
+        ...clientProps,
+        mountId: String(nextMountId++),
+        componentPath: props.componentPath || "",
+      })
+    : new ReactPyClient(clientProps);
 
   // Start rendering the component
   render(<Layout client={client} />, props.mountElement);
@@ -0,0 +1,284 @@
+// A MessagePack codec for the JSON-like values of layout messages. Undefined values
+// are left out of maps and sent as nil within arrays, as JSON.stringify would do.
+
+const textEncoder = new TextEncoder();
+const textDecoder = new TextDecoder();
+
+export function encode(value: any): Uint8Array {
+  const encoder = new Encoder();
+  encoder.write(value);
+  return encoder.result();
+}
+
+export function decode(bytes: Uint8Array): any {
+  const decoder = new Decoder(bytes);
+  const value = decoder.read();
+  if (decoder.offset !== bytes.length) {
+    throw new Error("Unexpected data after MessagePack value");
+  }
+  return value;
+}
+
+class Encoder {
+  private bytes = new Uint8Array(1024);
+  private view = new DataView(this.bytes.buffer);
+  private offset = 0;
+
+  result(): Uint8Array {
+    return this.bytes.slice(0, this.offset);
+  }
+
+  write(value: any): void {
+    if (value === null || value === undefined) {
+      this.writeByte(0xc0);
+    } else if (value === false) {
+      this.writeByte(0xc2);
+    } else if (value === true) {
+      this.writeByte(0xc3);
+    } else if (typeof value === "number") {
+      this.writeNumber(value);
+    } else if (typeof value === "string") {
+      this.writeString(value);
+    } else if (value instanceof Uint8Array) {
+      this.writeHeader(value.length, 0xc4, 0xc5, 0xc6);
+      this.writeBytes(value);
+    } else if (Array.isArray(value)) {
+      this.writeArrayHeader(value.length);
+      for (const item of value) {
+        this.write(item);
+      }
+    } else if (typeof value.toJSON === "function") {
+      this.write(value.toJSON());
+    } else {
+      const entries = Object.entries(value).filter(([, v]) => v !== undefined);
+      if (entries.length < 16) {
+        this.writeByte(0x80 | entries.length);
+      } else {
+        this.writeHeader(entries.length, null, 0xde, 0xdf);
+      }
+      for (const [key, item] of entries) {
+        this.writeString(key);
+        this.write(item);
+      }
+    }
+  }
+
+  private writeNumber(value: number): void {
+    if (!Number.isSafeInteger(value)) {
+      this.reserve(9);
+      this.view.setUint8(this.offset, 0xcb);
+      this.view.setFloat64(this.offset + 1, value);
+      this.offset += 9;
+    } else if (value >= 0 && value < 128) {
+      this.writeByte(value);
+    } else if (value < 0 && value >= -32) {
+      this.writeByte(value & 0xff);
+    } else if (value >= 0) {
+      this.writeHeader(value, 0xcc, 0xcd, 0xce, 0xcf);
+    } else if (value >= -0x80) {
+      this.writeFixed(0xd0, 1, (o) => this.view.setInt8(o, value));
+    } else if (value >= -0x8000) {
+      this.writeFixed(0xd1, 2, (o) => this.view.setInt16(o, value));
+    } else if (value >= -0x80000000) {
+      this.writeFixed(0xd2, 4, (o) => this.view.setInt32(o, value));
+    } else {
+      this.writeFixed(0xd3, 8, (o) => this.view.setBigInt64(o, BigInt(value)));
+    }
+  }
+
+  private writeString(value: string): void {
+    const bytes = textEncoder.encode(value);
+    if (bytes.length < 32) {
+      this.writeByte(0xa0 | bytes.length);
+    } else {
+      this.writeHeader(bytes.length, 0xd9, 0xda, 0xdb);
+    }
+    this.writeBytes(bytes);
+  }
+
+  private writeArrayHeader(length: number): void {
+    if (length < 16) {
+      this.writeByte(0x90 | length);
+    } else {
+      this.writeHeader(length, null, 0xdc, 0xdd);
+    }
+  }
+
+  private writeHeader(
+    value: number,
+    type8: number | null,
+    type16: number,
+    type32: number,
+    type64?: number,
+  ): void {
+    /* Write the type and then the value in the fewest bytes which hold it */
+    if (type8 !== null && value < 0x100) {
+      this.writeFixed(type8, 1, (o) => this.view.setUint8(o, value));
+    } else if (value < 0x10000) {
+      this.writeFixed(type16, 2, (o) => this.view.setUint16(o, value));
+    } else if (value < 0x100000000 || type64 === undefined) {
+      this.writeFixed(type32, 4, (o) => this.view.setUint32(o, value));
+    } else {
+      this.writeFixed(type64, 8, (o) =>
+        this.view.setBigUint64(o, BigInt(value)),
+      );
+    }
+  }
+
+  private writeFixed(
+    type: number,
+    size: number,
+    write: (offset: number) => void,
+  ): void {
+    this.reserve(size + 1);
+    this.view.setUint8(this.offset, type);
+    write(this.offset + 1);
+    this.offset += size + 1;
+  }
+
+  private writeByte(value: number): void {
+    this.reserve(1);
+    this.bytes[this.offset++] = value;
+  }
+
+  private writeBytes(bytes: Uint8Array): void {
+    this.reserve(bytes.length);
+    this.bytes.set(bytes, this.offset);
+    this.offset += bytes.length;
+  }
+
+  private reserve(size: number): void {
+    if (this.offset + size <= this.bytes.length) {
+      return;
+    }
+    const bytes = new Uint8Array(
+      Math.max(this.bytes.length * 2, this.offset + size),
+    );
+    bytes.set(this.bytes);
+    this.bytes = bytes;
+    this.view = new DataView(bytes.buffer);
+  }
+}
+
+class Decoder {
+  offset = 0;
+  private view: DataView;
+
+  constructor(private bytes: Uint8Array) {
+    this.view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+  }
+
+  read(): any {
+    const type = this.view.getUint8(this.offset++);
+    if (type < 0x80) {
+      return type;
+    } else if (type < 0x90) {
+      return this.readMap(type & 0x0f);
+    } else if (type < 0xa0) {
+      return this.readArray(type & 0x0f);
+    } else if (type < 0xc0) {
+      return this.readString(type & 0x1f);
+    } else if (type >= 0xe0) {
+      return type - 0x100;
+    }
+    switch (type) {
+      case 0xc0:
+        return null;
+      case 0xc2:
+        return false;
+      case 0xc3:
+        return true;
+      case 0xc4:
+        return this.readBytes(this.readUint(1));
+      case 0xc5:
+        return this.readBytes(this.readUint(2));
+      case 0xc6:
+        return this.readBytes(this.readUint(4));
+      case 0xca:
+        return this.readFixed(4, (o) => this.view.getFloat32(o));
+      case 0xcb:
+        return this.readFixed(8, (o) => this.view.getFloat64(o));
+      case 0xcc:
+        return this.readUint(1);
+      case 0xcd:
+        return this.readUint(2);
+      case 0xce:
+        return this.readUint(4);
+      case 0xcf:
+        return this.readUint(8);
+      case 0xd0:
+        return this.readFixed(1, (o) => this.view.getInt8(o));
+      case 0xd1:
+        return this.readFixed(2, (o) => this.view.getInt16(o));
+      case 0xd2:
+        return this.readFixed(4, (o) => this.view.getInt32(o));
+      case 0xd3:
+        return this.readFixed(8, (o) => Number(this.view.getBigInt64(o)));
+      case 0xd9:
+        return this.readString(this.readUint(1));
+      case 0xda:
+        return this.readString(this.readUint(2));
+      case 0xdb:
+        return this.readString(this.readUint(4));
+      case 0xdc:
+        return this.readArray(this.readUint(2));
+      case 0xdd:
+        return this.readArray(this.readUint(4));
+      case 0xde:
+        return this.readMap(this.readUint(2));
+      case 0xdf:
+        return this.readMap(this.readUint(4));
+      default:
+        throw new Error(`Unsupported MessagePack type 0x${type.toString(16)}`);
+    }
+  }
+
+  private readArray(length: number): any[] {
+    const array = new Array(length);
+    for (let i = 0; i < length; i++) {
+      array[i] = this.read();
+    }
+    return array;
+  }
+
+  private readMap(length: number): { [key: string]: any } {
+    const map: { [key: string]: any } = {};
+    for (let i = 0; i < length; i++) {
+      const key = this.read();
+      map[key] = this.read();
+    }
+    return map;
+  }
+
+  private readString(length: number): string {
+    return textDecoder.decode(this.readBytes(length));
+  }
+
+  private readBytes(length: number): Uint8Array {
+    if (this.offset + length > this.bytes.length) {
+      throw new Error("Unexpected end of MessagePack data");
+    }
+    const bytes = this.bytes.subarray(this.offset, this.offset + length);
+    this.offset += length;
+    return bytes;
+  }
+
+  private readUint(size: number): number {
+    switch (size) {
+      case 1:
+        return this.readFixed(1, (o) => this.view.getUint8(o));
+      case 2:
+        return this.readFixed(2, (o) => this.view.getUint16(o));
+      case 4:
+        return this.readFixed(4, (o) => this.view.getUint32(o));
+      default:
+        return this.readFixed(8, (o) => Number(this.view.getBigUint64(o)));
+    }
+  }
+
+  private readFixed<T>(size: number, read: (offset: number) => T): T {
+    const value = read(this.offset);
+    this.offset += size;
+    return value;
+  }
+}
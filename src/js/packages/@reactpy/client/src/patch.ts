@@ -0,0 +1,65 @@
+import {
+  get as getJsonPointer,
+  parse as parseJsonPointer,
+  remove as removeJsonPointer,
+  set as setJsonPointer,
+} from "json-pointer";
+import type {
+  LayoutUpdateChange,
+  LayoutUpdateMessage,
+  ReactPyVdom,
+} from "./types";
+
+/**
+ * Apply a layout update to the client's copy of the model.
+ *
+ * Updates either carry a whole `model` for the element at `path`, or a list of
+ * `changes` whose paths are relative to the element at `path`.
+ */
+export function applyLayoutUpdate(
+  root: ReactPyVdom,
+  { path, model, changes }: LayoutUpdateMessage,
+): void {
+  if (changes) {
+    const target = path === "" ? root : getJsonPointer(root, path);
+    changes.forEach((change) => applyLayoutUpdateChange(target, change));
+  } else if (path === "") {
+    Object.assign(root, model);
+  } else {
+    setJsonPointer(root, path, model);
+  }
+}
+
+function applyLayoutUpdateChange(
+  target: any,
+  { op, path, from, value }: LayoutUpdateChange,
+): void {
+  switch (op) {
+    case "add":
+      addValue(target, path, value);
+      break;
+    case "remove":
+      removeJsonPointer(target, path);
+      break;
+    case "replace":
+      setJsonPointer(target, path, value);
+      break;
+    case "move": {
+      const moved = getJsonPointer(target, from as string);
+      removeJsonPointer(target, from as string);
+      addValue(target, path, moved);
+      break;
+    }
+  }
+}
+
+function addValue(target: any, path: string, value: any): void {
+  const tokens = parseJsonPointer(path);
+  const lastToken = tokens.pop() as string;
+  const parent = getJsonPointer(target, tokens);
+  if (Array.isArray(parent)) {
+    parent.splice(Number(lastToken), 0, value);
+  } else {
+    parent[lastToken] = value;
+  }
+}
@@ -0,0 +1,85 @@
+import { CompactModelDecoder } from "./compact";
+import { Inflater } from "./inflate";
+import { decode, encode } from "./msgpack";
+
+// Subprotocols in order of preference. Messages are sent as binary frames when
+// MessagePack is negotiated, and as text frames otherwise. With the compact variants,
+// models from the server are sent in a compact form. With the deflate variants,
+// messages from the server are compressed by one DEFLATE stream per connection.
+const MSGPACK_SUBPROTOCOL = "reactpy.msgpack";
+const JSON_SUBPROTOCOL = "reactpy.json";
+const COMPACT_SUFFIX = "+compact";
+const DEFLATE_SUFFIX = "+deflate";
+export const SUBPROTOCOLS = [
+  COMPACT_SUFFIX + DEFLATE_SUFFIX,
+  DEFLATE_SUFFIX,
+  COMPACT_SUFFIX,
+  "",
+].flatMap((suffix) => [
+  MSGPACK_SUBPROTOCOL + suffix,
+  JSON_SUBPROTOCOL + suffix,
+]);
+
+// This must match the dictionary used by the server.
+export const COMPRESSION_DICTIONARY = new TextEncoder().encode(
+  '"importSource":{"source":"","sourceType":"URL","fallback":null,' +
+    '"unmountBeforeUpdate":false},"error":"","throttle":"debounce":"fields":[' +
+    '"tagName":"img","tagName":"input","tagName":"a","tagName":"li",' +
+    '"tagName":"p","tagName":"td","tagName":"tr","tagName":"button",' +
+    '"tagName":"span","tagName":"div","tagName":"",' +
+    '{"type":"layout-update-batch","updates":[{"type":"layout-update","path":"",' +
+    '"changes":[{"op":"move","from":"{"op":"remove","path":"' +
+    '{"op":"add","path":"{"op":"replace","path":"/attributes/","value":' +
+    '"model":{"key":"attributes":{"style":{"className":"id":"value":' +
+    '"eventHandlers":{"onClick":{"target":"","preventDefault":false,' +
+    '"stopPropagation":false}},"children":[{"tagName":"',
+);
+const textDecoder = new TextDecoder();
+
+/**
+ * Encodes and decodes the messages of one connection as required by the negotiated
+ * subprotocol. Decoding may depend on earlier messages so it must be reset whenever
+ * a new connection is opened.
+ */
+export class MessageCodec {
+  private inflater?: Inflater;
+  private compactModelDecoder = new CompactModelDecoder();
+
+  reset(): void {
+    this.inflater = undefined;
+    this.compactModelDecoder = new CompactModelDecoder();
+  }
+
+  encode(protocol: string, message: any): Uint8Array | string {
+    return protocol.startsWith(MSGPACK_SUBPROTOCOL)
+      ? encode(message)
+      : JSON.stringify(message);
+  }
+
+  decode(protocol: string, data: ArrayBuffer | string): any {
+    const message = this.parse(protocol, data);
+    return protocol.includes(COMPACT_SUFFIX)
+      ? this.compactModelDecoder.decodeMessage(message)
+      : message;
+  }
+
+  private parse(protocol: string, data: ArrayBuffer | string): any {
+    if (typeof data === "string") {
+      return JSON.parse(data);
+    }
+    let bytes = new Uint8Array(data);
+    if (protocol.endsWith(DEFLATE_SUFFIX)) {
+      bytes = this.inflate(bytes);
+    }
+    return protocol.startsWith(MSGPACK_SUBPROTOCOL)
+      ? decode(bytes)
+      : JSON.parse(textDecoder.decode(bytes));
+  }
+
+  private inflate(bytes: Uint8Array): Uint8Array {
+    if (!this.inflater) {
+      this.inflater = new Inflater(COMPRESSION_DICTIONARY);
+    }
+    return this.inflater.inflate(bytes);
+  }
+}
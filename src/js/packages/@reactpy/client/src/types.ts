@@ -11,6 +11,7 @@ export type ReconnectOptions = {
 
 export type CreateReconnectingWebSocketProps = {
   url: URL;
+  protocols?: string[];
   readyPromise: Promise<void>;
   onMessage: (message: MessageEvent<any>) => void;
   onOpen?: () => void;
@@ -32,10 +33,17 @@ export type GenericReactPyClientProps = {
   mountElement: HTMLElement;
 };
 
+export type MultiplexedReactPyClientProps = GenericReactPyClientProps & {
+  mountId: string;
+  componentPath: string;
+};
+
 export type MountProps = {
   mountElement: HTMLElement;
   pathPrefix: string;
   componentPath?: string;
+  // share one socket with the other root components on the page
+  multiplex?: boolean;
   reconnectInterval?: number;
   reconnectMaxInterval?: number;
   reconnectMaxRetries?: number;
@@ -60,6 +68,12 @@ export type ReactPyVdomEventHandler = {
   target: string;
   preventDefault?: boolean;
   stopPropagation?: boolean;
+  // milliseconds between sending events
+  throttle?: number;
+  // milliseconds to wait for no further events before sending the latest
+  debounce?: number;
+  // dot-delimited paths of the only parts of each event to send
+  fields?: string[];
 };
 
 export type ReactPyVdomImportSource = {
@@ -105,7 +119,20 @@ export type ImportSourceBinding = {
 export type LayoutUpdateMessage = {
   type: "layout-update";
   path: string;
-  model: ReactPyVdom;
+  model?: ReactPyVdom;
+  changes?: LayoutUpdateChange[];
+};
+
+export type LayoutUpdateBatchMessage = {
+  type: "layout-update-batch";
+  updates: LayoutUpdateMessage[];
+};
+
+export type LayoutUpdateChange = {
+  op: "add" | "remove" | "replace" | "move";
+  path: string;
+  from?: string;
+  value?: any;
 };
 
 export type LayoutEventMessage = {
@@ -114,8 +141,13 @@ export type LayoutEventMessage = {
   data: any;
 };
 
-export type IncomingMessage = LayoutUpdateMessage;
-export type OutgoingMessage = LayoutEventMessage;
+export type LayoutEventBatchMessage = {
+  type: "layout-event-batch";
+  events: LayoutEventMessage[];
+};
+
+export type IncomingMessage = LayoutUpdateMessage | LayoutUpdateBatchMessage;
+export type OutgoingMessage = LayoutEventMessage | LayoutEventBatchMessage;
 export type Message = IncomingMessage | OutgoingMessage;
 
 // #### INTERFACES ####
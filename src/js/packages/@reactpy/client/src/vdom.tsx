@@ -1,6 +1,7 @@
 import eventToObject from "event-to-object";
 import { Fragment } from "preact";
 import type {
+  LayoutEventMessage,
   ReactPyVdom,
   ReactPyVdomImportSource,
   ReactPyVdomEventHandler,
@@ -206,7 +207,14 @@ export function createAttributes(
 function createEventHandler(
   client: ReactPyClient,
   name: string,
-  { target, preventDefault, stopPropagation }: ReactPyVdomEventHandler,
+  {
+    target,
+    preventDefault,
+    stopPropagation,
+    throttle,
+    debounce,
+    fields,
+  }: ReactPyVdomEventHandler,
 ): [string, () => void] {
   const eventHandler = function (...args: any[]) {
     const data = Array.from(args).map((value) => {
@@ -219,18 +227,164 @@ function createEventHandler(
       }
 
       // Convert JavaScript objects to plain JSON, if needed
-      if (typeof event === "object") {
+      if (typeof event === "object" && fields) {
+        return pickFields(event, fields);
+      } else if (typeof event === "object") {
         return eventToObject(event);
       } else {
         return event;
       }
     });
-    client.sendMessage({ type: "layout-event", data, target });
+    if (throttle) {
+      throttleEvent(client, target, data, throttle);
+    } else if (debounce) {
+      debounceEvent(client, target, data, debounce);
+    } else {
+      sendEvent(client, target, data);
+    }
   };
   eventHandler.isHandler = true;
   return [name, eventHandler];
 }
 
+function pickFields(
+  value: { [key: string]: any },
+  fields: string[],
+): { [key: string]: any } {
+  /* Copy only the given dot-delimited paths (e.g. "target.value") of a value */
+  const result: { [key: string]: any } = {};
+  for (const field of fields) {
+    const path = field.split(".");
+    let picked: any = value;
+    for (const key of path) {
+      if (picked === null || picked === undefined) {
+        break;
+      }
+      picked = picked[key];
+    }
+    if (picked === undefined) {
+      continue;
+    }
+    let destination = result;
+    for (const key of path.slice(0, -1)) {
+      if (typeof destination[key] !== "object" || destination[key] === null) {
+        destination[key] = {};
+      }
+      destination = destination[key];
+    }
+    destination[path[path.length - 1]] =
+      picked !== null && typeof picked === "object"
+        ? eventToObject(picked)
+        : picked;
+  }
+  return result;
+}
+
+type DelayedEvent = {
+  timeout: ReturnType<typeof setTimeout>;
+  data?: any[];
+};
+
+/* Events which are being throttled or debounced, by client and then by target. These
+outlive any one render since event handlers are recreated each time. */
+const delayedEvents = new WeakMap<ReactPyClient, Map<string, DelayedEvent>>();
+
+function getDelayedEvents(client: ReactPyClient): Map<string, DelayedEvent> {
+  let delayed = delayedEvents.get(client);
+  if (!delayed) {
+    const events = new Map<string, DelayedEvent>();
+    // send events which are still being delayed before the page is left
+    window.addEventListener("pagehide", () => {
+      for (const [target, event] of events) {
+        clearTimeout(event.timeout);
+        if (event.data) {
+          sendEvent(client, target, event.data);
+        }
+      }
+      events.clear();
+    });
+    delayedEvents.set(client, events);
+    delayed = events;
+  }
+  return delayed;
+}
+
+/* Events waiting to be sent together, by client */
+const queuedEvents = new WeakMap<ReactPyClient, LayoutEventMessage[]>();
+
+function sendEvent(client: ReactPyClient, target: string, data: any[]): void {
+  /* Events which occur during the same task (e.g. handlers of one DOM event) are sent
+  in one message. They are sent once the task completes so no latency is added. */
+  const event: LayoutEventMessage = { type: "layout-event", data, target };
+  const queued = queuedEvents.get(client);
+  if (queued) {
+    queued.push(event);
+    return;
+  }
+  const events = [event];
+  queuedEvents.set(client, events);
+  queueMicrotask(() => {
+    queuedEvents.delete(client);
+    client.sendMessage(
+      events.length === 1
+        ? events[0]
+        : { type: "layout-event-batch", events },
+    );
+  });
+}
+
+function throttleEvent(
+  client: ReactPyClient,
+  target: string,
+  data: any[],
+  interval: number,
+): void {
+  /* Send at most one event per interval. The latest event to occur during an interval
+  is sent once it ends. */
+  const delayed = getDelayedEvents(client);
+  const current = delayed.get(target);
+  if (current) {
+    current.data = data;
+    return;
+  }
+  sendEvent(client, target, data);
+  const startInterval = () => {
+    const event: DelayedEvent = {
+      timeout: setTimeout(() => {
+        if (event.data) {
+          sendEvent(client, target, event.data);
+          startInterval();
+        } else {
+          delayed.delete(target);
+        }
+      }, interval),
+    };
+    delayed.set(target, event);
+  };
+  startInterval();
+}
+
+function debounceEvent(
+  client: ReactPyClient,
+  target: string,
+  data: any[],
+  delay: number,
+): void {
+  /* Send the latest event once no others have occurred for the given delay */
+  const delayed = getDelayedEvents(client);
+  const current = delayed.get(target);
+  if (current) {
+    clearTimeout(current.timeout);
+  }
+  delayed.set(target, {
+    data,
+    timeout: setTimeout(() => {
+      delayed.delete(target);
+      sendEvent(client, target, data);
+    }, delay),
+  });
+}
+
 function createInlineJavaScript(
   name: string,
   inlineJavaScript: string,
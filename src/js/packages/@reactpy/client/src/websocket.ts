@@ -15,7 +15,8 @@ export function createReconnectingWebSocket(
     if (closed) {
       return;
     }
-    socket.current = new WebSocket(props.url);
+    socket.current = new WebSocket(props.url, props.protocols);
+    socket.current.binaryType = "arraybuffer";
     socket.current.onopen = () => {
       everConnected = true;
       log.info("Connected!");
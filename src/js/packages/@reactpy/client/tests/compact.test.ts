@@ -0,0 +1,87 @@
+import { expect, test } from "bun:test";
+import { CompactModelDecoder } from "../src/compact";
+import { runPython } from "./tooling/python";
+
+// Encodes the given messages in order with one encoder, as for one connection
+const ENCODE_SCRIPT = `
+import json, sys
+from reactpy.core import _compact
+
+max_strings, messages = json.load(sys.stdin)
+_compact.MAX_STRINGS = max_strings
+encoder = _compact.CompactModelEncoder()
+print(json.dumps([encoder.encode_message(m) for m in messages]))
+`;
+
+function roundTrip(messages: any[], maxStrings: number = 4096): any[] {
+  const decoder = new CompactModelDecoder();
+  return runPython(ENCODE_SCRIPT, [maxStrings, messages]).map((m: any) =>
+    decoder.decodeMessage(m),
+  );
+}
+
+const ROW = {
+  tagName: "tr",
+  key: "row",
+  attributes: { className: "row", style: { textAlign: "right" } },
+  eventHandlers: {
+    onClick: {
+      target: "abc",
+      preventDefault: true,
+      stopPropagation: false,
+      debounce: 100,
+    },
+  },
+  children: [{ tagName: "td", children: ["text", 1] }],
+};
+
+const MESSAGES = [
+  {
+    type: "layout-update",
+    path: "",
+    model: { tagName: "table", children: [ROW, ROW] },
+  },
+  {
+    type: "layout-update-batch",
+    updates: [
+      {
+        type: "layout-update",
+        path: "/children/0",
+        changes: [
+          { op: "add", path: "/children/1", value: ROW },
+          { op: "replace", path: "/children", value: [ROW, "text"] },
+          { op: "replace", path: "/attributes/className", value: "other" },
+          { op: "move", from: "/children/0", path: "/children/1" },
+          { op: "remove", path: "/attributes" },
+        ],
+      },
+    ],
+  },
+  { type: "other", value: 1 },
+];
+
+test("decodes messages encoded by Python", () => {
+  expect(roundTrip(MESSAGES)).toEqual(MESSAGES);
+});
+
+test("decodes strings which did not fit in the table", () => {
+  expect(roundTrip(MESSAGES, 3)).toEqual(MESSAGES);
+});
+
+test("decodes literal class names and styles", () => {
+  const message = {
+    type: "layout-update",
+    path: "",
+    model: {
+      tagName: "div",
+      attributes: { className: "a", style: { color: "red" } },
+      children: [
+        // literals which look like the encoded form of other values
+        { tagName: "div", attributes: { className: 0, style: "b" } },
+        { tagName: "div", attributes: { className: [1], style: [2] } },
+        { tagName: "div", attributes: { className: null, style: [] } },
+      ],
+    },
+  };
+  expect(roundTrip([message])).toEqual([message]);
+});
@@ -0,0 +1,87 @@
+import { expect, test } from "bun:test";
+import { Inflater } from "../src/inflate";
+import { COMPRESSION_DICTIONARY } from "../src/protocol";
+import { fromHex, runPython, toHex } from "./tooling/python";
+
+// Compresses each of the given messages the way the server does
+const COMPRESS_SCRIPT = `
+import json, sys, zlib
+
+dictionary, level, messages = json.load(sys.stdin)
+compressor = zlib.compressobj(
+    level, wbits=-zlib.MAX_WBITS, zdict=bytes.fromhex(dictionary)
+)
+print(json.dumps([
+    (compressor.compress(m.encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)).hex()
+    for m in messages
+]))
+`;
+
+const textDecoder = new TextDecoder();
+
+function compress(messages: string[], level: number = 6): Uint8Array[] {
+  const dictionary = toHex(COMPRESSION_DICTIONARY);
+  return runPython(COMPRESS_SCRIPT, [dictionary, level, messages]).map(fromHex);
+}
+
+function inflateAll(messages: string[], level?: number): string[] {
+  const inflater = new Inflater(COMPRESSION_DICTIONARY);
+  return compress(messages, level).map((data) =>
+    textDecoder.decode(inflater.inflate(data)),
+  );
+}
+
+function randomText(length: number, seed: number): string {
+  // a simple linear congruential generator so the text is the same every run
+  let state = seed;
+  let text = "";
+  for (let i = 0; i < length; i++) {
+    state = (state * 1103515245 + 12345) % 2 ** 31;
+    text += String.fromCharCode(33 + (state % 94));
+  }
+  return text;
+}
+
+test("inflates a message which refers to the preset dictionary", () => {
+  const message =
+    '{"type":"layout-update","path":"","model":{"tagName":"div","children":[]}}';
+  const [data] = compress([message]);
+  // most of the message is found in the dictionary
+  expect(data.length).toBeLessThan(message.length / 2);
+  expect(inflateAll([message])).toEqual([message]);
+});
+
+test("inflates messages which refer to the output of earlier messages", () => {
+  const item = randomText(200, 1);
+  const messages = [item, `[${item}]`, `{${item}${item}}`, ""];
+  const data = compress(messages);
+  // the repeated item is not sent again
+  expect(data[1].length).toBeLessThan(item.length / 4);
+  expect(inflateAll(messages)).toEqual(messages);
+});
+
+test("inflates messages larger than the window", () => {
+  const large = randomText(100_000, 2);
+  // the second message refers back to near the start of the window
+  const messages = [large, large.slice(-30_000), "a".repeat(200_000), large];
+  expect(inflateAll(messages)).toEqual(messages);
+});
+
+test("inflates stored, fixed, and dynamic blocks", () => {
+  const messages = [
+    randomText(5000, 3),
+    '{"type":"layout-update","path":"/children/0"}',
+    JSON.stringify(Array.from({ length: 500 }, (_, i) => ({ key: i }))),
+  ];
+  for (const level of [0, 1, 9]) {
+    expect(inflateAll(messages, level)).toEqual(messages);
+  }
+});
+
+test("rejects truncated data", () => {
+  const [data] = compress([randomText(1000, 4)]);
+  const inflater = new Inflater(COMPRESSION_DICTIONARY);
+  expect(() => inflater.inflate(data.subarray(0, data.length - 10))).toThrow(
+    "Unexpected end of DEFLATE data",
+  );
+});
@@ -0,0 +1,105 @@
+import { expect, test } from "bun:test";
+import { decode, encode } from "../src/msgpack";
+import { fromHex, runPython, toHex } from "./tooling/python";
+
+// Packs each of the given values with the same library as the server
+const PACK_SCRIPT = `
+import json, msgpack, sys
+
+print(json.dumps([msgpack.packb(v).hex() for v in json.load(sys.stdin)]))
+`;
+
+// Unpacks each of the given values and prints them as JSON
+const UNPACK_SCRIPT = `
+import json, msgpack, sys
+
+values = [msgpack.unpackb(bytes.fromhex(v)) for v in json.load(sys.stdin)]
+print(json.dumps(values))
+`;
+
+function pack(values: any[]): Uint8Array[] {
+  return runPython(PACK_SCRIPT, values).map(fromHex);
+}
+
+function unpack(values: any[]): any[] {
+  return runPython(UNPACK_SCRIPT, values.map((v) => toHex(encode(v))));
+}
+
+const VALUES = [
+  null,
+  true,
+  false,
+  0,
+  127,
+  128,
+  255,
+  256,
+  65535,
+  65536,
+  2 ** 32 - 1,
+  2 ** 32,
+  2 ** 40 + 1,
+  Number.MAX_SAFE_INTEGER,
+  -1,
+  -32,
+  -33,
+  -128,
+  -129,
+  -32768,
+  -32769,
+  -(2 ** 31),
+  -(2 ** 31) - 1,
+  -(2 ** 40) - 1,
+  Number.MIN_SAFE_INTEGER,
+  0.5,
+  -1.25,
+  1e300,
+  "",
+  "a".repeat(31),
+  "b".repeat(32),
+  "c".repeat(255),
+  "d".repeat(256),
+  "e".repeat(65535),
+  "f".repeat(65536),
+  "unicode: é中😀",
+  [],
+  Array.from({ length: 15 }, (_, i) => i),
+  Array.from({ length: 16 }, (_, i) => i),
+  Array.from({ length: 65536 }, (_, i) => i % 3),
+  {},
+  Object.fromEntries(Array.from({ length: 15 }, (_, i) => [`k${i}`, i])),
+  Object.fromEntries(Array.from({ length: 16 }, (_, i) => [`k${i}`, i])),
+  Object.fromEntries(Array.from({ length: 65536 }, (_, i) => [`k${i}`, null])),
+  {
+    type: "layout-update",
+    path: "/children/0",
+    model: { tagName: "div", attributes: { id: "a" }, children: ["text", 1] },
+  },
+];
+
+test("decodes values packed by Python", () => {
+  const packed = pack(VALUES);
+  expect(packed.map(decode)).toEqual(VALUES);
+});
+
+test("encodes values which Python unpacks", () => {
+  expect(unpack(VALUES)).toEqual(VALUES);
+});
+
+test("encodes values in the same form as Python", () => {
+  // the fewest bytes which hold each value, as Python would pack them
+  expect(VALUES.map((v) => toHex(encode(v)))).toEqual(pack(VALUES).map(toHex));
+});
+
+test("leaves out undefined values of maps", () => {
+  expect(decode(encode({ a: undefined, b: [undefined] }))).toEqual({
+    b: [null],
+  });
+});
+
+test("rejects truncated data", () => {
+  const [data] = pack(["some text"]);
+  expect(() => decode(data.subarray(0, data.length - 1))).toThrow(
+    "Unexpected end of MessagePack data",
+  );
+});
@@ -0,0 +1,29 @@
+import { resolve } from "node:path";
+
+// holds the Python package so that scripts may import the server's code
+const PYTHON_PATH = resolve(import.meta.dir, "../../../../../..");
+
+/**
+ * Run a Python script which reads a JSON value from stdin and prints another.
+ * This is used to check the decoders of the client against the encoders of the
+ * server. Bytes are passed as hex strings, see `toHex` and `fromHex`.
+ */
+export function runPython(script: string, input: any = null): any {
+  const command = [process.env.PYTHON ?? "python", "-c", script];
+  const result = Bun.spawnSync(command, {
+    stdin: new TextEncoder().encode(JSON.stringify(input)),
+    env: { ...process.env, PYTHONPATH: PYTHON_PATH },
+  });
+  if (!result.success) {
+    throw new Error(`Python script failed:\n${result.stderr.toString()}`);
+  }
+  return JSON.parse(result.stdout.toString());
+}
+
+export function toHex(data: Uint8Array): string {
+  return Buffer.from(data).toString("hex");
+}
+
+export function fromHex(hex: string): Uint8Array {
+  return Uint8Array.from(Buffer.from(hex, "hex"));
+}
@@ -1,10 +1,11 @@
 from reactpy import config, logging, reactjs, types, web, widgets
 from reactpy._html import html
 from reactpy.core import hooks
-from reactpy.core.component import component
+from reactpy.core.component import component, memo
 from reactpy.core.events import event
 from reactpy.core.hooks import (
     create_context,
+    start_transition,
     use_async_effect,
     use_callback,
     use_connection,
@@ -18,7 +19,7 @@ from reactpy.core.hooks import (
     use_scope,
     use_state,
 )
-from reactpy.core.vdom import Vdom
+from reactpy.core.vdom import Vdom, static
 from reactpy.executors.pyscript.components import pyscript_component
 from reactpy.utils import Ref, reactpy_to_string, string_to_reactpy
 
@@ -35,9 +36,12 @@ __all__ = [
     "hooks",
     "html",
     "logging",
+    "memo",
     "pyscript_component",
     "reactjs",
     "reactpy_to_string",
+    "start_transition",
+    "static",
     "string_to_reactpy",
     "types",
     "use_async_effect",
@@ -91,6 +91,201 @@ REACTPY_ASYNC_RENDERING = Option(
 )
 """Whether to render components asynchronously."""
 
+REACTPY_DIFF_UPDATES = Option(
+    "REACTPY_DIFF_UPDATES",
+    default=False,
+    mutable=True,
+    validator=boolean,
+)
+"""Whether to send fine-grained changes instead of whole models when a component updates
+
+When enabled, each update compares a component's previous model with its new one and
+only the attributes, children, and text that differ are sent to the client.
+"""
+
+REACTPY_BATCH_UPDATES = Option(
+    "REACTPY_BATCH_UPDATES",
+    default=False,
+    mutable=True,
+    validator=boolean,
+)
+"""Whether to combine the updates of renders that complete together into one message
+
+This only applies when :data:`REACTPY_ASYNC_RENDERING` is enabled. See
+:data:`REACTPY_BATCH_UPDATES_WINDOW` to configure how long to wait for renders.
+"""
+
+REACTPY_BATCH_UPDATES_WINDOW = Option(
+    "REACTPY_BATCH_UPDATES_WINDOW",
+    default=0,
+    mutable=True,
+    validator=int,
+)
+"""The time in milliseconds to wait for more renders to complete before sending a batch
+
+When ``0``, renders are collected until an iteration of the event loop completes no
+further renders.
+"""
+
+REACTPY_RENDER_TIME_SLICE = Option(
+    "REACTPY_RENDER_TIME_SLICE",
+    default=0,
+    mutable=True,
+    validator=int,
+)
+"""The time in milliseconds a render may run before yielding to the event loop
+
+Large renders otherwise block the event loop, and with it every other connection, until
+they complete. When ``0``, renders never yield.
+"""
+
+REACTPY_UNMOUNT_CONCURRENCY = Option(
+    "REACTPY_UNMOUNT_CONCURRENCY",
+    default=100,
+    mutable=True,
+    validator=int,
+)
+"""The maximum number of components whose effects are cleaned up at once when unmounting"""
+
+REACTPY_UNMOUNT_TIMEOUT = Option(
+    "REACTPY_UNMOUNT_TIMEOUT",
+    default=0,
+    mutable=True,
+    validator=float,
+)
+"""The time in seconds to wait for a component's effects to stop when it unmounts
+
+Effects which have not stopped by then are cancelled. When ``0``, effects are waited
+on indefinitely.
+"""
+
+REACTPY_MAX_PENDING_EVENTS = Option(
+    "REACTPY_MAX_PENDING_EVENTS",
+    default=100,
+    mutable=True,
+    validator=int,
+)
+"""The maximum number of events from one client which may be queued or being handled
+
+Further events are not received from the client until one of these is handled. When
+``0``, there is no limit.
+"""
+
+
+def _repeated_events_policy(value: str) -> str:
+    if value not in {"queue", "coalesce", "drop"}:
+        raise ValueError(
+            f"Invalid repeated events policy {value!r} - expected "
+            "'queue', 'coalesce', or 'drop'"
+        )
+    return value
+
+
+REACTPY_REPEATED_EVENTS = Option(
+    "REACTPY_REPEATED_EVENTS",
+    default="queue",
+    mutable=True,
+    validator=_repeated_events_policy,
+)
+"""What to do with events for an element which is still handling a previous event
+
+Events for the same element are always handled one at a time, in the order received.
+
+- ``"queue"`` - handle every event
+- ``"coalesce"`` - only handle the latest of the events which arrive in the meantime
+- ``"drop"`` - ignore events which arrive in the meantime
+"""
+
+REACTPY_SEND_BUFFER_SIZE = Option(
+    "REACTPY_SEND_BUFFER_SIZE",
+    default=0,
+    mutable=True,
+    validator=int,
+)
+"""The size in bytes of the updates which may wait to be sent to a client
+
+Once reached, no more updates are rendered for that client until those waiting have
+been sent. When ``0``, there is no limit and the size of updates is not measured.
+Regardless, a waiting update is dropped if a newer one replaces the same part of the
+page.
+"""
+
+REACTPY_MSGPACK = Option(
+    "REACTPY_MSGPACK",
+    default=False,
+    mutable=True,
+    validator=boolean,
+)
+"""Whether messages are sent as MessagePack to clients which support it, instead of JSON
+
+MessagePack messages are about a quarter smaller than JSON, but take about twice as
+long for the server to encode. So this is only worthwhile when bandwidth is more
+limited than server CPU. Run ``hatch run python:benchmark_wire_protocol`` to compare.
+"""
+
+REACTPY_COMPRESSION = Option(
+    "REACTPY_COMPRESSION",
+    default=False,
+    mutable=True,
+    validator=boolean,
+)
+"""Whether updates are compressed before they are sent to clients which support it
+
+Each connection compresses its updates with one DEFLATE stream, so later updates refer
+back to the content of earlier ones. This is useful when a proxy prevents the
+``permessage-deflate`` websocket extension from being used.
+"""
+
+REACTPY_COMPACT_MODELS = Option(
+    "REACTPY_COMPACT_MODELS",
+    default=False,
+    mutable=True,
+    validator=boolean,
+)
+"""Whether models are sent to clients which support it in a compact form
+
+Elements use short keys, while the names of tags, attributes, styles, and event
+handlers along with class names are sent once per connection and referred to by index
+thereafter. This is most useful for large tables when updates are not compressed (see
+:data:`REACTPY_COMPRESSION`).
+"""
+
+REACTPY_MULTIPLEX = Option(
+    "REACTPY_MULTIPLEX",
+    default=False,
+    mutable=True,
+    validator=boolean,
+)
+"""Whether the components of a page share one websocket
+
+When enabled, components embedded in a page with the ``component`` template tag are
+rendered over a single websocket rather than one each.
+"""
+
+REACTPY_MAX_MOUNTS = Option(
+    "REACTPY_MAX_MOUNTS",
+    default=100,
+    mutable=True,
+    validator=int,
+)
+"""The maximum number of components one client may mount over a shared websocket
+
+Further components are not mounted until others are unmounted. When ``0``, there is no
+limit. See :data:`REACTPY_MULTIPLEX`.
+"""
+
+REACTPY_METRICS = Option(
+    "REACTPY_METRICS",
+    default=False,
+    mutable=True,
+    validator=boolean,
+)
+"""Whether layouts record metrics about the work they do
+
+Metrics are available from :meth:`~reactpy.core.layout.Layout.stats` and, in the
+Prometheus text format, from the ``metrics`` route under :data:`REACTPY_PATH_PREFIX`.
+"""
+
 REACTPY_RECONNECT_INTERVAL = Option(
     "REACTPY_RECONNECT_INTERVAL",
     default=750,
@@ -0,0 +1,242 @@
+"""A compact encoding of the models in layout update messages
+
+Elements use short keys, and the names of tags, attributes, styles, and event handlers
+along with class names are replaced by references to a table of strings which is kept
+for the lifetime of a connection. Strings are added to the table in the ``strings``
+field of the update which first refers to them. References are indices into the table,
+and strings which do not fit in the table are sent as is.
+
+Attributes, styles, and event handlers are encoded as flat lists of alternating names
+and values since names which are references are not strings. Class names which are not
+strings, and styles which are not mappings, are wrapped in a list of one item so that
+they are not mistaken for encoded ones. The element values of changes are sent in a
+``vdom`` field instead of ``value``.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+ELEMENT_KEYS = {
+    "tagName": "t",
+    "key": "k",
+    "attributes": "a",
+    "children": "c",
+    "eventHandlers": "e",
+    "inlineJavaScript": "j",
+    "importSource": "i",
+    "error": "x",
+}
+EVENT_HANDLER_KEYS = {
+    "target": "t",
+    "preventDefault": "p",
+    "stopPropagation": "s",
+    "throttle": "r",
+    "debounce": "d",
+    "fields": "f",
+}
+MAX_STRINGS = 4096
+"""The number of strings in the table of a connection"""
+
+
+class CompactModelEncoder:
+    """Encode the updates sent over a single connection"""
+
+    __slots__ = ("_new_strings", "_strings")
+
+    def __init__(self) -> None:
+        self._strings: dict[str, int] = {}
+        self._new_strings: list[str] = []
+
+    def encode_message(self, message: dict[str, Any]) -> dict[str, Any]:
+        if message.get("type") == "layout-update-batch":
+            return {
+                **message,
+                "updates": [self._encode_update(u) for u in message["updates"]],
+            }
+        if message.get("type") == "layout-update":
+            return self._encode_update(message)
+        return message
+
+    def _encode_update(self, update: dict[str, Any]) -> dict[str, Any]:
+        encoded = dict(update)
+        if "model" in update:
+            encoded["model"] = self._encode_element(update["model"])
+        if "changes" in update:
+            encoded["changes"] = [self._encode_change(c) for c in update["changes"]]
+        if self._new_strings:
+            encoded["strings"] = self._new_strings
+            self._new_strings = []
+        return encoded
+
+    def _encode_change(self, change: dict[str, Any]) -> dict[str, Any]:
+        if "value" not in change:
+            return change
+        value = change["value"]
+        if isinstance(value, dict) and "tagName" in value:
+            vdom: Any = self._encode_element(value)
+        elif isinstance(value, list) and change["path"].endswith("/children"):
+            vdom = self._encode_children(value)
+        else:
+            return change
+        encoded = {k: v for k, v in change.items() if k != "value"}
+        encoded["vdom"] = vdom
+        return encoded
+
+    def _encode_element(self, element: dict[str, Any]) -> dict[str, Any]:
+        encoded: dict[str, Any] = {}
+        for field, value in element.items():
+            if field == "tagName":
+                value = self._ref(value)
+            elif field == "attributes":
+                value = self._encode_attributes(value)
+            elif field == "children":
+                value = self._encode_children(value)
+            elif field == "eventHandlers":
+                value = self._encode_event_handlers(value)
+            encoded[ELEMENT_KEYS.get(field, field)] = value
+        return encoded
+
+    def _encode_children(self, children: list[Any]) -> list[Any]:
+        return [self._encode_element(c) if isinstance(c, dict) else c for c in children]
+
+    def _encode_attributes(self, attributes: dict[str, Any]) -> list[Any]:
+        encoded: list[Any] = []
+        for name, value in attributes.items():
+            encoded.append(self._ref(name))
+            if name == "style":
+                if isinstance(value, dict):
+                    style: list[Any] = []
+                    for style_name, style_value in value.items():
+                        style.extend((self._ref(style_name), style_value))
+                    value = style
+                else:
+                    value = [value]
+            elif name == "className":
+                value = self._ref(value) if isinstance(value, str) else [value]
+            encoded.append(value)
+        return encoded
+
+    def _encode_event_handlers(self, handlers: dict[str, Any]) -> list[Any]:
+        encoded: list[Any] = []
+        for name, handler in handlers.items():
+            # false is assumed when these are absent
+            encoded_handler = {
+                EVENT_HANDLER_KEYS.get(field, field): value
+                for field, value in handler.items()
+                if not (field in ("preventDefault", "stopPropagation") and not value)
+            }
+            encoded.extend((self._ref(name), encoded_handler))
+        return encoded
+
+    def _ref(self, string: str) -> int | str:
+        try:
+            return self._strings[string]
+        except KeyError:
+            if len(self._strings) >= MAX_STRINGS:
+                return string
+            index = self._strings[string] = len(self._strings)
+            self._new_strings.append(string)
+            return index
+
+
+class CompactModelDecoder:
+    """Decode the updates received over a single connection"""
+
+    __slots__ = ("_strings",)
+
+    def __init__(self) -> None:
+        self._strings: list[str] = []
+
+    def decode_message(self, message: dict[str, Any]) -> dict[str, Any]:
+        if message.get("type") == "layout-update-batch":
+            return {
+                **message,
+                "updates": [self._decode_update(u) for u in message["updates"]],
+            }
+        if message.get("type") == "layout-update":
+            return self._decode_update(message)
+        return message
+
+    def _decode_update(self, update: dict[str, Any]) -> dict[str, Any]:
+        decoded = dict(update)
+        self._strings.extend(decoded.pop("strings", ()))
+        if "model" in update:
+            decoded["model"] = self._decode_element(update["model"])
+        if "changes" in update:
+            decoded["changes"] = [self._decode_change(c) for c in update["changes"]]
+        return decoded
+
+    def _decode_change(self, change: dict[str, Any]) -> dict[str, Any]:
+        if "vdom" not in change:
+            return change
+        decoded = {k: v for k, v in change.items() if k != "vdom"}
+        vdom = change["vdom"]
+        decoded["value"] = (
+            self._decode_children(vdom)
+            if isinstance(vdom, list)
+            else self._decode_element(vdom)
+        )
+        return decoded
+
+    def _decode_element(self, element: dict[str, Any]) -> dict[str, Any]:
+        decoded: dict[str, Any] = {}
+        for field, value in element.items():
+            field = _ELEMENT_FIELDS.get(field, field)
+            if field == "tagName":
+                value = self._deref(value)
+            elif field == "attributes":
+                value = self._decode_attributes(value)
+            elif field == "children":
+                value = self._decode_children(value)
+            elif field == "eventHandlers":
+                value = self._decode_event_handlers(value)
+            decoded[field] = value
+        return decoded
+
+    def _decode_children(self, children: list[Any]) -> list[Any]:
+        return [self._decode_element(c) if isinstance(c, dict) else c for c in children]
+
+    def _decode_attributes(self, attributes: list[Any]) -> dict[str, Any]:
+        decoded: dict[str, Any] = {}
+        for ref, value in zip(attributes[::2], attributes[1::2], strict=True):
+            name = self._deref(ref)
+            if name in ("style", "className") and _is_wrapped(value):
+                value = value[0]
+            elif name == "style":
+                value = {
+                    self._deref(r): v
+                    for r, v in zip(value[::2], value[1::2], strict=True)
+                }
+            elif name == "className":
+                value = self._deref(value)
+            decoded[name] = value
+        return decoded
+
+    def _decode_event_handlers(self, handlers: list[Any]) -> dict[str, Any]:
+        decoded: dict[str, Any] = {}
+        for ref, handler in zip(handlers[::2], handlers[1::2], strict=True):
+            decoded_handler = {
+                "target": handler["t"],
+                "preventDefault": handler.get("p", False),
+                "stopPropagation": handler.get("s", False),
+            }
+            decoded_handler.update(
+                (_EVENT_HANDLER_FIELDS.get(k, k), v)
+                for k, v in handler.items()
+                if k not in ("t", "p", "s")
+            )
+            decoded[self._deref(ref)] = decoded_handler
+        return decoded
+
+    def _deref(self, ref: Any) -> Any:
+        return self._strings[ref] if isinstance(ref, int) else ref
+
+
+def _is_wrapped(value: Any) -> bool:
+    """Whether the value of a class name or style was not encoded by the encoder"""
+    return isinstance(value, list) and len(value) == 1
+
+
+_ELEMENT_FIELDS = {v: k for k, v in ELEMENT_KEYS.items()}
+_EVENT_HANDLER_FIELDS = {v: k for k, v in EVENT_HANDLER_KEYS.items()}
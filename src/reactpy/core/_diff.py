@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from reactpy.types import LayoutUpdateChange
+
+# Model fields whose values are mappings which can be changed one entry at a time
+_MAPPING_FIELDS = frozenset({"attributes", "eventHandlers", "inlineJavaScript"})
+
+
+def diff_models(
+    old: Any, new: Any, keys: Mapping[int, Any] | None = None
+) -> list[LayoutUpdateChange]:
+    """Compute the changes needed to turn one rendered model into another
+
+    The paths of the returned changes are JSON Pointers relative to the given models.
+    Subtrees which are identical (by identity or equality) produce no changes.
+
+    Children are matched by key if all of them have one. The key of an element is its
+    ``key`` attribute. Models without one, like those of components, may be given a key
+    in ``keys`` by their ``id``.
+    """
+    changes: list[LayoutUpdateChange] = []
+    _diff_node(old, new, "", changes, keys or {})
+    return changes
+
+
+def _diff_node(
+    old: Any,
+    new: Any,
+    path: str,
+    changes: list[LayoutUpdateChange],
+    keys: Mapping[int, Any],
+) -> None:
+    if old is new:
+        return None
+
+    if not (
+        isinstance(old, dict)
+        and isinstance(new, dict)
+        and old.get("tagName") == new.get("tagName")
+        and _get_key(old, keys) == _get_key(new, keys)
+    ):
+        # text, or an element that is not the same element as before
+        if old != new:
+            changes.append({"op": "replace", "path": path, "value": new})
+        return None
+
+    for field, new_value in new.items():
+        field_path = f"{path}/{field}"
+        if field not in old:
+            changes.append({"op": "add", "path": field_path, "value": new_value})
+            continue
+        old_value = old[field]
+        if old_value is new_value:
+            continue
+        if field == "children":
+            _diff_children(old_value, new_value, field_path, changes, keys)
+        elif field in _MAPPING_FIELDS:
+            _diff_mapping(old_value, new_value, field_path, changes)
+        elif old_value != new_value:
+            changes.append({"op": "replace", "path": field_path, "value": new_value})
+
+    for field in old:
+        if field not in new:
+            changes.append({"op": "remove", "path": f"{path}/{field}"})
+
+    return None
+
+
+def _diff_children(
+    old: list[Any],
+    new: list[Any],
+    path: str,
+    changes: list[LayoutUpdateChange],
+    keys: Mapping[int, Any],
+) -> None:
+    old_keys = _get_child_keys(old, keys)
+    new_keys = _get_child_keys(new, keys)
+    if old_keys is not None and new_keys is not None:
+        _diff_keyed_children(
+            old, new, path, changes, keys, old_keys=old_keys, new_keys=new_keys
+        )
+        return None
+
+    common_length = min(len(old), len(new))
+    for index in range(common_length):
+        _diff_node(old[index], new[index], f"{path}/{index}", changes, keys)
+    for index in range(common_length, len(new)):
+        changes.append({"op": "add", "path": f"{path}/{index}", "value": new[index]})
+    # remove from the end so that earlier indices remain valid
+    for index in reversed(range(common_length, len(old))):
+        changes.append({"op": "remove", "path": f"{path}/{index}"})
+
+
+def _diff_keyed_children(
+    old: list[Any],
+    new: list[Any],
+    path: str,
+    changes: list[LayoutUpdateChange],
+    keys: Mapping[int, Any],
+    *,
+    old_keys: list[Any],
+    new_keys: list[Any],
+) -> None:
+    """Diff children which all have unique keys by moving, adding, and removing them
+
+    Children in the longest subsequence whose order is unchanged stay in place. All
+    others are moved so that their subtrees need not be sent again.
+    """
+    new_indices = {key: index for index, key in enumerate(new_keys)}
+
+    # remove from the end so that earlier indices remain valid
+    for index in reversed(range(len(old_keys))):
+        if old_keys[index] not in new_indices:
+            changes.append({"op": "remove", "path": f"{path}/{index}"})
+    current = [key for key in old_keys if key in new_indices]
+
+    stable = {
+        current[i]
+        for i in _longest_increasing_subsequence([new_indices[k] for k in current])
+    }
+
+    # Children are placed from last to first, each directly before its next sibling.
+    # Since every position a child will occupy is known up front, each is given a slot
+    # in one ordering and the index of a child is the number of occupied slots before
+    # it. Children keep their old slots until they are moved. A child which is moved or
+    # added gets a new slot directly before that of the sibling it is placed before.
+    old_slots: dict[Any, int] = {}
+    new_slots: dict[Any, int] = {}
+    runs_by_stable_key: dict[Any, list[Any]] = {}
+    run: list[Any] = []
+    for key in new_keys:
+        if key in stable:
+            runs_by_stable_key[key] = run
+            run = []
+        else:
+            run.append(key)
+    for key in current:
+        for placed_key in runs_by_stable_key.get(key, ()):
+            new_slots[placed_key] = len(old_slots) + len(new_slots)
+        old_slots[key] = len(old_slots) + len(new_slots)
+    # children after the last stable one are placed at the end
+    for placed_key in run:
+        new_slots[placed_key] = len(old_slots) + len(new_slots)
+
+    occupied = _SlotCounter(len(old_slots) + len(new_slots), old_slots.values())
+    for new_index in reversed(range(len(new_keys))):
+        key = new_keys[new_index]
+        if key in stable:
+            continue
+        old_slot = old_slots.get(key)
+        if old_slot is not None:
+            from_index = occupied.count_before(old_slot)
+            occupied.add(old_slot, -1)
+        to_index = occupied.count_before(new_slots[key])
+        occupied.add(new_slots[key], 1)
+        if old_slot is None:
+            changes.append(
+                {"op": "add", "path": f"{path}/{to_index}", "value": new[new_index]}
+            )
+        elif from_index != to_index:
+            changes.append(
+                {
+                    "op": "move",
+                    "from": f"{path}/{from_index}",
+                    "path": f"{path}/{to_index}",
+                }
+            )
+
+    old_indices = {key: index for index, key in enumerate(old_keys)}
+    for new_index, key in enumerate(new_keys):
+        if key in old_indices:
+            _diff_node(
+                old[old_indices[key]],
+                new[new_index],
+                f"{path}/{new_index}",
+                changes,
+                keys,
+            )
+
+
+def _longest_increasing_subsequence(values: list[int]) -> list[int]:
+    """Return the indices of a longest strictly increasing subsequence of values"""
+    # tails[n] is the index of the smallest value ending an increasing run of length n+1
+    tails: list[int] = []
+    previous: list[int] = [-1] * len(values)
+    for index, value in enumerate(values):
+        low, high = 0, len(tails)
+        while low < high:
+            middle = (low + high) // 2
+            if values[tails[middle]] < value:
+                low = middle + 1
+            else:
+                high = middle
+        if low:
+            previous[index] = tails[low - 1]
+        if low == len(tails):
+            tails.append(index)
+        else:
+            tails[low] = index
+
+    result: list[int] = []
+    index = tails[-1] if tails else -1
+    while index != -1:
+        result.append(index)
+        index = previous[index]
+    return result[::-1]
+
+
+class _SlotCounter:
+    """Count occupied slots before a given one in logarithmic time (a Fenwick tree)"""
+
+    __slots__ = ("_tree",)
+
+    def __init__(self, size: int, occupied: Iterable[int]) -> None:
+        tree = [0] * (size + 1)
+        for slot in occupied:
+            tree[slot + 1] += 1
+        for index in range(1, size + 1):
+            parent = index + (index & -index)
+            if parent <= size:
+                tree[parent] += tree[index]
+        self._tree = tree
+
+    def add(self, slot: int, amount: int) -> None:
+        index = slot + 1
+        while index < len(self._tree):
+            self._tree[index] += amount
+            index += index & -index
+
+    def count_before(self, slot: int) -> int:
+        count = 0
+        index = slot
+        while index > 0:
+            count += self._tree[index]
+            index -= index & -index
+        return count
+
+
+def _diff_mapping(
+    old: dict[str, Any],
+    new: dict[str, Any],
+    path: str,
+    changes: list[LayoutUpdateChange],
+) -> None:
+    for name, new_value in new.items():
+        if name not in old:
+            changes.append(
+                {"op": "add", "path": f"{path}/{_escape(name)}", "value": new_value}
+            )
+        elif old[name] != new_value:
+            changes.append(
+                {"op": "replace", "path": f"{path}/{_escape(name)}", "value": new_value}
+            )
+    for name in old:
+        if name not in new:
+            changes.append({"op": "remove", "path": f"{path}/{_escape(name)}"})
+
+
+def _get_child_keys(children: list[Any], keys: Mapping[int, Any]) -> list[Any] | None:
+    """Get the keys of the given children if all have one and they are unique"""
+    child_keys = []
+    for child in children:
+        key = _get_key(child, keys) if isinstance(child, dict) else None
+        if key is None:
+            return None
+        child_keys.append(key)
+    return child_keys if len(set(child_keys)) == len(child_keys) else None
+
+
+def _get_key(model: dict[str, Any], keys: Mapping[int, Any]) -> Any:
+    key = model.get("attributes", {}).get("key")
+    return keys.get(id(model)) if key is None else key
+
+
+def _escape(name: str) -> str:
+    return name.replace("~", "~0").replace("/", "~1")
@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import logging
 import sys
-from asyncio import Event, Task, create_task, gather
+from asyncio import Event, Task, create_task, gather, wait_for
 from collections.abc import Callable
 from contextvars import ContextVar, Token
 from typing import Any, Protocol, TypeVar
 
 from anyio import Semaphore
 
+from reactpy.config import REACTPY_UNMOUNT_TIMEOUT
 from reactpy.core._thread_local import ThreadLocal
 from reactpy.types import Component, Context, ContextProvider
 from reactpy.utils import Singleton
@@ -22,6 +23,17 @@ class EffectFunc(Protocol):
 
 logger = logging.getLogger(__name__)
 
+# Render lanes in order of priority. Renders in more urgent lanes are started first.
+URGENT_LANE = 0
+"""Renders caused by user input (i.e. while handling an event)"""
+DEFAULT_LANE = 1
+"""Renders with no particular priority"""
+BACKGROUND_LANE = 2
+"""Renders which may be deferred until more urgent ones are done"""
+
+RENDER_LANE: ContextVar[int] = ContextVar("render_lane", default=DEFAULT_LANE)
+"""The lane of any renders which are scheduled in the current context"""
+
 
 class _HookStack(Singleton):  # nocov
     """A singleton object which manages the current component tree's hooks.
@@ -138,6 +150,7 @@ class LifeCycleHook:
         "__weakref__",
         "_context_providers",
         "_current_state_index",
+        "_effect_cleanups",
         "_effect_funcs",
         "_effect_stops",
         "_effect_tasks",
@@ -146,6 +159,7 @@ class LifeCycleHook:
         "_schedule_render_callback",
         "_scheduled_render",
         "_state",
+        "_sync_effect_funcs",
         "component",
     )
 
@@ -157,17 +171,25 @@ class LifeCycleHook:
     ) -> None:
         self._context_providers: dict[Context[Any], ContextProvider[Any]] = {}
         self._schedule_render_callback = schedule_render
-        self._scheduled_render = False
+        self._scheduled_render: int | None = None
         self._rendered_atleast_once = False
         self._current_state_index = 0
         self._state: list = []
         self._effect_funcs: list[EffectFunc] = []
         self._effect_tasks: list[Task[None]] = []
         self._effect_stops: list[Event] = []
+        self._sync_effect_funcs: list[Callable[[], None]] = []
+        self._effect_cleanups: list[Callable[[], None]] = []
         self._render_access = Semaphore(1)  # ensure only one render at a time
 
     def schedule_render(self) -> None:
-        if self._scheduled_render:
+        """Schedule a render in the current :data:`RENDER_LANE`
+
+        A render which is already scheduled is only scheduled again if the current
+        lane is more urgent.
+        """
+        lane = RENDER_LANE.get()
+        if self._scheduled_render is not None and self._scheduled_render <= lane:
             return None
         try:
             self._schedule_render_callback()
@@ -175,7 +197,12 @@ class LifeCycleHook:
             msg = f"Failed to schedule render via {self._schedule_render_callback}"
             logger.exception(msg)
         else:
-            self._scheduled_render = True
+            self._scheduled_render = lane
+
+    @property
+    def render_is_scheduled(self) -> bool:
+        """Whether this hook's component has requested a render it has yet to perform"""
+        return self._scheduled_render is not None
 
     def use_state(self, function: Callable[[], T]) -> T:
         """Add state to this hook
@@ -204,6 +231,34 @@ class LifeCycleHook:
         """
         self._effect_funcs.append(effect_func)
 
+    def add_sync_effect(self, effect_func: Callable[[], None]) -> None:
+        """Add a synchronous effect to this hook
+
+        Unlike effects added with :meth:`add_effect`, no task is created for these.
+        The layout runs them in a batch, via :meth:`run_sync_effects`, soon after the
+        component is done rendering.
+        """
+        self._sync_effect_funcs.append(effect_func)
+
+    def add_effect_cleanup(self, cleanup_func: Callable[[], None]) -> None:
+        """Add a function which cleans up an effect when the component will unmount"""
+        self._effect_cleanups.append(cleanup_func)
+
+    @property
+    def has_sync_effects(self) -> bool:
+        """Whether this hook has synchronous effects which have yet to run"""
+        return bool(self._sync_effect_funcs)
+
+    def run_sync_effects(self) -> None:
+        """Run the synchronous effects added since they were last run"""
+        effect_funcs = self._sync_effect_funcs
+        self._sync_effect_funcs = []
+        for effect_func in effect_funcs:
+            try:
+                effect_func()
+            except Exception:
+                logger.exception(f"Error in effect {effect_func}")
+
     def set_context_provider(self, provider: ContextProvider[Any]) -> None:
         """Set a context provider for this hook
 
@@ -220,10 +275,23 @@ class LifeCycleHook:
         """
         return self._context_providers.get(context)
 
+    def context_providers_changed(self) -> bool:
+        """Whether the context providers inherited from the current hook provide
+        different values than they did when this hook's component last rendered
+        """
+        hook_stack = HOOK_STACK.get()
+        if not hook_stack:
+            return False
+        for context, provider in hook_stack[-1]._context_providers.items():
+            old_provider = self._context_providers.get(context)
+            if old_provider is None or old_provider.value is not provider.value:
+                return True
+        return False
+
     async def affect_component_will_render(self, component: Component) -> None:
         """The component is about to render"""
         await self._render_access.acquire()
-        self._scheduled_render = False
+        self._scheduled_render = None
         self.component = component
         self.set_current()
 
@@ -237,18 +305,40 @@ class LifeCycleHook:
 
     async def affect_layout_did_render(self) -> None:
         """The layout completed a render"""
+        if not self._effect_funcs:
+            return None
         stop = Event()
         self._effect_stops.append(stop)
         self._effect_tasks.extend(create_task(e(stop)) for e in self._effect_funcs)
         self._effect_funcs.clear()
 
     async def affect_component_will_unmount(self) -> None:
-        """The component is about to be removed from the layout"""
+        """The component is about to be removed from the layout
+
+        Effects which do not stop within :data:`REACTPY_UNMOUNT_TIMEOUT` are cancelled.
+        """
+        # effects which have not run yet never will
+        self._sync_effect_funcs.clear()
+        for cleanup_func in self._effect_cleanups:
+            try:
+                cleanup_func()
+            except Exception:
+                logger.exception(f"Error in effect clean-up {cleanup_func}")
+        self._effect_cleanups.clear()
+
         for stop in self._effect_stops:
             stop.set()
         self._effect_stops.clear()
+        if not self._effect_tasks:
+            return None
+        timeout = REACTPY_UNMOUNT_TIMEOUT.current or None
         try:
-            await gather(*self._effect_tasks)
+            await wait_for(gather(*self._effect_tasks), timeout)
+        except TimeoutError:
+            logger.error(
+                f"Effects did not stop within {timeout} seconds of unmounting - "
+                "they were cancelled"
+            )
         except Exception:
             logger.exception("Error in effect")
         finally:
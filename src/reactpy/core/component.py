@@ -3,19 +3,207 @@ from __future__ import annotations
 import inspect
 from collections.abc import Callable
 from functools import wraps
-from typing import Any
+from typing import Any, overload
 
-from reactpy.types import Component, VdomDict
+from reactpy.core.hooks import strictly_equal
+from reactpy.types import Component, RenderOffload, VdomDict
 
+PropsComparator = Callable[[dict[str, Any], dict[str, Any]], bool]
+"""Compare the old and new arguments (by parameter name) of a memoized component"""
 
+
+@overload
 def component(
     function: Callable[..., Component | VdomDict | str | None],
-) -> Callable[..., Component]:
+    *,
+    offload: RenderOffload | None = ...,
+) -> Callable[..., Component]: ...
+
+
+@overload
+def component(
+    function: None = ...,
+    *,
+    offload: RenderOffload | None = ...,
+) -> Callable[
+    [Callable[..., Component | VdomDict | str | None]], Callable[..., Component]
+]: ...
+
+
+def component(
+    function: Callable[..., Component | VdomDict | str | None] | None = None,
+    *,
+    offload: RenderOffload | None = None,
+) -> (
+    Callable[..., Component]
+    | Callable[
+        [Callable[..., Component | VdomDict | str | None]], Callable[..., Component]
+    ]
+):
     """A decorator for defining a new component.
 
     Parameters:
-        function: The component's :meth:`reactpy.core.proto.ComponentType.render` function.
+        function:
+            The component's :meth:`reactpy.core.proto.ComponentType.render` function.
+        offload:
+            Where to run the render function. If ``"thread"``, it runs in a worker
+            thread so that CPU heavy renders do not block the event loop. Hooks may be
+            used as normal, but state must not be set while rendering.
+    """
+    _check_offload(offload)
+
+    def setup(
+        function: Callable[..., Component | VdomDict | str | None],
+    ) -> Callable[..., Component]:
+        sig = _get_render_function_signature(function)
+
+        @wraps(function)
+        def constructor(*args: Any, key: Any | None = None, **kwargs: Any) -> Component:
+            return Component(function, key, args, kwargs, sig, offload=offload)
+
+        return constructor
+
+    return setup(function) if function is not None else setup
+
+
+@overload
+def memo(
+    function: Callable[..., Component | VdomDict | str | None],
+    *,
+    props_are_equal: PropsComparator | None = ...,
+    offload: RenderOffload | None = ...,
+) -> Callable[..., Component]: ...
+
+
+@overload
+def memo(
+    function: None = ...,
+    *,
+    props_are_equal: PropsComparator | None = ...,
+    offload: RenderOffload | None = ...,
+) -> Callable[
+    [Callable[..., Component | VdomDict | str | None]], Callable[..., Component]
+]: ...
+
+
+def memo(
+    function: Callable[..., Component | VdomDict | str | None] | None = None,
+    *,
+    props_are_equal: PropsComparator | None = None,
+    offload: RenderOffload | None = None,
+) -> (
+    Callable[..., Component]
+    | Callable[
+        [Callable[..., Component | VdomDict | str | None]], Callable[..., Component]
+    ]
+):
+    """A decorator for defining a component which skips re-rendering when its
+    arguments are unchanged.
+
+    When the parent of a memoized component re-renders, the layout compares the new
+    arguments with those from the last render. If they are equal, the component and
+    its children keep their previous model instead of rendering again. Changes to the
+    component's own state, or to a context it inherits, still cause it to render.
+
+    By default, callables are compared by identity and all other arguments with
+    :func:`~reactpy.core.hooks.strictly_equal`. So a callback created while rendering
+    the parent causes the component to render again, since it may refer to new values.
+
+    Parameters:
+        function:
+            The component's :meth:`reactpy.core.proto.ComponentType.render` function.
+        props_are_equal:
+            A function accepting the old and new arguments (as dictionaries mapping
+            parameter names to values) that returns whether they are equal.
+        offload:
+            Where to run the render function. See :func:`component`.
     """
+    _check_offload(offload)
+
+    def setup(
+        function: Callable[..., Component | VdomDict | str | None],
+    ) -> Callable[..., Component]:
+        sig = _get_render_function_signature(function)
+
+        @wraps(function)
+        def constructor(*args: Any, key: Any | None = None, **kwargs: Any) -> Component:
+            return MemoComponent(
+                function,
+                key,
+                args,
+                kwargs,
+                sig,
+                offload=offload,
+                props_are_equal=props_are_equal,
+            )
+
+        return constructor
+
+    return setup(function) if function is not None else setup
+
+
+class MemoComponent(Component):
+    """A component which skips re-rendering when its arguments are unchanged"""
+
+    __slots__ = ("_props_are_equal",)
+
+    def __init__(
+        self,
+        function: Callable[..., Component | VdomDict | str | None],
+        key: Any | None,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        sig: inspect.Signature,
+        *,
+        offload: RenderOffload | None = None,
+        props_are_equal: PropsComparator | None = None,
+    ) -> None:
+        super().__init__(function, key, args, kwargs, sig, offload=offload)
+        self._props_are_equal = props_are_equal
+
+    def has_same_props(self, other: Component) -> bool:
+        """Whether this component was given the same arguments as another"""
+        if other.type is not self.type:
+            return False
+
+        if self._props_are_equal is not None:
+            try:
+                old_props = other._sig.bind(*other._args, **other._kwargs).arguments
+                new_props = self._sig.bind(*self._args, **self._kwargs).arguments
+            except TypeError:
+                return False
+            return self._props_are_equal(old_props, new_props)
+
+        return (
+            len(other._args) == len(self._args)
+            and other._kwargs.keys() == self._kwargs.keys()
+            and all(map(_prop_is_unchanged, other._args, self._args))
+            and all(
+                _prop_is_unchanged(v, self._kwargs[k]) for k, v in other._kwargs.items()
+            )
+        )
+
+
+def _prop_is_unchanged(old: Any, new: Any) -> bool:
+    # functions with the same code may still close over different values
+    if callable(old):
+        return old is new
+    return strictly_equal(old, new)
+
+
+def _check_offload(offload: RenderOffload | None) -> None:
+    if offload not in (None, "thread"):
+        msg = (
+            f"Expected offload to be None or 'thread', not {offload!r} - renders "
+            "cannot be offloaded to another process since component state and event "
+            "handlers must remain in the layout's process"
+        )
+        raise ValueError(msg)
+
+
+def _get_render_function_signature(
+    function: Callable[..., Component | VdomDict | str | None],
+) -> inspect.Signature:
     sig = inspect.signature(function)
 
     if "key" in sig.parameters and sig.parameters["key"].kind in (
@@ -25,8 +213,4 @@ def component(
         msg = f"Component render function {function} uses reserved parameter 'key'"
         raise TypeError(msg)
 
-    @wraps(function)
-    def constructor(*args: Any, key: Any | None = None, **kwargs: Any) -> Component:
-        return Component(function, key, args, kwargs, sig)
-
-    return constructor
+    return sig
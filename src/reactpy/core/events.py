@@ -18,6 +18,9 @@ def event(
     *,
     stop_propagation: bool = ...,
     prevent_default: bool = ...,
+    throttle_ms: int | None = ...,
+    debounce_ms: int | None = ...,
+    fields: Sequence[str] | None = ...,
 ) -> EventHandler: ...
 
 
@@ -27,6 +30,9 @@ def event(
     *,
     stop_propagation: bool = ...,
     prevent_default: bool = ...,
+    throttle_ms: int | None = ...,
+    debounce_ms: int | None = ...,
+    fields: Sequence[str] | None = ...,
 ) -> Callable[[Callable[..., Any]], EventHandler]: ...
 
 
@@ -35,6 +41,9 @@ def event(
     *,
     stop_propagation: bool = False,
     prevent_default: bool = False,
+    throttle_ms: int | None = None,
+    debounce_ms: int | None = None,
+    fields: Sequence[str] | None = None,
 ) -> EventHandler | Callable[[Callable[..., Any]], EventHandler]:
     """A decorator for constructing an :class:`EventHandler`.
 
@@ -63,6 +72,15 @@ def event(
             Block the event from propagating further up the DOM.
         prevent_default:
             Stops the default actional associate with the event from taking place.
+        throttle_ms:
+            Have the client send at most one event per this many milliseconds. The
+            latest event to occur during that time is sent once it ends.
+        debounce_ms:
+            Have the client only send the latest event once no others have occurred
+            for this many milliseconds.
+        fields:
+            Dot-delimited paths (e.g. ``"target.value"``) of the only parts of each
+            event which the client should send. By default, the whole event is sent.
     """
 
     def setup(function: Callable[..., Any]) -> EventHandler:
@@ -70,6 +88,9 @@ def event(
             to_event_handler_function(function, positional_args=True),
             stop_propagation,
             prevent_default,
+            throttle_ms=throttle_ms,
+            debounce_ms=debounce_ms,
+            fields=fields,
         )
 
     return setup(function) if function is not None else setup
@@ -87,6 +108,13 @@ class EventHandler(BaseEventHandler):
             Stops the default action associate with the event from taking place.
         target:
             A unique identifier for this event handler (auto-generated by default)
+        throttle_ms:
+            Have the client send at most one event per this many milliseconds.
+        debounce_ms:
+            Have the client only send the latest event once no others have occurred
+            for this many milliseconds.
+        fields:
+            Dot-delimited paths of the only parts of each event the client should send.
     """
 
     def __init__(
@@ -95,11 +123,31 @@ class EventHandler(BaseEventHandler):
         stop_propagation: bool = False,
         prevent_default: bool = False,
         target: str | None = None,
+        *,
+        throttle_ms: int | None = None,
+        debounce_ms: int | None = None,
+        fields: Sequence[str] | None = None,
     ) -> None:
+        if isinstance(fields, str):
+            msg = (
+                f"Expected fields to be a sequence of paths, not the string {fields!r}"
+            )
+            raise TypeError(msg)
+        if throttle_ms is not None and debounce_ms is not None:
+            msg = "An event handler cannot be both throttled and debounced"
+            raise ValueError(msg)
+        for name, value in (("throttle_ms", throttle_ms), ("debounce_ms", debounce_ms)):
+            if value is not None and value <= 0:
+                msg = f"Expected {name} to be a positive number, not {value!r}"
+                raise ValueError(msg)
+
         self.function = to_event_handler_function(function, positional_args=False)
         self.prevent_default = prevent_default
         self.stop_propagation = stop_propagation
         self.target = target
+        self.throttle_ms = throttle_ms
+        self.debounce_ms = debounce_ms
+        self.fields = tuple(fields) if fields is not None else None
 
         # Check if our `preventDefault` or `stopPropagation` methods were called
         # by inspecting the function's bytecode
@@ -128,6 +176,9 @@ class EventHandler(BaseEventHandler):
                 "prevent_default",
                 "stop_propagation",
                 "target",
+                "throttle_ms",
+                "debounce_ms",
+                "fields",
             )
         )
 
@@ -181,8 +232,9 @@ def merge_event_handlers(
     """Merge multiple event handlers into one
 
     Raises a ValueError if any handlers have conflicting
-    :attr:`~reactpy.core.proto.EventHandlerType.stop_propagation` or
-    :attr:`~reactpy.core.proto.EventHandlerType.prevent_default` attributes.
+    :attr:`~reactpy.core.proto.EventHandlerType.stop_propagation`,
+    :attr:`~reactpy.core.proto.EventHandlerType.prevent_default`, rate limiting, or
+    field attributes.
     """
     if not event_handlers:
         msg = "No event handlers to merge"
@@ -195,14 +247,20 @@ def merge_event_handlers(
     stop_propagation = first_handler.stop_propagation
     prevent_default = first_handler.prevent_default
     target = first_handler.target
+    throttle_ms = getattr(first_handler, "throttle_ms", None)
+    debounce_ms = getattr(first_handler, "debounce_ms", None)
+    fields = getattr(first_handler, "fields", None)
 
     for handler in event_handlers:
         if (
             handler.stop_propagation != stop_propagation
             or handler.prevent_default != prevent_default
             or handler.target != target
+            or getattr(handler, "throttle_ms", None) != throttle_ms
+            or getattr(handler, "debounce_ms", None) != debounce_ms
+            or getattr(handler, "fields", None) != fields
         ):
-            msg = "Cannot merge handlers - 'stop_propagation', 'prevent_default' or 'target' mismatch."
+            msg = "Cannot merge handlers - 'stop_propagation', 'prevent_default', 'target', 'throttle_ms', 'debounce_ms' or 'fields' mismatch."
             raise ValueError(msg)
 
     return EventHandler(
@@ -210,6 +268,9 @@ def merge_event_handlers(
         stop_propagation,
         prevent_default,
         target,
+        throttle_ms=throttle_ms,
+        debounce_ms=debounce_ms,
+        fields=fields,
     )
 
 
@@ -18,7 +18,7 @@ from typing import (
 )
 
 from reactpy.config import REACTPY_DEBUG
-from reactpy.core._life_cycle_hook import HOOK_STACK
+from reactpy.core._life_cycle_hook import BACKGROUND_LANE, HOOK_STACK, RENDER_LANE
 from reactpy.types import (
     Connection,
     Context,
@@ -37,6 +37,7 @@ if TYPE_CHECKING:
 
 
 __all__ = [
+    "start_transition",
     "use_async_effect",
     "use_callback",
     "use_effect",
@@ -146,6 +147,11 @@ def use_effect(
     dependencies = _try_to_infer_closure_values(function, dependencies)
     memoize = use_memo(dependencies=dependencies)
     cleanup_func: Ref[_EffectCleanFunc | None] = use_ref(None)
+    # Run the clean-up function when the component unmounts, if it hasn't been run
+    # already by a new effect
+    _use_const(
+        lambda: hook.add_effect_cleanup(lambda: run_effect_cleanup(cleanup_func))
+    )
 
     def decorator(func: _SyncEffectFunc) -> None:
         if inspect.iscoroutinefunction(func):
@@ -154,22 +160,14 @@ def use_effect(
                 "Use `use_async_effect` instead."
             )
 
-        async def effect(stop: asyncio.Event) -> None:
-            # Since the effect is asynchronous, we need to make sure we
-            # always clean up the previous effect's resources
+        def effect() -> None:
+            # Clean up the previous effect's resources before applying it again
             run_effect_cleanup(cleanup_func)
 
             # Execute the effect and store the clean-up function
             cleanup_func.current = func()
 
-            # Wait until we get the signal to stop this effect
-            await stop.wait()
-
-            # Run the clean-up function when the effect is stopped,
-            # if it hasn't been run already by a new effect
-            run_effect_cleanup(cleanup_func)
-
-        return memoize(lambda: hook.add_effect(effect))
+        return memoize(lambda: hook.add_sync_effect(effect))
 
     # Handle decorator usage
     if function:
@@ -297,6 +295,23 @@ def use_debug_value(
         logger.debug(f"{HOOK_STACK.current_hook().component} {new}")
 
 
+def start_transition(function: Callable[[], None]) -> None:
+    """Call a function which updates state as a low priority transition
+
+    Renders scheduled by the function are deferred until no other renders are in
+    progress. This keeps frequent but non-urgent updates, such as those from a
+    periodic effect, from delaying renders in response to user input.
+
+    Parameters:
+        function: A function that sets state
+    """
+    token = RENDER_LANE.set(BACKGROUND_LANE)
+    try:
+        function()
+    finally:
+        RENDER_LANE.reset(token)
+
+
 def create_context(default_value: _Type) -> Context[_Type]:
     """Return a new context type for use in :func:`use_context`"""
 
@@ -1,19 +1,28 @@
 from __future__ import annotations
 
 from asyncio import (
-    FIRST_COMPLETED,
     CancelledError,
+    Handle,
+    PriorityQueue,
     Queue,
     Task,
     create_task,
     current_task,
+    gather,
     get_running_loop,
+    shield,
+    sleep,
+    to_thread,
     wait,
+    wait_for,
 )
 from collections import Counter
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable, Iterable
 from contextlib import AsyncExitStack, suppress
+from contextvars import ContextVar
+from itertools import count
 from logging import getLogger
+from time import perf_counter
 from types import TracebackType
 from typing import (
     Any,
@@ -24,27 +33,49 @@ from typing import (
     TypeVar,
     cast,
 )
-from uuid import uuid4
 from weakref import ref as weakref
 
-from anyio import Semaphore
-
 from reactpy.config import (
     REACTPY_ASYNC_RENDERING,
+    REACTPY_BATCH_UPDATES,
+    REACTPY_BATCH_UPDATES_WINDOW,
     REACTPY_CHECK_VDOM_SPEC,
     REACTPY_DEBUG,
+    REACTPY_DIFF_UPDATES,
+    REACTPY_METRICS,
+    REACTPY_RENDER_TIME_SLICE,
+    REACTPY_UNMOUNT_CONCURRENCY,
+)
+from reactpy.core._diff import diff_models
+from reactpy.core._life_cycle_hook import (
+    BACKGROUND_LANE,
+    DEFAULT_LANE,
+    HOOK_STACK,
+    RENDER_LANE,
+    URGENT_LANE,
+    LifeCycleHook,
+)
+from reactpy.core.component import MemoComponent
+from reactpy.core.metrics import LayoutMetrics, layout_finished, layout_started
+from reactpy.core.tracing import end_span, is_tracing
+from reactpy.core.vdom import (
+    StaticVdomDict,
+    validate_vdom_json,
+    validate_vdom_json_element,
 )
-from reactpy.core._life_cycle_hook import HOOK_STACK, LifeCycleHook
-from reactpy.core.vdom import validate_vdom_json
 from reactpy.types import (
+    BaseEventHandler,
     BaseLayout,
     Component,
     Context,
     ContextProvider,
     Event,
     EventHandlerDict,
+    JsonEventTarget,
     Key,
     LayoutEventMessage,
+    LayoutStats,
+    LayoutUpdateBatchMessage,
     LayoutUpdateMessage,
     VdomChild,
     VdomJson,
@@ -61,6 +92,8 @@ class Layout(BaseLayout):
             msg = f"Expected a ReactPy component, not {type(root)!r}."
             raise TypeError(msg)
         self.root = root
+        self.metrics = LayoutMetrics()
+        """Metrics recorded while :data:`REACTPY_METRICS` is enabled"""
 
     async def __aenter__(self) -> Layout:
         # create attributes here to avoid access before entering context manager
@@ -69,13 +102,25 @@ class Layout(BaseLayout):
         self._render_tasks_by_id: dict[
             _LifeCycleStateId, Task[LayoutUpdateMessage]
         ] = {}
-        self._render_tasks_ready: Semaphore = Semaphore(0)
+        self._completed_render_tasks: Queue[Task[LayoutUpdateMessage]] = Queue()
+        self._pending_renders: dict[_LifeCycleStateId, int] = {}
+        self._dropped_renders: dict[_LifeCycleStateId, int] = {}
+        self._start_pending_renders_handle: Handle | None = None
+        self._hooks_with_sync_effects: list[LifeCycleHook] = []
+        self._run_sync_effects_handle: Handle | None = None
         self._rendering_queue: _ThreadSafeQueue[_LifeCycleStateId] = _ThreadSafeQueue()
-        root_model_state = _new_root_model_state(self.root, self._schedule_render_task)
+        self._new_id = _IdAllocator()
+        self._event_times: dict[_LifeCycleStateId, float] = {}
+        root_model_state = _new_root_model_state(
+            self.root, self._schedule_render_task, self._new_id
+        )
         self._root_life_cycle_state_id = root_id = root_model_state.life_cycle_state.id
         self._model_states_by_life_cycle_state_id = {root_id: root_model_state}
         self._schedule_render_task(root_id)
 
+        if REACTPY_METRICS.current:
+            layout_started(self)
+
         return self
 
     async def __aexit__(
@@ -84,7 +129,12 @@ class Layout(BaseLayout):
         root_csid = self._root_life_cycle_state_id
         root_model_state = self._model_states_by_life_cycle_state_id[root_csid]
 
-        for t in self._render_tasks:
+        layout_finished(self)
+        if self._start_pending_renders_handle is not None:
+            self._start_pending_renders_handle.cancel()
+        if self._run_sync_effects_handle is not None:
+            self._run_sync_effects_handle.cancel()
+        for t in list(self._render_tasks):
             t.cancel()
             with suppress(CancelledError):
                 await t
@@ -93,6 +143,11 @@ class Layout(BaseLayout):
         # delete attributes here to avoid access after exiting context manager
         del self._event_handlers
         del self._rendering_queue
+        del self._new_id
+        del self._pending_renders
+        del self._dropped_renders
+        del self._event_times
+        del self._hooks_with_sync_effects
         del self._render_tasks_by_id
         del self._root_life_cycle_state_id
         del self._model_states_by_life_cycle_state_id
@@ -106,20 +161,54 @@ class Layout(BaseLayout):
         handler = self._event_handlers.get(event["target"])
 
         if handler is not None:
+            # renders caused by user input are started before any others
+            token = RENDER_LANE.set(URGENT_LANE)
+            event_time_token = _EVENT_TIME.set(
+                perf_counter() if REACTPY_METRICS.current else None
+            )
+            span_start = perf_counter() if is_tracing() else None
             try:
                 data = [Event(d) if isinstance(d, dict) else d for d in event["data"]]
                 await handler.function(data)
             except Exception:
                 logger.exception(f"Failed to execute event handler {handler}")
+            finally:
+                _EVENT_TIME.reset(event_time_token)
+                RENDER_LANE.reset(token)
+                if span_start is not None:
+                    end_span(
+                        "deliver",
+                        _get_handler_name(handler.function),
+                        span_start,
+                        {"target": event["target"]},
+                    )
         else:
             logger.info(
                 f"Ignored event - handler {event['target']!r} "
                 "does not exist or its component unmounted"
             )
 
-    async def render(self) -> LayoutUpdateMessage:
+    def stats(self) -> LayoutStats:
+        """Metrics describing the work done by this layout
+
+        Metrics are only recorded while :data:`REACTPY_METRICS` is enabled.
+        """
+        try:
+            pending_renders = (
+                len(self._pending_renders)
+                + len(self._render_tasks)
+                + len(self._rendering_queue)
+            )
+        except AttributeError:
+            pending_renders = 0  # the layout is not open
+        return self.metrics.stats(pending_renders)
+
+    async def render(self) -> LayoutUpdateMessage | LayoutUpdateBatchMessage:
         if REACTPY_ASYNC_RENDERING.current:
-            return await self._parallel_render()
+            update = await self._parallel_render()
+            if REACTPY_BATCH_UPDATES.current:
+                return await self._batch_parallel_renders(update)
+            return update
         else:  # nocov
             return await self._serial_render()
 
@@ -135,34 +224,82 @@ class Layout(BaseLayout):
                     f"{model_state_id!r} - component already unmounted"
                 )
             else:
+                if self._rendering_queue.has_any_pending(
+                    _get_ancestor_life_cycle_state_ids(model_state)
+                ):
+                    logger.debug(
+                        "Did not render component with model state ID "
+                        f"{model_state_id!r} - an ancestor is scheduled to render"
+                    )
+                    self._dropped_renders[model_state_id] = DEFAULT_LANE
+                    continue
                 return await self._create_layout_update(model_state)
 
     async def _parallel_render(self) -> LayoutUpdateMessage:
-        """Await to fetch the first completed render within our asyncio task group.
-        We use the `asyncio.tasks.wait` API in order to return the first completed task.
+        """Await the next completed render task.
+
+        Updates are returned in the order their renders completed. This ensures each
+        update applies on top of the model produced by the one that preceded it.
         """
         while True:
-            await self._render_tasks_ready.acquire()
-            if not self._render_tasks:  # nocov
-                continue
-            done, _ = await wait(self._render_tasks, return_when=FIRST_COMPLETED)
-            update_task: Task[LayoutUpdateMessage] = done.pop()
-            self._render_tasks.discard(update_task)
-
-            for lcs_id, task in list(self._render_tasks_by_id.items()):
-                if task is update_task:
-                    del self._render_tasks_by_id[lcs_id]
-                    break
-
+            update_task = await self._completed_render_tasks.get()
             try:
                 return update_task.result()
             except CancelledError:  # nocov
                 continue
 
+    async def _batch_parallel_renders(
+        self, first_update: LayoutUpdateMessage
+    ) -> LayoutUpdateMessage | LayoutUpdateBatchMessage:
+        """Collect the renders which complete shortly after the given one.
+
+        Renders are collected for :data:`REACTPY_BATCH_UPDATES_WINDOW` milliseconds, or
+        if that is zero, until an iteration of the event loop completes no more renders.
+        """
+        updates = [first_update]
+        window = REACTPY_BATCH_UPDATES_WINDOW.current / 1000
+        if window > 0:
+            loop = get_running_loop()
+            deadline = loop.time() + window
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    updates.append(await wait_for(self._parallel_render(), remaining))
+                except TimeoutError:
+                    break
+        else:
+            while True:
+                await sleep(0)
+                if self._completed_render_tasks.empty():
+                    break
+                while not self._completed_render_tasks.empty():
+                    update_task = self._completed_render_tasks.get_nowait()
+                    with suppress(CancelledError):
+                        updates.append(update_task.result())
+
+        if len(updates) == 1:
+            return first_update
+        return {"type": "layout-update-batch", "updates": updates}
+
+    def _render_task_done(self, task: Task[LayoutUpdateMessage]) -> None:
+        self._render_tasks.discard(task)
+        for lcs_id, other_task in list(self._render_tasks_by_id.items()):
+            if other_task is task:
+                del self._render_tasks_by_id[lcs_id]
+                break
+        if not task.cancelled():
+            self._completed_render_tasks.put_nowait(task)
+        if self._pending_renders and self._start_pending_renders_handle is None:
+            # start any renders which were deferred until this one was done
+            self._start_pending_renders_handle = get_running_loop().call_soon(
+                self._start_pending_renders
+            )
+
     async def _create_layout_update(
         self, old_state: _ModelState
     ) -> LayoutUpdateMessage:
         token = HOOK_STACK.initialize()
+        render = _RenderState()
+        render_token = _CURRENT_RENDER.set(render)
         try:
             component = old_state.life_cycle_state.component
             try:
@@ -180,21 +317,35 @@ class Layout(BaseLayout):
                     component,
                 )
 
+            if render.unchecked_models:
+                for validate, model in render.unchecked_models:
+                    validate(model)
+
             if parent is not None:
                 parent.children_by_key[new_state.key] = new_state
-                old_parent_model = parent.model.current
-                old_parent_children = old_parent_model.setdefault("children", [])
-                parent.model.current = {
-                    **old_parent_model,
-                    "children": [
-                        *old_parent_children[: new_state.index],
-                        new_state.model.current,
-                        *old_parent_children[new_state.index + 1 :],
-                    ],
-                }
-
-            if REACTPY_CHECK_VDOM_SPEC.current:
-                validate_vdom_json(new_state.model.current)
+                _update_ancestor_models(new_state)
+
+            if render.record_metrics:
+                self.metrics.record_update(render.nodes_visited)
+                if render.event_time is not None:
+                    self.metrics.record_event_update(perf_counter() - render.event_time)
+
+            if REACTPY_DIFF_UPDATES.current:
+                try:
+                    old_model = old_state.model.current
+                except AttributeError:
+                    pass  # this is the first render - there is nothing to compare to
+                else:
+                    changes = diff_models(
+                        old_model, new_state.model.current, render.component_keys
+                    )
+                    # a wholesale replacement is better sent as a plain model
+                    if not (len(changes) == 1 and not changes[0]["path"]):
+                        return {
+                            "type": "layout-update",
+                            "path": new_state.patch_path,
+                            "changes": changes,
+                        }
 
             return {
                 "type": "layout-update",
@@ -202,6 +353,7 @@ class Layout(BaseLayout):
                 "model": new_state.model.current,
             }
         finally:
+            _CURRENT_RENDER.reset(render_token)
             HOOK_STACK.reset(token)
 
     async def _render_component(
@@ -213,9 +365,33 @@ class Layout(BaseLayout):
         key: Any,
         component: Component,
     ) -> _ModelState:
+        if (
+            old_state is not None
+            and parent is not None
+            and isinstance(component, MemoComponent)
+            and old_state.is_component_state
+            and _can_skip_memo_render(old_state.life_cycle_state, component)
+            and not self._is_rendering_below(old_state)
+        ):
+            # reuse the previous subtree - including its event handler targets
+            _move_model_state(old_state, parent, index)
+            if self._dropped_renders:
+                self._schedule_dropped_renders(old_state)
+            return old_state
+
+        render = _visit_node()
+        if render is not None and render.time_slice_is_used():
+            await render.start_next_time_slice()
+        span_start = perf_counter() if is_tracing() else None
+
         if old_state is None:
             new_state = _make_component_model_state(
-                parent, index, key, component, self._schedule_render_task
+                parent,
+                index,
+                key,
+                component,
+                self._schedule_render_task,
+                new_id=self._new_id,
             )
         elif (
             old_state.is_component_state
@@ -223,13 +399,23 @@ class Layout(BaseLayout):
         ):
             await self._unmount_model_states([old_state])
             new_state = _make_component_model_state(
-                parent, index, key, component, self._schedule_render_task
+                parent,
+                index,
+                key,
+                component,
+                self._schedule_render_task,
+                new_id=self._new_id,
             )
             old_state = None
         elif not old_state.is_component_state:
             await self._unmount_model_states([old_state])
             new_state = _make_component_model_state(
-                parent, index, key, component, self._schedule_render_task
+                parent,
+                index,
+                key,
+                component,
+                self._schedule_render_task,
+                new_id=self._new_id,
             )
             old_state = None
         elif parent is None:
@@ -239,13 +425,23 @@ class Layout(BaseLayout):
             )
         else:
             new_state = _update_component_model_state(
-                old_state, parent, index, component, self._schedule_render_task
+                old_state,
+                parent,
+                index,
+                component,
+                self._schedule_render_task,
+                new_id=self._new_id,
             )
 
         life_cycle_state = new_state.life_cycle_state
         life_cycle_hook = life_cycle_state.hook
 
         self._model_states_by_life_cycle_state_id[life_cycle_state.id] = new_state
+        # any render still waiting to start is covered by this one
+        if self._pending_renders:
+            self._pending_renders.pop(life_cycle_state.id, None)
+        if self._dropped_renders:
+            self._dropped_renders.pop(life_cycle_state.id, None)
 
         # If this component is scheduled to render, we can cancel that task since we are
         # rendering it now.
@@ -256,10 +452,24 @@ class Layout(BaseLayout):
                 task.cancel()
                 self._render_tasks.discard(task)
 
+        if self._event_times:
+            event_time = self._event_times.pop(life_cycle_state.id, None)
+            if event_time is not None and render is not None:
+                render.caused_by_event(event_time)
+
         await life_cycle_hook.affect_component_will_render(component)
         exit_stack.push_async_callback(life_cycle_hook.affect_layout_did_render)
+        exit_stack.callback(self._schedule_sync_effects, life_cycle_hook)
         try:
-            raw_model = component.render()
+            start = perf_counter()
+            if component.offload == "thread":
+                raw_model = await _render_in_thread(component)
+            else:
+                raw_model = component.render()
+            if render is not None and render.record_metrics:
+                self.metrics.record_render(
+                    component.type.__name__, perf_counter() - start
+                )
             # wrap the model in a fragment (i.e. tagName="") to ensure components have
             # a separate node in the model state tree. This could be removed if this
             # components are given a node in the tree some other way
@@ -278,6 +488,19 @@ class Layout(BaseLayout):
         finally:
             await life_cycle_hook.affect_component_did_render()
 
+        if render is not None and render.unchecked_models is not None:
+            render.unchecked_models.append(
+                (validate_vdom_json_element, new_state.model.current)
+            )
+
+        if span_start is not None:
+            end_span(
+                "render",
+                component.type.__name__,
+                span_start,
+                {"key": key, "path": new_state.patch_path or "/"},
+            )
+
         return new_state
 
     async def _render_model(
@@ -289,6 +512,10 @@ class Layout(BaseLayout):
         key: Any,
         raw_model: Any,
     ) -> _ModelState:
+        render = _visit_node()
+        if render is not None and render.time_slice_is_used():
+            await render.start_next_time_slice()
+
         if old_state is None:
             new_state = _make_element_model_state(parent, index, key)
         elif old_state.is_component_state:
@@ -298,6 +525,10 @@ class Layout(BaseLayout):
         else:
             new_state = _update_element_model_state(old_state, parent, index)
 
+        if isinstance(raw_model, StaticVdomDict):
+            await self._render_static_model(old_state, new_state, raw_model)
+            return new_state
+
         try:
             new_state.model.current = {"tagName": raw_model["tagName"]}
         except Exception as e:  # nocov
@@ -312,8 +543,39 @@ class Layout(BaseLayout):
         await self._render_model_children(
             exit_stack, old_state, new_state, raw_model.get("children", [])
         )
+        if render is not None and render.unchecked_models is not None:
+            # only elements which render are checked since the rest are unchanged
+            render.unchecked_models.append(
+                (validate_vdom_json_element, new_state.model.current)
+            )
         return new_state
 
+    async def _render_static_model(
+        self,
+        old_state: _ModelState | None,
+        new_state: _ModelState,
+        raw_model: StaticVdomDict,
+    ) -> None:
+        """Reuse the model prepared by :func:`~reactpy.core.vdom.static`
+
+        Static models have no event handlers or components, so no state is needed for
+        anything within them.
+        """
+        if old_state is None or old_state.model.current is not raw_model.model:
+            render = _CURRENT_RENDER.get()
+            if render is not None and render.unchecked_models is not None:
+                render.unchecked_models.append((validate_vdom_json, raw_model.model))
+            if old_state is not None:
+                for target in old_state.targets_by_event.values():
+                    del self._event_handlers[target]
+                await self._unmount_model_states(
+                    list(old_state.children_by_key.values())
+                )
+        key = raw_model.get("attributes", {}).get("key")
+        if key is not None:
+            new_state.key = key
+        new_state.model.current = raw_model.model
+
     def _render_model_attributes(
         self,
         old_state: _ModelState | None,
@@ -349,14 +611,10 @@ class Layout(BaseLayout):
             if event in old_state.targets_by_event:
                 target = old_state.targets_by_event[event]
             else:
-                target = uuid4().hex if handler.target is None else handler.target
+                target = self._new_id() if handler.target is None else handler.target
             new_state.targets_by_event[event] = target
             self._event_handlers[target] = handler
-            model_event_handlers[event] = {
-                "target": target,
-                "preventDefault": handler.prevent_default,
-                "stopPropagation": handler.stop_propagation,
-            }
+            model_event_handlers[event] = _event_handler_model(target, handler)
 
         return None
 
@@ -370,14 +628,10 @@ class Layout(BaseLayout):
 
         model_event_handlers = new_state.model.current["eventHandlers"] = {}
         for event, handler in handlers_by_event.items():
-            target = uuid4().hex if handler.target is None else handler.target
+            target = self._new_id() if handler.target is None else handler.target
             new_state.targets_by_event[event] = target
             self._event_handlers[target] = handler
-            model_event_handlers[event] = {
-                "target": target,
-                "preventDefault": handler.prevent_default,
-                "stopPropagation": handler.stop_propagation,
-            }
+            model_event_handlers[event] = _event_handler_model(target, handler)
 
         return None
 
@@ -437,7 +691,20 @@ class Layout(BaseLayout):
                 else:
                     new_state.append_child(new_child_state)
 
+        render = _CURRENT_RENDER.get()
+        if render is not None and render.component_keys is not None:
+            _record_component_keys(render.component_keys, new_state)
+            if old_state is not None:
+                _record_component_keys(render.component_keys, old_state)
+
     async def _unmount_model_states(self, old_states: list[_ModelState]) -> None:
+        """Unmount the given states and their children
+
+        States are detached from the layout first. Then the effects of all their
+        components are cleaned up concurrently, at most
+        :data:`REACTPY_UNMOUNT_CONCURRENCY` at a time.
+        """
+        hooks: list[LifeCycleHook] = []
         to_unmount = old_states[::-1]  # unmount in reversed order of rendering
         while to_unmount:
             model_state = to_unmount.pop()
@@ -448,43 +715,386 @@ class Layout(BaseLayout):
             if model_state.is_component_state:
                 life_cycle_state = model_state.life_cycle_state
                 del self._model_states_by_life_cycle_state_id[life_cycle_state.id]
-                await life_cycle_state.hook.affect_component_will_unmount()
+                self._event_times.pop(life_cycle_state.id, None)
+                self._dropped_renders.pop(life_cycle_state.id, None)
+                hooks.append(life_cycle_state.hook)
 
             to_unmount.extend(model_state.children_by_key.values())
 
-    def _schedule_render_task(self, lcs_id: _LifeCycleStateId) -> None:
+        await _gather_bounded(
+            [hook.affect_component_will_unmount for hook in hooks],
+            REACTPY_UNMOUNT_CONCURRENCY.current,
+        )
+
+    def _schedule_sync_effects(self, hook: LifeCycleHook) -> None:
+        """Run the synchronous effects of the given hook along with any others added
+        during this iteration of the event loop.
+
+        This avoids creating a task for each effect. Since they are run once the loop
+        regains control, the render's update will usually have been sent by then.
+        """
+        if not hook.has_sync_effects:
+            return None
+        self._hooks_with_sync_effects.append(hook)
+        if self._run_sync_effects_handle is None:
+            self._run_sync_effects_handle = get_running_loop().call_soon(
+                self._run_sync_effects
+            )
+
+    def _run_sync_effects(self) -> None:
+        hooks = self._hooks_with_sync_effects
+        self._hooks_with_sync_effects = []
+        self._run_sync_effects_handle = None
+        for hook in hooks:
+            hook.run_sync_effects()
+
+    def _schedule_render_task(
+        self, lcs_id: _LifeCycleStateId, *, lane: int | None = None
+    ) -> None:
+        if lane is None:
+            lane = RENDER_LANE.get()
+        event_time = _EVENT_TIME.get()
+        if event_time is not None:
+            self._event_times.setdefault(lcs_id, event_time)
         if not REACTPY_ASYNC_RENDERING.current:
-            self._rendering_queue.put(lcs_id)
+            self._rendering_queue.put(lcs_id, lane)
             return None
-        try:
-            model_state = self._model_states_by_life_cycle_state_id[lcs_id]
-        except KeyError:
-            logger.debug(
-                "Did not render component with model state ID "
-                f"{lcs_id!r} - component already unmounted"
+        # Render tasks are started together once all renders scheduled during this
+        # iteration of the event loop are known. See `_start_pending_renders`.
+        if self._start_pending_renders_handle is None:
+            self._start_pending_renders_handle = get_running_loop().call_soon(
+                self._start_pending_renders
             )
-        else:
+        self._pending_renders[lcs_id] = min(
+            lane, self._pending_renders.get(lcs_id, lane)
+        )
+
+    def _start_pending_renders(self) -> None:
+        """Start a render task for each pending component, most urgent lane first and
+        then shallowest first.
+
+        Components with an ancestor that is also pending are dropped since rendering
+        the ancestor will render them as well. The ancestor takes on the lane of its
+        most urgent descendant. Components with an ancestor that is rendering are
+        deferred until it is done. Background renders are deferred until no other
+        renders are in progress. Until then they may be superseded by more urgent
+        renders.
+        """
+        pending = self._pending_renders
+        self._pending_renders = {}
+        self._start_pending_renders_handle = None
+
+        to_render: list[tuple[int, _LifeCycleStateId, _ModelState]] = []
+        for lcs_id, lane in pending.items():
+            try:
+                model_state = self._model_states_by_life_cycle_state_id[lcs_id]
+            except KeyError:
+                logger.debug(
+                    "Did not render component with model state ID "
+                    f"{lcs_id!r} - component already unmounted"
+                )
+                continue
+            ancestor_ids = _get_ancestor_life_cycle_state_ids(model_state)
+            pending_ancestor_ids = [a for a in ancestor_ids if a in pending]
+            if pending_ancestor_ids:
+                logger.debug(
+                    "Did not render component with model state ID "
+                    f"{lcs_id!r} - an ancestor is scheduled to render"
+                )
+                top_ancestor_id = pending_ancestor_ids[-1]
+                pending[top_ancestor_id] = min(lane, pending[top_ancestor_id])
+                # kept in case the render of the ancestor does not reach this one
+                self._dropped_renders[lcs_id] = lane
+                continue
+            if any(a in self._render_tasks_by_id for a in ancestor_ids):
+                logger.debug(
+                    "Deferred render of component with model state ID "
+                    f"{lcs_id!r} - an ancestor is rendering"
+                )
+                # its model may belong to a tree that the ancestor is still building
+                self._pending_renders[lcs_id] = lane
+                continue
+            to_render.append((len(ancestor_ids), lcs_id, model_state))
+
+        # lanes may have been raised above so they are only read once all are known
+        to_render.sort(key=lambda item: (pending[item[1]], item[0]))
+        defer_background = bool(self._render_tasks) or (
+            bool(to_render) and pending[to_render[0][1]] < BACKGROUND_LANE
+        )
+        for _, lcs_id, model_state in to_render:
+            if defer_background and pending[lcs_id] == BACKGROUND_LANE:
+                self._pending_renders[lcs_id] = BACKGROUND_LANE
+                continue
             task = create_task(self._create_layout_update(model_state))
+            task.add_done_callback(self._render_task_done)
             self._render_tasks.add(task)
             self._render_tasks_by_id[lcs_id] = task
-            self._render_tasks_ready.release()
+
+    def _is_rendering_below(self, model_state: _ModelState) -> bool:
+        """Whether a component below the given one has a render in progress
+
+        Such a render must not finish after its subtree is moved into a tree that is
+        still being built, so the subtree is rendered again instead.
+        """
+        lcs_id = model_state.life_cycle_state.id
+        for other_id in self._render_tasks_by_id:
+            other_state = self._model_states_by_life_cycle_state_id.get(other_id)
+            if other_state is not None and lcs_id in (
+                _get_ancestor_life_cycle_state_ids(other_state)
+            ):
+                return True
+        return False
+
+    def _schedule_dropped_renders(self, skipped_state: _ModelState) -> None:
+        """Schedule the dropped renders of components below a memo component whose
+        render was skipped, since the render of their ancestor will not reach them.
+        """
+        skipped_id = skipped_state.life_cycle_state.id
+        for lcs_id, lane in list(self._dropped_renders.items()):
+            model_state = self._model_states_by_life_cycle_state_id[lcs_id]
+            if skipped_id in _get_ancestor_life_cycle_state_ids(model_state):
+                del self._dropped_renders[lcs_id]
+                self._schedule_render_task(lcs_id, lane=lane)
 
     def __repr__(self) -> str:
         return f"{type(self).__name__}({self.root})"
 
 
+_EVENT_TIME: ContextVar[float | None] = ContextVar("event_time", default=None)
+"""When the event currently being handled was delivered (if metrics are recorded)"""
+
+
+class _RenderState:
+    """State shared by everything rendered to produce a single update"""
+
+    __slots__ = (
+        "component_keys",
+        "deadline",
+        "event_time",
+        "nodes_visited",
+        "record_metrics",
+        "unchecked_models",
+    )
+
+    def __init__(self) -> None:
+        self.record_metrics = REACTPY_METRICS.current
+        """Whether to record metrics about this render"""
+
+        self.unchecked_models: list[tuple[Callable[[Any], Any], Any]] | None = (
+            [] if REACTPY_CHECK_VDOM_SPEC.current else None
+        )
+        """Models to validate, and the validator of each, once the render is done
+
+        These are only recorded if the VDOM spec is checked. They are validated after
+        the render so that invalid VDOM raises an error from the layout instead of
+        being reported like an error in the component which rendered it.
+        """
+
+        self.component_keys: dict[int, Any] | None = (
+            {} if REACTPY_DIFF_UPDATES.current else None
+        )
+        """The keys of keyed components by the ``id`` of their old and new models
+
+        These are only recorded if updates are diffed, so that keyed components can be
+        matched up like keyed elements.
+        """
+
+        self.deadline = _next_time_slice_deadline()
+        """When this render should next yield to the event loop (if ever)"""
+
+        self.nodes_visited = 0
+        """The number of elements and components rendered so far"""
+
+        self.event_time: float | None = None
+        """When the earliest event which caused this render was delivered"""
+
+    def caused_by_event(self, event_time: float) -> None:
+        if self.event_time is None or event_time < self.event_time:
+            self.event_time = event_time
+
+    def time_slice_is_used(self) -> bool:
+        return self.deadline is not None and perf_counter() >= self.deadline
+
+    async def start_next_time_slice(self) -> None:
+        """Yield to the event loop before continuing this render"""
+        await sleep(0)
+        self.deadline = _next_time_slice_deadline()
+
+
+_CURRENT_RENDER: ContextVar[_RenderState | None] = ContextVar(
+    "current_render", default=None
+)
+
+
+def _next_time_slice_deadline() -> float | None:
+    time_slice = REACTPY_RENDER_TIME_SLICE.current
+    return perf_counter() + time_slice / 1000 if time_slice > 0 else None
+
+
+def _visit_node() -> _RenderState | None:
+    """Count a node in the current render
+
+    This is synchronous so that nothing is awaited for a node unless the render has
+    used up its time slice.
+    """
+    render = _CURRENT_RENDER.get()
+    if render is None:  # nocov
+        return None
+    render.nodes_visited += 1
+    return render
+
+
+async def _render_in_thread(component: Component) -> Any:
+    """Render the given component in a worker thread
+
+    Threads cannot be stopped, so if this is cancelled it waits for the render to
+    finish before the cancellation continues. Otherwise the hook of the component would
+    be released, and perhaps used by another render, while the thread still uses it.
+    """
+    # the hook stack is carried into the thread with the current context
+    render = create_task(to_thread(component.render))
+    try:
+        return await shield(render)
+    except CancelledError:
+        while not render.done():
+            with suppress(CancelledError):
+                await wait((render,))
+        if not render.cancelled():
+            render.exception()  # the result is discarded along with any error
+        raise
+
+
+async def _gather_bounded(
+    functions: list[Callable[[], Awaitable[None]]], limit: int
+) -> None:
+    """Await the given functions concurrently with at most ``limit`` running at once"""
+    if len(functions) == 1:
+        await functions[0]()
+        return None
+
+    remaining = iter(functions)
+
+    async def worker() -> None:
+        for function in remaining:
+            await function()
+
+    await gather(*(worker() for _ in range(min(max(limit, 1), len(functions)))))
+
+
+def _event_handler_model(target: str, handler: BaseEventHandler) -> JsonEventTarget:
+    model: JsonEventTarget = {
+        "target": target,
+        "preventDefault": handler.prevent_default,
+        "stopPropagation": handler.stop_propagation,
+    }
+    # rate limits are enforced by the client
+    throttle_ms = getattr(handler, "throttle_ms", None)
+    if throttle_ms is not None:
+        model["throttle"] = throttle_ms
+    debounce_ms = getattr(handler, "debounce_ms", None)
+    if debounce_ms is not None:
+        model["debounce"] = debounce_ms
+    # so that the client only sends the parts of events which are needed
+    fields = getattr(handler, "fields", None)
+    if fields is not None:
+        model["fields"] = list(fields)
+    return model
+
+
+def _get_handler_name(function: Callable[..., Any]) -> str:
+    function = getattr(function, "__wrapped__", function)
+    return getattr(function, "__qualname__", repr(function))
+
+
+def _can_skip_memo_render(
+    life_cycle_state: _LifeCycleState, component: MemoComponent
+) -> bool:
+    hook = life_cycle_state.hook
+    return (
+        not hook.render_is_scheduled
+        and component.has_same_props(life_cycle_state.component)
+        and not hook.context_providers_changed()
+    )
+
+
+def _move_model_state(
+    model_state: _ModelState, parent: _ModelState, index: int
+) -> None:
+    """Move an existing model state, and its subtree, to a new position in the layout"""
+    model_state._parent_ref = weakref(parent)
+    model_state.index = index
+    # descendants only have cached paths if this state does too
+    old_patch_path = getattr(model_state, "_patch_path", None)
+    if old_patch_path is not None and old_patch_path != (
+        f"{parent.patch_path}/children/{index}"
+    ):
+        model_state.clear_patch_path()
+
+
+def _record_component_keys(keys: dict[int, Any], model_state: _ModelState) -> None:
+    """Record the keys of the models of the keyed components below the given state"""
+    for child in model_state.children_by_key.values():
+        if (
+            child.is_component_state
+            and child.life_cycle_state.component.key is not None
+        ):
+            keys[id(child.model.current)] = child.key
+
+
+def _get_ancestor_life_cycle_state_ids(
+    model_state: _ModelState,
+) -> list[_LifeCycleStateId]:
+    """Get the IDs of the components above the given state, nearest first"""
+    ancestor_ids: list[_LifeCycleStateId] = []
+    while True:
+        try:
+            model_state = model_state.parent
+        except AttributeError:
+            return ancestor_ids
+        if model_state.is_component_state:
+            ancestor_ids.append(model_state.life_cycle_state.id)
+
+
+def _update_ancestor_models(model_state: _ModelState) -> None:
+    """Replace the stale model of the given state within each of its ancestors' models
+
+    Models are never mutated in place since they may have already been sent. Keeping
+    ancestors up to date ensures their models always reflect what the client has. No
+    ancestor may be part of a tree which another render is still building - see
+    `_start_pending_renders` and `_is_rendering_below`.
+    """
+    child = model_state
+    while True:
+        try:
+            parent = child.parent
+        except AttributeError:
+            return None
+        old_parent_model = parent.model.current
+        old_parent_children = old_parent_model.get("children", [])
+        parent.model.current = {
+            **old_parent_model,
+            "children": [
+                *old_parent_children[: child.index],
+                child.model.current,
+                *old_parent_children[child.index + 1 :],
+            ],
+        }
+        child = parent
+
+
 def _new_root_model_state(
-    component: Component, schedule_render: Callable[[_LifeCycleStateId], None]
+    component: Component,
+    schedule_render: Callable[[_LifeCycleStateId], None],
+    new_id: Callable[[], str],
 ) -> _ModelState:
     return _ModelState(
         parent=None,
         index=-1,
         key=None,
         model=Ref(),
-        patch_path="",
         children_by_key={},
         targets_by_event={},
-        life_cycle_state=_make_life_cycle_state(component, schedule_render),
+        life_cycle_state=_make_life_cycle_state(component, schedule_render, new_id),
     )
 
 
@@ -494,16 +1104,17 @@ def _make_component_model_state(
     key: Any,
     component: Component,
     schedule_render: Callable[[_LifeCycleStateId], None],
+    *,
+    new_id: Callable[[], str],
 ) -> _ModelState:
     return _ModelState(
         parent=parent,
         index=index,
         key=key,
         model=Ref(),
-        patch_path=f"{parent.patch_path}/children/{index}" if parent else "",
         children_by_key={},
         targets_by_event={},
-        life_cycle_state=_make_life_cycle_state(component, schedule_render),
+        life_cycle_state=_make_life_cycle_state(component, schedule_render, new_id),
     )
 
 
@@ -519,7 +1130,6 @@ def _copy_component_model_state(old_model_state: _ModelState) -> _ModelState:
         index=old_model_state.index,
         key=old_model_state.key,
         model=Ref(),  # does not copy the model
-        patch_path=old_model_state.patch_path,
         children_by_key={},
         targets_by_event={},
         life_cycle_state=old_model_state.life_cycle_state,
@@ -532,19 +1142,20 @@ def _update_component_model_state(
     new_index: int,
     new_component: Component,
     schedule_render: Callable[[_LifeCycleStateId], None],
+    *,
+    new_id: Callable[[], str],
 ) -> _ModelState:
     return _ModelState(
         parent=new_parent,
         index=new_index,
         key=old_model_state.key,
         model=Ref(),  # does not copy the model
-        patch_path=f"{new_parent.patch_path}/children/{new_index}",
         children_by_key={},
         targets_by_event={},
         life_cycle_state=(
             _update_life_cycle_state(old_model_state.life_cycle_state, new_component)
             if old_model_state.is_component_state
-            else _make_life_cycle_state(new_component, schedule_render)
+            else _make_life_cycle_state(new_component, schedule_render, new_id)
         ),
     )
 
@@ -559,7 +1170,6 @@ def _make_element_model_state(
         index=index,
         key=key,
         model=Ref(),
-        patch_path=f"{parent.patch_path}/children/{index}",
         children_by_key={},
         targets_by_event={},
     )
@@ -575,7 +1185,6 @@ def _update_element_model_state(
         index=new_index,
         key=old_model_state.key,
         model=Ref(),  # does not copy the model
-        patch_path=old_model_state.patch_path,
         children_by_key={},
         targets_by_event={},
     )
@@ -587,13 +1196,13 @@ class _ModelState:
     __slots__ = (
         "__weakref__",
         "_parent_ref",
+        "_patch_path",
         "_render_semaphore",
         "children_by_key",
         "index",
         "key",
         "life_cycle_state",
         "model",
-        "patch_path",
         "targets_by_event",
     )
 
@@ -603,7 +1212,6 @@ class _ModelState:
         index: int,
         key: Any,
         model: Ref[VdomJson | dict[str, Any]],
-        patch_path: str,
         children_by_key: dict[Key, _ModelState],
         targets_by_event: dict[str, str],
         life_cycle_state: _LifeCycleState | None = None,
@@ -617,9 +1225,6 @@ class _ModelState:
         self.model = model
         """The actual model of the element"""
 
-        self.patch_path = patch_path
-        """A "/" delimited path to the element within the greater layout"""
-
         self.children_by_key = children_by_key
         """Child model states indexed by their unique keys"""
 
@@ -648,6 +1253,35 @@ class _ModelState:
             raise RuntimeError("detached model state")  # nocov
         return parent
 
+    @property
+    def patch_path(self) -> str:
+        """A "/" delimited path to the element within the greater layout
+
+        This is computed on demand and cached since only the paths of components
+        which render are actually needed.
+        """
+        try:
+            return self._patch_path
+        except AttributeError:
+            pass
+        try:
+            parent = self.parent
+        except AttributeError:
+            patch_path = ""
+        else:
+            patch_path = f"{parent.patch_path}/children/{self.index}"
+        self._patch_path = patch_path
+        return patch_path
+
+    def clear_patch_path(self) -> None:
+        """Forget the cached paths of this element and its children after it moves"""
+        to_clear = [self]
+        while to_clear:
+            model_state = to_clear.pop()
+            with suppress(AttributeError):
+                del model_state._patch_path
+            to_clear.extend(model_state.children_by_key.values())
+
     def append_child(self, child: Any) -> None:
         self.model.current.setdefault("children", []).append(child)
 
@@ -658,8 +1292,9 @@ class _ModelState:
 def _make_life_cycle_state(
     component: Component,
     schedule_render: Callable[[_LifeCycleStateId], None],
+    new_id: Callable[[], str],
 ) -> _LifeCycleState:
-    life_cycle_state_id = _LifeCycleStateId(uuid4().hex)
+    life_cycle_state_id = _LifeCycleStateId(new_id())
     return _LifeCycleState(
         life_cycle_state_id,
         LifeCycleHook(lambda: schedule_render(life_cycle_state_id)),
@@ -695,24 +1330,66 @@ class _LifeCycleState(NamedTuple):
     """The current component instance"""
 
 
+class _IdAllocator:
+    """Allocates compact identifiers which are unique within a layout
+
+    Identifiers are a monotonic count encoded in base 36. They are much cheaper to
+    create than random UUIDs and, since they are used as event handler targets, keep
+    the serialized model small.
+    """
+
+    __slots__ = ("_count",)
+
+    def __init__(self) -> None:
+        self._count = count()
+
+    def __call__(self) -> str:
+        return _to_base_36(next(self._count))
+
+
+_BASE_36_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def _to_base_36(number: int) -> str:
+    digits: list[str] = []
+    while True:
+        number, remainder = divmod(number, 36)
+        digits.append(_BASE_36_DIGITS[remainder])
+        if not number:
+            return "".join(reversed(digits))
+
+
 _Type = TypeVar("_Type")
 
 
 class _ThreadSafeQueue(Generic[_Type]):
+    """A queue of unique values which are retrieved in order of priority"""
+
     def __init__(self) -> None:
         self._loop = get_running_loop()
-        self._queue: Queue[_Type] = Queue()
-        self._pending: set[_Type] = set()
+        self._queue: PriorityQueue[tuple[int, int, _Type]] = PriorityQueue()
+        self._pending: dict[_Type, int] = {}
+        self._count = count()
 
-    def put(self, value: _Type) -> None:
-        if value not in self._pending:
-            self._pending.add(value)
-            self._loop.call_soon_threadsafe(self._queue.put_nowait, value)
+    def put(self, value: _Type, priority: int = 0) -> None:
+        if priority < self._pending.get(value, priority + 1):
+            # a value put again with a better priority leaves a stale entry behind
+            self._pending[value] = priority
+            item = (priority, next(self._count), value)
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
 
     async def get(self) -> _Type:
-        value = await self._queue.get()
-        self._pending.remove(value)
-        return value
+        while True:
+            priority, _, value = await self._queue.get()
+            if self._pending.get(value) == priority:
+                del self._pending[value]
+                return value
+
+    def has_any_pending(self, values: Iterable[_Type]) -> bool:
+        return any(value in self._pending for value in values)
+
+    def __len__(self) -> int:
+        return len(self._pending)
 
 
 def _get_children_info(
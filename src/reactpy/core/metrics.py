@@ -0,0 +1,174 @@
+"""Metrics describing the work done by layouts
+
+Metrics are only recorded while :data:`~reactpy.config.REACTPY_METRICS` is enabled.
+Those of a single layout are available from :meth:`~reactpy.core.layout.Layout.stats`
+while those of every layout in the process are available from :func:`process_stats`.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Protocol
+from weakref import WeakSet
+
+from reactpy.types import ComponentRenderStats, LayoutStats
+
+
+class _HasStats(Protocol):
+    def stats(self) -> LayoutStats: ...
+
+
+class LayoutMetrics:
+    """Counters which accumulate over the lifetime of a layout"""
+
+    __slots__ = (
+        "__weakref__",
+        "component_renders",
+        "event_update_seconds",
+        "event_updates",
+        "nodes_visited",
+        "update_bytes",
+        "updates",
+    )
+
+    def __init__(self) -> None:
+        self.component_renders: dict[str, ComponentRenderStats] = {}
+        self.updates = 0
+        self.nodes_visited = 0
+        self.update_bytes = 0
+        self.event_updates = 0
+        self.event_update_seconds = 0.0
+
+    def record_render(self, component_type: str, seconds: float) -> None:
+        """Record the time taken to call the render function of a component"""
+        try:
+            renders = self.component_renders[component_type]
+        except KeyError:
+            self.component_renders[component_type] = {"count": 1, "seconds": seconds}
+        else:
+            renders["count"] += 1
+            renders["seconds"] += seconds
+
+    def record_update(self, nodes_visited: int) -> None:
+        """Record an update along with the number of elements it rendered"""
+        self.updates += 1
+        self.nodes_visited += nodes_visited
+
+    def record_update_bytes(self, size: int) -> None:
+        """Record the serialized size of an update sent to the client"""
+        self.update_bytes += size
+
+    def record_event_update(self, seconds: float) -> None:
+        """Record the time from an event being delivered until its update was made"""
+        self.event_updates += 1
+        self.event_update_seconds += seconds
+
+    def stats(self, pending_renders: int = 0) -> LayoutStats:
+        """A snapshot of these metrics"""
+        return {
+            "component_renders": {
+                name: {"count": renders["count"], "seconds": renders["seconds"]}
+                for name, renders in self.component_renders.items()
+            },
+            "updates": self.updates,
+            "nodes_visited": self.nodes_visited,
+            "update_bytes": self.update_bytes,
+            "event_updates": self.event_updates,
+            "event_update_seconds": self.event_update_seconds,
+            "pending_renders": pending_renders,
+        }
+
+
+_active_layouts: WeakSet[Any] = WeakSet()
+_finished_layouts = LayoutMetrics().stats()
+
+
+def layout_started(layout: _HasStats) -> None:
+    """Include the given layout in :func:`process_stats`"""
+    _active_layouts.add(layout)
+
+
+def layout_finished(layout: _HasStats) -> None:
+    """Keep the totals of a layout which is about to close"""
+    if layout not in _active_layouts:
+        return None
+    _active_layouts.discard(layout)
+    _add_stats(_finished_layouts, {**layout.stats(), "pending_renders": 0})
+
+
+def process_stats() -> LayoutStats:
+    """The combined metrics of every layout in this process
+
+    Totals include layouts which have since closed. The number of pending renders only
+    includes open layouts.
+    """
+    total = LayoutMetrics().stats()
+    _add_stats(total, _finished_layouts)
+    for layout in list(_active_layouts):
+        _add_stats(total, layout.stats())
+    return total
+
+
+def _add_stats(total: LayoutStats, stats: LayoutStats) -> None:
+    for name, renders in stats["component_renders"].items():
+        total_renders = total["component_renders"].setdefault(
+            name, {"count": 0, "seconds": 0.0}
+        )
+        total_renders["count"] += renders["count"]
+        total_renders["seconds"] += renders["seconds"]
+    total["updates"] += stats["updates"]
+    total["nodes_visited"] += stats["nodes_visited"]
+    total["update_bytes"] += stats["update_bytes"]
+    total["event_updates"] += stats["event_updates"]
+    total["event_update_seconds"] += stats["event_update_seconds"]
+    total["pending_renders"] += stats["pending_renders"]
+
+
+def to_prometheus_text(stats: LayoutStats) -> str:
+    """Format metrics in the Prometheus text exposition format"""
+    lines = [
+        "# HELP reactpy_component_renders_total Number of renders by component type",
+        "# TYPE reactpy_component_renders_total counter",
+    ]
+    lines.extend(
+        f'reactpy_component_renders_total{{component="{_escape_label(name)}"}} '
+        f"{renders['count']}"
+        for name, renders in sorted(stats["component_renders"].items())
+    )
+    lines.extend(
+        [
+            "# HELP reactpy_component_render_seconds_total Time spent rendering by "
+            "component type",
+            "# TYPE reactpy_component_render_seconds_total counter",
+        ]
+    )
+    lines.extend(
+        f'reactpy_component_render_seconds_total{{component="{_escape_label(name)}"}} '
+        f"{renders['seconds']!r}"
+        for name, renders in sorted(stats["component_renders"].items())
+    )
+    lines.extend(
+        [
+            "# HELP reactpy_update_nodes_visited Elements and components rendered per "
+            "update",
+            "# TYPE reactpy_update_nodes_visited summary",
+            f"reactpy_update_nodes_visited_sum {stats['nodes_visited']}",
+            f"reactpy_update_nodes_visited_count {stats['updates']}",
+            "# HELP reactpy_update_bytes_total Serialized size of updates sent to "
+            "clients",
+            "# TYPE reactpy_update_bytes_total counter",
+            f"reactpy_update_bytes_total {stats['update_bytes']}",
+            "# HELP reactpy_event_update_seconds Time from delivering an event until "
+            "the update it caused",
+            "# TYPE reactpy_event_update_seconds summary",
+            f"reactpy_event_update_seconds_sum {stats['event_update_seconds']!r}",
+            f"reactpy_event_update_seconds_count {stats['event_updates']}",
+            "# HELP reactpy_pending_renders Renders which are scheduled or in progress",
+            "# TYPE reactpy_pending_renders gauge",
+            f"reactpy_pending_renders {stats['pending_renders']}",
+        ]
+    )
+    return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -1,19 +1,36 @@
 from __future__ import annotations
 
+import json
+from collections import deque
 from collections.abc import Awaitable, Callable
 from logging import getLogger
+from time import perf_counter
 from typing import Any
 
-from anyio import create_task_group
+from anyio import Condition, Semaphore, create_task_group
 from anyio.abc import TaskGroup
 
-from reactpy.config import REACTPY_DEBUG
-from reactpy.types import BaseLayout, LayoutEventMessage, LayoutUpdateMessage
+from reactpy.config import (
+    REACTPY_BATCH_UPDATES,
+    REACTPY_DEBUG,
+    REACTPY_MAX_PENDING_EVENTS,
+    REACTPY_REPEATED_EVENTS,
+    REACTPY_SEND_BUFFER_SIZE,
+)
+from reactpy.core.tracing import end_span, is_tracing
+from reactpy.types import (
+    BaseLayout,
+    LayoutEventMessage,
+    LayoutUpdateBatchMessage,
+    LayoutUpdateMessage,
+)
 
 logger = getLogger(__name__)
 
 
-SendCoroutine = Callable[[LayoutUpdateMessage | dict[str, Any]], Awaitable[None]]
+SendCoroutine = Callable[
+    [LayoutUpdateMessage | LayoutUpdateBatchMessage | dict[str, Any]], Awaitable[None]
+]
 """Send model patches given by a dispatcher"""
 
 RecvCoroutine = Callable[[], Awaitable[LayoutEventMessage | dict[str, Any]]]
@@ -25,47 +42,225 @@ The event will then trigger an :class:`reactpy.core.proto.EventHandlerType` in a
 
 async def serve_layout(
     layout: BaseLayout[
-        LayoutUpdateMessage | dict[str, Any], LayoutEventMessage | dict[str, Any]
+        LayoutUpdateMessage | LayoutUpdateBatchMessage | dict[str, Any],
+        LayoutEventMessage | dict[str, Any],
     ],
     send: SendCoroutine,
     recv: RecvCoroutine,
 ) -> None:
     """Run a dispatch loop for a single view instance"""
     async with layout:
+        buffer = _UpdateBuffer(REACTPY_SEND_BUFFER_SIZE.current)
         async with create_task_group() as task_group:
-            task_group.start_soon(_single_outgoing_loop, layout, send)
+            task_group.start_soon(_single_render_loop, layout, buffer)
+            task_group.start_soon(
+                _single_outgoing_loop, buffer, send, REACTPY_BATCH_UPDATES.current
+            )
             task_group.start_soon(_single_incoming_loop, task_group, layout, recv)
 
 
-async def _single_outgoing_loop(
+async def _single_render_loop(
     layout: BaseLayout[
-        LayoutUpdateMessage | dict[str, Any], LayoutEventMessage | dict[str, Any]
+        LayoutUpdateMessage | LayoutUpdateBatchMessage | dict[str, Any],
+        LayoutEventMessage | dict[str, Any],
     ],
-    send: SendCoroutine,
+    buffer: _UpdateBuffer,
 ) -> None:
     while True:
-        update = await layout.render()
-        try:
-            await send(update)
-        except Exception:  # nocov
-            if not REACTPY_DEBUG.current:
-                msg = (
-                    "Failed to send update. More info may be available "
-                    "if you enabling debug mode by setting "
-                    "`reactpy.config.REACTPY_DEBUG.current = True`."
-                )
-                logger.error(msg)
-            raise
+        await buffer.put(await layout.render())
+
+
+async def _single_outgoing_loop(
+    buffer: _UpdateBuffer, send: SendCoroutine, batch_updates: bool
+) -> None:
+    while True:
+        updates = await buffer.get()
+        # clients only receive batches when they have been enabled
+        if batch_updates and len(updates) > 1:
+            await _send_update(
+                send, {"type": "layout-update-batch", "updates": updates}
+            )
+        else:
+            for update in updates:
+                await _send_update(send, update)
+
+
+async def _send_update(
+    send: SendCoroutine,
+    update: LayoutUpdateMessage | LayoutUpdateBatchMessage | dict[str, Any],
+) -> None:
+    span_start = perf_counter() if is_tracing() else None
+    try:
+        await send(update)
+    except Exception:  # nocov
+        if not REACTPY_DEBUG.current:
+            msg = (
+                "Failed to send update. More info may be available "
+                "if you enabling debug mode by setting "
+                "`reactpy.config.REACTPY_DEBUG.current = True`."
+            )
+            logger.error(msg)
+        raise
+    if span_start is not None:
+        end_span("send", update["type"], span_start, {"path": update.get("path")})
+
+
+class _UpdateBuffer:
+    """Updates which are waiting to be sent, so that slow clients get fewer of them
+
+    An update is dropped before it is sent if a newer update replaces the model at its
+    path, or at an ancestor of its path. Once :data:`REACTPY_SEND_BUFFER_SIZE` bytes
+    are buffered, adding updates waits until they are sent.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._updates: list[tuple[LayoutUpdateMessage | dict[str, Any], int]] = []
+        self._size = 0
+        self._condition = Condition()
+
+    async def put(
+        self, update: LayoutUpdateMessage | LayoutUpdateBatchMessage | dict[str, Any]
+    ) -> None:
+        async with self._condition:
+            if update.get("type") == "layout-update-batch":
+                for batched_update in update["updates"]:
+                    self._add(batched_update)
+            else:
+                self._add(update)
+            self._condition.notify_all()
+            while self._max_size > 0 and self._size > self._max_size:
+                await self._condition.wait()
+
+    async def get(self) -> list[LayoutUpdateMessage | dict[str, Any]]:
+        """Wait for updates and take all of them in the order they were added"""
+        async with self._condition:
+            while not self._updates:
+                await self._condition.wait()
+            updates = [update for update, _ in self._updates]
+            self._updates = []
+            self._size = 0
+            self._condition.notify_all()
+            return updates
+
+    def _add(self, update: LayoutUpdateMessage | dict[str, Any]) -> None:
+        path = update.get("path")
+        if path is not None and "model" in update:
+            self._drop_replaced_updates(path)
+        # measuring is only worthwhile when there is a limit to enforce
+        size = len(json.dumps(update, default=repr)) if self._max_size > 0 else 0
+        self._updates.append((update, size))
+        self._size += size
+
+    def _drop_replaced_updates(self, path: str) -> None:
+        """Drop updates within the given path since a new model will replace it"""
+        kept: list[tuple[LayoutUpdateMessage | dict[str, Any], int]] = []
+        can_drop = True
+        for update, size in reversed(self._updates):
+            update_path = update.get("path")
+            if update_path is None:
+                kept.append((update, size))
+                continue
+            if can_drop and _is_within_path(update_path, path):
+                self._size -= size
+                continue
+            if "changes" in update and _is_within_path(path, update_path):
+                # changes to an ancestor may depend on the updates made before them
+                can_drop = False
+            kept.append((update, size))
+        kept.reverse()
+        self._updates = kept
+
+
+def _is_within_path(path: str, ancestor_path: str) -> bool:
+    return path == ancestor_path or path.startswith(f"{ancestor_path}/")
 
 
 async def _single_incoming_loop(
     task_group: TaskGroup,
     layout: BaseLayout[
-        LayoutUpdateMessage | dict[str, Any], LayoutEventMessage | dict[str, Any]
+        LayoutUpdateMessage | LayoutUpdateBatchMessage | dict[str, Any],
+        LayoutEventMessage | dict[str, Any],
     ],
     recv: RecvCoroutine,
 ) -> None:
+    dispatcher = _EventDispatcher(task_group, layout)
     while True:
-        # We need to fire and forget here so that we avoid waiting on the completion
-        # of this event handler before receiving and running the next one.
-        task_group.start_soon(layout.deliver, await recv())
+        await dispatcher.dispatch(await recv())
+
+
+class _EventDispatcher:
+    """Deliver events to a layout without waiting for their handlers to complete
+
+    Events for the same target are delivered one at a time in the order they were
+    received, subject to :data:`REACTPY_REPEATED_EVENTS`. Dispatching waits while
+    :data:`REACTPY_MAX_PENDING_EVENTS` events are queued or being delivered.
+    """
+
+    def __init__(
+        self,
+        task_group: TaskGroup,
+        layout: BaseLayout[
+            LayoutUpdateMessage | LayoutUpdateBatchMessage | dict[str, Any],
+            LayoutEventMessage | dict[str, Any],
+        ],
+    ) -> None:
+        self._task_group = task_group
+        self._layout = layout
+        self._policy = REACTPY_REPEATED_EVENTS.current
+        max_pending = REACTPY_MAX_PENDING_EVENTS.current
+        self._slots = Semaphore(max_pending) if max_pending > 0 else None
+        self._queued_by_target: dict[
+            Any, deque[LayoutEventMessage | dict[str, Any]]
+        ] = {}
+
+    async def dispatch(self, event: LayoutEventMessage | dict[str, Any]) -> None:
+        target = event.get("target")
+        if self._absorb(target, event):
+            return None
+        if self._slots is not None:
+            await self._slots.acquire()
+            # another event for the target may have been delivered in the meantime
+            if self._absorb(target, event):
+                self._slots.release()
+                return None
+        queued = self._queued_by_target.get(target)
+        if queued is None:
+            self._queued_by_target[target] = deque()
+            self._task_group.start_soon(self._deliver_in_order, target, event)
+        else:
+            queued.append(event)
+
+    def _absorb(self, target: Any, event: LayoutEventMessage | dict[str, Any]) -> bool:
+        """Try to handle an event for a busy target without queueing it"""
+        queued = self._queued_by_target.get(target)
+        if queued is None or self._policy == "queue":
+            return False
+        if self._policy == "drop":
+            return True
+        # coalesce - the latest event replaces one which is already queued
+        if queued:
+            queued[-1] = event
+            return True
+        return False
+
+    async def _deliver_in_order(
+        self, target: Any, event: LayoutEventMessage | dict[str, Any]
+    ) -> None:
+        queued = self._queued_by_target[target]
+        try:
+            while True:
+                try:
+                    await self._layout.deliver(event)
+                finally:
+                    if self._slots is not None:
+                        self._slots.release()
+                if not queued:
+                    return None
+                event = queued.popleft()
+        finally:
+            del self._queued_by_target[target]
+            # queued events hold their slots until they are delivered
+            if self._slots is not None:
+                for _ in queued:
+                    self._slots.release()
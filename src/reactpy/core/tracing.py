@@ -0,0 +1,125 @@
+"""Spans describing the time spent rendering, handling events, and sending updates
+
+A tracer is any callable accepting a :class:`Span`. Once set with :func:`set_tracer`, it
+is called as each span ends. For example, to record a session for viewing in a
+flame graph (e.g. with ``chrome://tracing`` or https://ui.perfetto.dev):
+
+.. code-block::
+
+    from reactpy.core.tracing import ChromeTraceSink, set_tracer
+
+    sink = ChromeTraceSink("trace.json")
+    set_tracer(sink)
+    ...
+    set_tracer(None)
+    sink.close()
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from asyncio import current_task
+from logging import getLogger
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Literal, NamedTuple, Protocol
+
+logger = getLogger(__name__)
+
+SpanCategory = Literal["render", "deliver", "send"]
+
+
+class Span(NamedTuple):
+    """A unit of work done by a layout or the loop which serves it"""
+
+    category: SpanCategory
+    """The kind of work which was done"""
+
+    name: str
+    """What the work was done for (e.g. the name of the component that rendered)"""
+
+    start: float
+    """When the work started, as given by :func:`time.perf_counter`"""
+
+    duration: float
+    """The time in seconds the work took"""
+
+    attributes: dict[str, Any]
+    """Further details about the work (e.g. the path to the element that rendered)"""
+
+
+class Tracer(Protocol):
+    def __call__(self, span: Span) -> None: ...
+
+
+_tracer: Tracer | None = None
+
+
+def set_tracer(tracer: Tracer | None) -> None:
+    """Set the tracer which is called as each span ends (or ``None`` to stop tracing)"""
+    global _tracer  # noqa: PLW0603
+    _tracer = tracer
+
+
+def is_tracing() -> bool:
+    """Whether a tracer is set"""
+    return _tracer is not None
+
+
+def end_span(
+    category: SpanCategory, name: str, start: float, attributes: dict[str, Any]
+) -> None:
+    """Pass a span which started at the given time, and ends now, to the tracer"""
+    tracer = _tracer
+    if tracer is None:
+        return None
+    span = Span(category, name, start, perf_counter() - start, attributes)
+    try:
+        tracer(span)
+    except Exception:
+        logger.exception(f"Tracer {tracer} failed to record {span}")
+
+
+class ChromeTraceSink:
+    """A tracer which writes spans to a file as Chrome trace events
+
+    The file uses the JSON array format, which does not require the array to be
+    closed, so it may be viewed even if the process ends before :meth:`close` is
+    called. Spans from each asyncio task are shown on a separate row.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._lock = threading.Lock()
+        self._file = Path(path).open("w", encoding="utf-8")
+        self._file.write("[")
+        self._separator = "\n"
+        self._pid = os.getpid()
+
+    def __call__(self, span: Span) -> None:
+        try:
+            task = current_task()
+        except RuntimeError:  # nocov
+            task = None
+        event = {
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": span.start * 1_000_000,
+            "dur": span.duration * 1_000_000,
+            "pid": self._pid,
+            "tid": id(task) if task is not None else threading.get_ident(),
+            "args": span.attributes,
+        }
+        line = json.dumps(event, default=repr)
+        with self._lock:
+            self._file.write(f"{self._separator}{line}")
+            self._separator = ",\n"
+
+    def close(self) -> None:
+        """Flush the remaining spans and close the file"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.write("\n]\n")
+                self._file.close()
@@ -4,8 +4,11 @@ from __future__ import annotations
 import json
 import re
 from collections.abc import Callable, Mapping, Sequence
+from copy import deepcopy
+from types import MappingProxyType
 from typing import (
     Any,
+    NoReturn,
     cast,
     overload,
 )
@@ -72,6 +75,9 @@ VDOM_JSON_SCHEMA = {
                 "target": {"type": "string"},
                 "preventDefault": {"type": "boolean"},
                 "stopPropagation": {"type": "boolean"},
+                "throttle": {"type": "number"},
+                "debounce": {"type": "number"},
+                "fields": {"type": "array", "items": {"type": "string"}},
             },
             "required": ["target"],
         },
@@ -115,11 +121,121 @@ def validate_vdom_json(value: Any) -> VdomJson:
     return cast(VdomJson, value)
 
 
+_COMPILED_VDOM_ELEMENT_VALIDATOR: Callable = compile_json_schema(  # type: ignore
+    {
+        **VDOM_JSON_SCHEMA,
+        "definitions": {
+            **VDOM_JSON_SCHEMA["definitions"],  # type: ignore
+            "elementChildren": {
+                "type": "array",
+                "items": {"type": ["object", "string"]},
+            },
+        },
+    }
+)
+
+
+def validate_vdom_json_element(value: Any) -> VdomJson:
+    """Validate a single element of serialized VDOM without validating its children
+
+    This allows a layout to only validate the elements which changed in a render.
+    """
+    _COMPILED_VDOM_ELEMENT_VALIDATOR(value)
+    return cast(VdomJson, value)
+
+
 def is_vdom(value: Any) -> bool:
     """Return whether a value is a :class:`VdomDict`"""
     return isinstance(value, VdomDict)
 
 
+def static(element: VdomDict) -> StaticVdomDict:
+    """Mark an element, and everything within it, as never changing
+
+    The element's model is prepared once, here, and then reused by the layout each time
+    the element is rendered. To benefit, static elements should be created once (e.g.
+    at the module level) rather than within a component's render function.
+
+    Static elements cannot contain components or event handlers.
+    """
+    return StaticVdomDict(element)
+
+
+class StaticVdomDict(VdomDict):
+    """An immutable :class:`VdomDict` whose model is prepared in advance
+
+    Its attributes and other fields are frozen, and elements among its children are
+    made static as well.
+    """
+
+    def __init__(self, element: Mapping[str, Any]) -> None:
+        if element.get("children"):
+            # children are made static first so that their models are reused
+            element = {
+                **element,
+                "children": tuple(
+                    StaticVdomDict(child)
+                    if isinstance(child, Mapping)
+                    and not isinstance(child, StaticVdomDict)
+                    else child
+                    for child in element["children"]
+                ),
+            }
+        self.model = _make_static_model(element)
+        """The model of this element as the layout would have rendered it"""
+        super().__init__(**{k: _freeze(v) for k, v in element.items()})  # type: ignore
+
+    def _cannot_change(self, *args: Any, **kwargs: Any) -> NoReturn:
+        msg = "Static elements cannot be changed"
+        raise TypeError(msg)
+
+    __setitem__ = __delitem__ = __ior__ = _cannot_change
+    clear = pop = popitem = setdefault = update = _cannot_change
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, StaticVdomDict):
+        return value
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _make_static_model(element: Mapping[str, Any]) -> VdomJson:
+    if isinstance(element, StaticVdomDict):
+        return element.model
+    if element.get("eventHandlers"):
+        msg = f"Static elements cannot have event handlers, but {element} does"
+        raise ValueError(msg)
+
+    # copied so that later changes to the given element do not change the model
+    model: dict[str, Any] = {"tagName": element["tagName"]}
+    if "importSource" in element:
+        model["importSource"] = deepcopy(element["importSource"])
+    if "attributes" in element:
+        model["attributes"] = deepcopy(dict(element["attributes"]))
+    if "inlineJavaScript" in element:
+        model["inlineJavaScript"] = deepcopy(dict(element["inlineJavaScript"]))
+
+    children: list[Any] = []
+    for child in element.get("children", ()):
+        if child is None:
+            continue
+        elif isinstance(child, Mapping):
+            children.append(_make_static_model(child))
+        elif isinstance(child, Component):
+            msg = f"Static elements cannot contain components, but {element} does"
+            raise ValueError(msg)
+        else:
+            children.append(f"{child}")
+    if children:
+        model["children"] = children
+
+    return cast(VdomJson, model)
+
+
 class Vdom:
     """Class-based constructor for VDOM dictionaries.
     Once initialized, the `__call__` method on this class is used as the user API
@@ -5,19 +5,23 @@ import logging
 import re
 import traceback
 import urllib.parse
+import zlib
 from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Unpack
 
+import msgpack
 import orjson
 from asgi_tools import ResponseText, ResponseWebSocket
 from asgiref.compatibility import guarantee_single_callable
 from servestatic import ServeStaticASGI
 
 from reactpy import config
+from reactpy.core._compact import CompactModelEncoder
 from reactpy.core.hooks import ConnectionContext
 from reactpy.core.layout import Layout
+from reactpy.core.metrics import process_stats, to_prometheus_text
 from reactpy.core.serve import serve_layout
 from reactpy.executors.asgi.types import (
     AsgiApp,
@@ -40,6 +44,32 @@ from reactpy.types import Connection, Location, ReactPyConfig, RootComponentCons
 
 _logger = logging.getLogger(__name__)
 
+MSGPACK_SUBPROTOCOL = "reactpy.msgpack"
+"""Websocket subprotocol where messages are MessagePack encoded binary frames"""
+JSON_SUBPROTOCOL = "reactpy.json"
+"""Websocket subprotocol where messages are JSON encoded text frames"""
+COMPACT_SUFFIX = "+compact"
+"""Suffix of subprotocols where models are sent in a compact form"""
+DEFLATE_SUFFIX = "+deflate"
+"""Suffix of subprotocols where messages from the server are compressed"""
+
+# Content which layout updates often contain, in order of increasing frequency, so that
+# even the first update may be compressed by referring back to it. This must match the
+# dictionary used by the client, which is checked by the tests.
+COMPRESSION_DICTIONARY = (
+    b'"importSource":{"source":"","sourceType":"URL","fallback":null,'
+    b'"unmountBeforeUpdate":false},"error":"","throttle":"debounce":"fields":['
+    b'"tagName":"img","tagName":"input","tagName":"a","tagName":"li",'
+    b'"tagName":"p","tagName":"td","tagName":"tr","tagName":"button",'
+    b'"tagName":"span","tagName":"div","tagName":"",'
+    b'{"type":"layout-update-batch","updates":[{"type":"layout-update","path":"",'
+    b'"changes":[{"op":"move","from":"{"op":"remove","path":"'
+    b'{"op":"add","path":"{"op":"replace","path":"/attributes/","value":'
+    b'"model":{"key":"attributes":{"style":{"className":"id":"value":'
+    b'"eventHandlers":{"onClick":{"target":"","preventDefault":false,'
+    b'"stopPropagation":false}},"children":[{"tagName":"'
+)
+
 
 class ReactPyMiddleware:
     root_component: RootComponentConstructor | None = None
@@ -81,6 +111,8 @@ class ReactPyMiddleware:
         self.dispatcher_path = self.path_prefix
         self.web_modules_path = f"{self.path_prefix}modules/"
         self.static_path = f"{self.path_prefix}static/"
+        self.metrics_path = f"{self.path_prefix}metrics"
+        self.multiplex_path = f"{self.path_prefix}multiplex"
         self.dispatcher_pattern = re.compile(
             f"^{self.dispatcher_path}(?P<dotted_path>[a-zA-Z0-9_.]+)/$"
         )
@@ -100,8 +132,10 @@ class ReactPyMiddleware:
 
         # Initialize the sub-applications
         self.component_dispatch_app = ComponentDispatchApp(parent=self)
+        self.multiplex_dispatch_app = MultiplexDispatchApp(parent=self)
         self.static_file_app = StaticFileApp(parent=self)
         self.web_modules_app = WebModuleApp(parent=self)
+        self.metrics_app = MetricsApp()
 
     async def __call__(
         self, scope: AsgiScope, receive: AsgiReceive, send: AsgiSend
@@ -112,6 +146,10 @@ class ReactPyMiddleware:
         if scope["type"] == "websocket" and self.match_dispatch_path(scope):
             return await self.component_dispatch_app(scope, receive, send)
 
+        # URL routing for several ReactPy renderers sharing one websocket
+        if scope["type"] == "websocket" and self.match_multiplex_path(scope):
+            return await self.multiplex_dispatch_app(scope, receive, send)
+
         # URL routing for ReactPy static files
         if scope["type"] == "http" and self.match_static_path(scope):
             return await self.static_file_app(scope, receive, send)
@@ -120,6 +158,10 @@ class ReactPyMiddleware:
         if scope["type"] == "http" and self.match_web_modules_path(scope):
             return await self.web_modules_app(scope, receive, send)
 
+        # URL routing for ReactPy metrics
+        if scope["type"] == "http" and self.match_metrics_path(scope):
+            return await self.metrics_app(scope, receive, send)
+
         # URL routing for user-defined routes
         matched_app = self.match_extra_paths(scope)
         if matched_app:
@@ -131,12 +173,18 @@ class ReactPyMiddleware:
     def match_dispatch_path(self, scope: AsgiWebsocketScope) -> bool:
         return bool(re.match(self.dispatcher_pattern, scope["path"]))
 
+    def match_multiplex_path(self, scope: AsgiWebsocketScope) -> bool:
+        return self.multiple_root_components and scope["path"] == self.multiplex_path
+
     def match_static_path(self, scope: AsgiHttpScope) -> bool:
         return scope["path"].startswith(self.static_path)
 
     def match_web_modules_path(self, scope: AsgiHttpScope) -> bool:
         return scope["path"].startswith(self.web_modules_path)
 
+    def match_metrics_path(self, scope: AsgiHttpScope) -> bool:
+        return config.REACTPY_METRICS.current and scope["path"] == self.metrics_path
+
     def match_extra_paths(self, scope: AsgiScope) -> AsgiApp | None:
         # Custom defined routes are unused by default to encourage users to handle
         # routing within their ASGI framework of choice.
@@ -155,25 +203,42 @@ class ComponentDispatchApp:
     ) -> None:
         """ASGI app for rendering ReactPy Python components."""
         # Start a loop that handles ASGI websocket events
-        async with ReactPyWebsocket(scope, receive, send, parent=self.parent) as ws:
+        async with self.create_websocket(scope, receive, send) as ws:
             while True:
                 # Wait for the webserver to notify us of a new event
                 event: dict[str, Any] = await ws.receive(raw=True)  # type: ignore
 
                 # If the event is a `receive` event, parse the message and send it to the rendering queue
                 if event["type"] == "websocket.receive":
-                    msg: dict[str, str] = orjson.loads(event["text"])
-                    if msg.get("type") == "layout-event":
-                        await ws.rendering_queue.put(msg)
-                    else:  # nocov
-                        await asyncio.to_thread(
-                            _logger.warning, f"Unknown message type: {msg.get('type')}"
-                        )
+                    message = ws.decode_message(event)
+                    if message is not None:
+                        await ws.handle_message(message)
 
                 # If the event is a `disconnect` event, break the rendering loop and close the connection
                 elif event["type"] == "websocket.disconnect":
                     break
 
+    def create_websocket(
+        self,
+        scope: AsgiWebsocketScope,
+        receive: AsgiWebsocketReceive,
+        send: AsgiWebsocketSend,
+    ) -> ReactPyWebsocket:
+        return ReactPyWebsocket(scope, receive, send, parent=self.parent)
+
+
+@dataclass
+class MultiplexDispatchApp(ComponentDispatchApp):
+    """ASGI app for rendering several ReactPy Python components over one websocket."""
+
+    def create_websocket(
+        self,
+        scope: AsgiWebsocketScope,
+        receive: AsgiWebsocketReceive,
+        send: AsgiWebsocketSend,
+    ) -> ReactPyWebsocket:
+        return MultiplexedReactPyWebsocket(scope, receive, send, parent=self.parent)
+
 
 class ReactPyWebsocket(ResponseWebSocket):
     def __init__(
@@ -186,12 +251,45 @@ class ReactPyWebsocket(ResponseWebSocket):
         super().__init__(scope=scope, receive=receive, send=send)  # type: ignore
         self.scope = scope
         self.parent = parent
-        self.rendering_queue: asyncio.Queue[dict[str, str]] = asyncio.Queue()
+        self.rendering_queue = _new_rendering_queue()
         self.dispatcher: asyncio.Task[Any] | None = None
+        self.layout: Layout | None = None
+        self.send_lock = asyncio.Lock()
+
+        # Clients which predate subprotocols offer none, and so are sent JSON
+        subprotocols = scope.get("subprotocols", [])
+        suffixes = [""]
+        if config.REACTPY_COMPRESSION.current:
+            suffixes = [DEFLATE_SUFFIX, *suffixes]
+        if config.REACTPY_COMPACT_MODELS.current:
+            suffixes = [f"{COMPACT_SUFFIX}{s}" for s in suffixes] + suffixes
+        formats = [JSON_SUBPROTOCOL]
+        if config.REACTPY_MSGPACK.current:
+            formats = [MSGPACK_SUBPROTOCOL, *formats]
+        self.subprotocol: str | None = next(
+            (
+                protocol
+                for suffix in suffixes
+                for protocol in (f"{f}{suffix}" for f in formats)
+                if protocol in subprotocols
+            ),
+            None,
+        )
+        self.encoder = (
+            CompactModelEncoder()
+            if self.subprotocol and COMPACT_SUFFIX in self.subprotocol
+            else None
+        )
+        self.compressor = (
+            zlib.compressobj(wbits=-zlib.MAX_WBITS, zdict=COMPRESSION_DICTIONARY)
+            if self.subprotocol and self.subprotocol.endswith(DEFLATE_SUFFIX)
+            else None
+        )
 
     async def __aenter__(self) -> ReactPyWebsocket:
         self.dispatcher = asyncio.create_task(self.run_dispatcher())
-        return await super().__aenter__()  # type: ignore
+        await self.accept(subprotocol=self.subprotocol)
+        return self
 
     async def __aexit__(self, *_: Any) -> None:
         if self.dispatcher:
@@ -206,33 +304,18 @@ class ReactPyWebsocket(ResponseWebSocket):
                 url_match = re.match(self.parent.dispatcher_pattern, self.scope["path"])
                 if not url_match:  # nocov
                     raise RuntimeError("Could not find component in URL path.")
-                dotted_path = url_match["dotted_path"]
-                if dotted_path not in self.parent.root_components:
-                    raise RuntimeError(
-                        f"Attempting to use an unregistered root component {dotted_path}."
-                    )
-                component = self.parent.root_components[dotted_path]
+                component = self.find_root_component(url_match["dotted_path"])
             elif self.parent.root_component:
                 component = self.parent.root_component
             else:  # nocov
                 raise RuntimeError("No root component provided.")
 
-            # Create a connection object by analyzing the websocket's query string.
-            ws_query_string = urllib.parse.parse_qs(
-                self.scope["query_string"].decode(), strict_parsing=True
-            )
-            connection = Connection(
-                scope=self.scope,  # type: ignore
-                location=Location(
-                    path=ws_query_string.get("http_pathname", [""])[0],
-                    query_string=ws_query_string.get("http_query_string", [""])[0],
-                ),
-                carrier=self,
-            )
-
             # Start the ReactPy component rendering loop
+            self.layout = Layout(
+                ConnectionContext(component(), value=self.create_connection())
+            )
             await serve_layout(
-                Layout(ConnectionContext(component(), value=connection)),
+                self.layout,
                 self.send_json,
                 self.rendering_queue.get,
             )
@@ -241,11 +324,238 @@ class ReactPyWebsocket(ResponseWebSocket):
         except Exception as error:
             await asyncio.to_thread(_logger.error, f"{error}\n{traceback.format_exc()}")
 
+    def find_root_component(self, dotted_path: str) -> RootComponentConstructor:
+        if dotted_path not in self.parent.root_components:
+            raise RuntimeError(
+                f"Attempting to use an unregistered root component {dotted_path}."
+            )
+        return self.parent.root_components[dotted_path]
+
+    def create_connection(self) -> Connection[Any]:
+        """Create a connection object by analyzing the websocket's query string."""
+        ws_query_string = urllib.parse.parse_qs(
+            self.scope["query_string"].decode(), strict_parsing=True
+        )
+        return Connection(
+            scope=self.scope,  # type: ignore
+            location=Location(
+                path=ws_query_string.get("http_pathname", [""])[0],
+                query_string=ws_query_string.get("http_query_string", [""])[0],
+            ),
+            carrier=self,
+        )
+
+    async def handle_message(self, msg: dict[str, Any]) -> None:
+        if not await _queue_layout_events(msg, self.rendering_queue):  # nocov
+            await asyncio.to_thread(
+                _logger.warning, f"Unknown message type: {msg.get('type')}"
+            )
+
     async def send_json(self, data: Any) -> None:
-        return await self._send(
-            {"type": "websocket.send", "text": orjson.dumps(data).decode()}
+        size = await self.send_message(data)
+        if self.layout is not None and config.REACTPY_METRICS.current:
+            self.layout.metrics.record_update_bytes(size)
+
+    async def send_message(self, data: Any) -> int:
+        """Send a message encoded as required by the negotiated subprotocol
+
+        Returns the number of bytes sent. Messages are encoded and sent one at a time
+        since the encoding of each may depend on those before it.
+        """
+        async with self.send_lock:
+            if self.encoder is not None:
+                data = self.encoder.encode_message(data)
+            is_msgpack = (self.subprotocol or "").startswith(MSGPACK_SUBPROTOCOL)
+            if is_msgpack:
+                message: bytes = msgpack.packb(data)
+            else:
+                message = orjson.dumps(data)
+            if self.compressor is not None:
+                # flushing ends the message on a byte boundary without ending the stream
+                message = self.compressor.compress(message)
+                message += self.compressor.flush(zlib.Z_SYNC_FLUSH)
+            if self.compressor is not None or is_msgpack:
+                frame = {"type": "websocket.send", "bytes": message}
+            else:
+                frame = {"type": "websocket.send", "text": message.decode()}
+            await self._send(frame)
+        return len(message)
+
+    def decode_message(self, event: dict[str, Any]) -> Any:
+        """Decode a message from either a binary or a text frame
+
+        Binary frames are only expected if MessagePack was negotiated. Others are
+        ignored, in which case this returns ``None``.
+        """
+        if event.get("bytes") is not None:
+            if not (self.subprotocol or "").startswith(MSGPACK_SUBPROTOCOL):
+                _logger.warning(
+                    "Ignored a binary frame since MessagePack was not negotiated"
+                )
+                return None
+            return msgpack.unpackb(event["bytes"])
+        return orjson.loads(event["text"])
+
+
+class MultiplexedReactPyWebsocket(ReactPyWebsocket):
+    """A websocket over which the client mounts several root components
+
+    Each is mounted by a ``layout-mount`` message with a ``mountId`` chosen by the
+    client and the ``componentPath`` of the component. Events from the client, and
+    updates from the server, are tagged with the ``mountId`` they are for. Mounts which
+    reuse the id of a mounted component, or exceed :data:`REACTPY_MAX_MOUNTS`, are
+    ignored. Mounts which are invalid or fail are answered with a
+    ``layout-mount-error`` message and no longer count as mounted.
+
+    Messages for every mount are received by one loop, so it never waits for a mount
+    to take its events. Events beyond :data:`REACTPY_MAX_PENDING_EVENTS` waiting for
+    one mount are dropped instead.
+    """
+
+    def __init__(
+        self,
+        scope: AsgiWebsocketScope,
+        receive: AsgiWebsocketReceive,
+        send: AsgiWebsocketSend,
+        parent: ReactPyMiddleware,
+    ) -> None:
+        super().__init__(scope, receive, send, parent)
+        self.mounts: dict[str, _Mount] = {}
+
+    async def __aenter__(self) -> ReactPyWebsocket:
+        # components are rendered once they are mounted
+        await self.accept(subprotocol=self.subprotocol)
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        for mount in self.mounts.values():
+            mount.dispatcher.cancel()
+        await super().__aexit__()
+
+    async def handle_message(self, msg: dict[str, Any]) -> None:
+        mount_id = msg.get("mountId")
+        if msg.get("type") == "layout-mount":
+            component_path = msg.get("componentPath")
+            if not isinstance(component_path, str):
+                await self.send_mount_error(mount_id, "No componentPath was given")
+                return None
+            if mount_id in self.mounts:
+                await asyncio.to_thread(
+                    _logger.warning, f"Ignored mount - {mount_id!r} is already mounted"
+                )
+                return None
+            max_mounts = config.REACTPY_MAX_MOUNTS.current
+            if max_mounts > 0 and len(self.mounts) >= max_mounts:
+                await asyncio.to_thread(
+                    _logger.warning,
+                    f"Ignored mount - at most {max_mounts} components may be mounted",
+                )
+                return None
+            queue = _new_mount_rendering_queue()
+            self.mounts[mount_id] = _Mount(
+                queue,
+                asyncio.create_task(
+                    self.run_mount(mount_id, component_path.strip("/"), queue)
+                ),
+            )
+        elif msg.get("type") == "layout-unmount":
+            self.unmount(mount_id)
+        elif mount_id in self.mounts:
+            queue = self.mounts[mount_id].rendering_queue
+            for event in _get_layout_events(msg) or ():
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    await asyncio.to_thread(
+                        _logger.warning,
+                        f"Dropped event - {mount_id!r} has too many pending events",
+                    )
+        else:  # nocov
+            await asyncio.to_thread(
+                _logger.warning, f"Message for unknown mount: {msg.get('type')}"
+            )
+
+    def unmount(self, mount_id: str | None) -> None:
+        mount = self.mounts.pop(mount_id, None)  # type: ignore
+        if mount is not None:
+            mount.dispatcher.cancel()
+
+    async def send_mount_error(self, mount_id: str | None, error: str) -> None:
+        await asyncio.to_thread(
+            _logger.warning, f"Failed to mount {mount_id!r} - {error}"
+        )
+        await self.send_message(
+            {"type": "layout-mount-error", "mountId": mount_id, "error": error}
         )
 
+    async def run_mount(
+        self,
+        mount_id: str,
+        dotted_path: str,
+        rendering_queue: asyncio.Queue[dict[str, Any]],
+    ) -> None:
+        """Async background task that renders one of the mounted components."""
+        try:
+            component = self.find_root_component(dotted_path)
+            layout = Layout(
+                ConnectionContext(component(), value=self.create_connection())
+            )
+
+            async def send(data: dict[str, Any]) -> None:
+                size = await self.send_message({**data, "mountId": mount_id})
+                if config.REACTPY_METRICS.current:
+                    layout.metrics.record_update_bytes(size)
+
+            await serve_layout(layout, send, rendering_queue.get)
+
+        # Manually log exceptions since this function is running in a separate asyncio task.
+        except Exception as error:
+            await asyncio.to_thread(_logger.error, f"{error}\n{traceback.format_exc()}")
+            # the failed mount no longer counts towards REACTPY_MAX_MOUNTS
+            mount = self.mounts.get(mount_id)
+            if mount is not None and mount.dispatcher is asyncio.current_task():
+                del self.mounts[mount_id]
+            await self.send_mount_error(mount_id, f"Failed to render {dotted_path!r}")
+
+
+@dataclass
+class _Mount:
+    rendering_queue: asyncio.Queue[dict[str, Any]]
+    dispatcher: asyncio.Task[None]
+
+
+def _new_rendering_queue() -> asyncio.Queue[dict[str, Any]]:
+    # Events are passed on one at a time so that REACTPY_MAX_PENDING_EVENTS and
+    # REACTPY_REPEATED_EVENTS apply to them before more are received from the client.
+    return asyncio.Queue(maxsize=1)
+
+
+def _new_mount_rendering_queue() -> asyncio.Queue[dict[str, Any]]:
+    # Mounts share the loop which receives from the client, so events are not passed
+    # on one at a time. Instead a mount may hold as many as it may have pending.
+    return asyncio.Queue(maxsize=max(config.REACTPY_MAX_PENDING_EVENTS.current, 0))
+
+
+def _get_layout_events(msg: dict[str, Any]) -> list[dict[str, Any]] | None:
+    """Get the events in the given message, or ``None`` if it is not an event message"""
+    if msg.get("type") == "layout-event":
+        return [msg]
+    if msg.get("type") == "layout-event-batch":
+        return msg["events"]
+    return None
+
+
+async def _queue_layout_events(
+    msg: dict[str, Any], rendering_queue: asyncio.Queue[dict[str, Any]]
+) -> bool:
+    """Queue the events in the given message, or return false if it contains none"""
+    events = _get_layout_events(msg)
+    if events is None:
+        return False
+    for event in events:
+        await rendering_queue.put(event)
+    return True
+
 
 @dataclass
 class StaticFileApp:
@@ -286,6 +596,19 @@ class WebModuleApp:
         await self._static_file_server(scope, receive, send)
 
 
+class MetricsApp:
+    async def __call__(
+        self, scope: AsgiHttpScope, receive: AsgiHttpReceive, send: AsgiHttpSend
+    ) -> None:
+        """ASGI app for the metrics of every layout in this process, in the
+        Prometheus text format."""
+        response = ResponseText(
+            to_prometheus_text(process_stats()),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+        await response(scope, receive, send)  # type: ignore
+
+
 class Error404App:
     async def __call__(
         self, scope: AsgiScope, receive: AsgiReceive, send: AsgiSend
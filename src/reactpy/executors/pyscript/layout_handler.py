@@ -1,9 +1,10 @@
 # type: ignore
 import asyncio
 import logging
+from copy import deepcopy
 
 import js
-from jsonpointer import set_pointer
+from jsonpointer import JsonPointer, resolve_pointer, set_pointer
 from pyodide.ffi.wrappers import add_event_listener
 from pyscript.js_modules import morphdom
 
@@ -24,11 +25,39 @@ class ReactPyLayoutHandler:
 
     @staticmethod
     def update_model(update, root_model):
-        """Apply an update ReactPy's internal DOM model."""
-        if update["path"]:
-            set_pointer(root_model, update["path"], update["model"])
+        """Apply an update ReactPy's internal DOM model.
+
+        Values are copied since models are shared with the layout (which relies on
+        them being unchanged) rather than serialized.
+        """
+        if update["type"] == "layout-update-batch":
+            for batched_update in update["updates"]:
+                ReactPyLayoutHandler.update_model(batched_update, root_model)
+        elif "changes" in update:
+            target = resolve_pointer(root_model, update["path"])
+            for change in update["changes"]:
+                ReactPyLayoutHandler.apply_change(target, change)
+        elif update["path"]:
+            set_pointer(root_model, update["path"], deepcopy(update["model"]))
         else:
-            root_model.update(update["model"])
+            root_model.update(deepcopy(update["model"]))
+
+    @staticmethod
+    def apply_change(model, change):
+        """Apply a single fine-grained change to part of ReactPy's internal DOM model."""
+        if change["op"] == "move":
+            from_parent, from_part = JsonPointer(change["from"]).to_last(model)
+            value = from_parent.pop(from_part)
+            parent, part = JsonPointer(change["path"]).to_last(model)
+            parent.insert(part, value)
+            return
+        parent, part = JsonPointer(change["path"]).to_last(model)
+        if change["op"] == "remove":
+            del parent[part]
+        elif change["op"] == "add" and isinstance(parent, list):
+            parent.insert(part, deepcopy(change["value"]))
+        else:
+            parent[part] = deepcopy(change["value"])
 
     def render_html(self, layout, model):
         """Submit ReactPy's internal DOM model into the HTML DOM."""
@@ -60,7 +60,7 @@ def process_settings(settings: ReactPyConfig) -> None:
 
 
 def server_side_component_html(
-    element_id: str, class_: str, component_path: str
+    element_id: str, class_: str, component_path: str, multiplex: bool = False
 ) -> str:
     return (
         f'<div id="{element_id}" class="{class_}"></div>'
@@ -83,6 +83,7 @@ def server_side_component_html(
         f'  mountElement: document.getElementById("{element_id}"),'
         f'  pathPrefix: "{REACTPY_PATH_PREFIX.current}",'
         f'  componentPath: "{component_path}",'
+        f"  multiplex: {'true' if multiplex else 'false'},"
         f"  reconnectInterval: {REACTPY_RECONNECT_INTERVAL.current},"
         f"  reconnectMaxInterval: {REACTPY_RECONNECT_MAX_INTERVAL.current},"
         f"  reconnectMaxRetries: {REACTPY_RECONNECT_MAX_RETRIES.current},"
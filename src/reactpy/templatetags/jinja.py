@@ -3,6 +3,7 @@ from uuid import uuid4
 
 from jinja2_simple_tags import StandaloneTag
 
+from reactpy.config import REACTPY_MULTIPLEX
 from reactpy.executors.pyscript.utils import (
     pyscript_component_html,
     pyscript_setup_html,
@@ -33,7 +34,10 @@ def component(dotted_path: str, **kwargs: str) -> str:
     if kwargs:
         raise ValueError(f"Unexpected keyword arguments: {', '.join(kwargs)}")
     return server_side_component_html(
-        element_id=uuid4().hex, class_=class_, component_path=f"{dotted_path}/"
+        element_id=uuid4().hex,
+        class_=class_,
+        component_path=f"{dotted_path}/",
+        multiplex=REACTPY_MULTIPLEX.current,
     )
 
 
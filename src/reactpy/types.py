@@ -38,11 +38,23 @@ RootComponentConstructor = Callable[[], "Component"]
 
 Key: TypeAlias = str | int
 
+RenderOffload: TypeAlias = Literal["thread"]
+"""Where a component's render function may be run instead of the event loop"""
+
 
 class Component:
     """An object for rending component models."""
 
-    __slots__ = "__weakref__", "_args", "_func", "_kwargs", "_sig", "key", "type"
+    __slots__ = (
+        "__weakref__",
+        "_args",
+        "_func",
+        "_kwargs",
+        "_sig",
+        "key",
+        "offload",
+        "type",
+    )
 
     def __init__(
         self,
@@ -51,9 +63,12 @@ class Component:
         args: tuple[Any, ...],
         kwargs: dict[str, Any],
         sig: inspect.Signature,
+        *,
+        offload: RenderOffload | None = None,
     ) -> None:
         self.key = key
         self.type = function
+        self.offload = offload
         self._args = args
         self._kwargs = kwargs
         self._sig = sig
@@ -83,10 +98,10 @@ class BaseLayout(Protocol[_Render_co, _Event_contra]):
 
     __slots__: tuple[str, ...] = (
         "__weakref__",
+        "_completed_render_tasks",
         "_event_handlers",
         "_model_states_by_life_cycle_state_id",
         "_render_tasks",
-        "_render_tasks_ready",
         "_rendering_queue",
         "_root_life_cycle_state_id",
         "root",
@@ -915,6 +930,9 @@ class JsonEventTarget(TypedDict):
     target: str
     preventDefault: bool
     stopPropagation: bool
+    throttle: NotRequired[int]
+    debounce: NotRequired[int]
+    fields: NotRequired[list[str]]
 
 
 class JsonImportSource(TypedDict):
@@ -939,10 +957,13 @@ class BaseEventHandler:
 
     __slots__ = (
         "__weakref__",
+        "debounce_ms",
+        "fields",
         "function",
         "prevent_default",
         "stop_propagation",
         "target",
+        "throttle_ms",
     )
 
     function: EventHandlerFunc
@@ -965,6 +986,15 @@ class BaseEventHandler:
         When ``None``, it is left to a :class:`LayoutType` to auto generate a unique ID.
     """
 
+    throttle_ms: int | None
+    """The minimum time in milliseconds between the client sending each event"""
+
+    debounce_ms: int | None
+    """The time in milliseconds without further events before the client sends one"""
+
+    fields: tuple[str, ...] | None
+    """Dot-delimited paths of the only parts of each event the client sends"""
+
 
 EventHandlerMapping = Mapping[str, BaseEventHandler]
 """A generic mapping between event names to their handlers"""
@@ -1002,8 +1032,63 @@ class LayoutUpdateMessage(TypedDict):
     """The type of message"""
     path: str
     """JSON Pointer path to the model element being updated"""
-    model: VdomJson | dict[str, Any]
+    model: NotRequired[VdomJson | dict[str, Any]]
     """The model to assign at the given JSON Pointer path"""
+    changes: NotRequired[list[LayoutUpdateChange]]
+    """Changes to apply to the model at the given JSON Pointer path (instead of ``model``)"""
+
+
+class LayoutUpdateBatchMessage(TypedDict):
+    """A message describing several updates to a layout which should be applied together"""
+
+    type: Literal["layout-update-batch"]
+    """The type of message"""
+    updates: list[LayoutUpdateMessage]
+    """The updates to apply in order"""
+
+
+LayoutUpdateChange = TypedDict(
+    "LayoutUpdateChange",
+    {
+        # The operation to perform (in the same sense as a JSON Patch operation)
+        "op": Literal["add", "remove", "replace", "move"],
+        # JSON Pointer path, relative to the updated model, of the value being changed
+        "path": str,
+        # The path of the value to move (only present when moving a value)
+        "from": NotRequired[str],
+        # The value to add or replace with (absent when removing or moving a value)
+        "value": NotRequired[Any],
+    },
+)
+"""A fine-grained change to part of a model within a :class:`LayoutUpdateMessage`"""
+
+
+class ComponentRenderStats(TypedDict):
+    """Metrics about the renders of one type of component"""
+
+    count: int
+    """The number of times components of this type rendered"""
+    seconds: float
+    """The total time spent in their render functions"""
+
+
+class LayoutStats(TypedDict):
+    """Metrics describing the work done by a layout"""
+
+    component_renders: dict[str, ComponentRenderStats]
+    """Render metrics by the name of each component's type"""
+    updates: int
+    """The number of updates produced"""
+    nodes_visited: int
+    """The total number of elements and components rendered to produce those updates"""
+    update_bytes: int
+    """The total serialized size of updates sent to the client"""
+    event_updates: int
+    """The number of updates which were caused by an event"""
+    event_update_seconds: float
+    """The total time from delivering each of those events until the update was made"""
+    pending_renders: int
+    """The number of renders which are scheduled or in progress"""
 
 
 class LayoutEventMessage(TypedDict):
@@ -1017,6 +1102,15 @@ class LayoutEventMessage(TypedDict):
     """A list of event data passed to the event handler."""
 
 
+class LayoutEventBatchMessage(TypedDict):
+    """Message describing several events which occurred together, in order"""
+
+    type: Literal["layout-event-batch"]
+    """The type of message"""
+    events: list[LayoutEventMessage]
+    """The events to deliver in order"""
+
+
 class Context(Protocol[_Type]):
     """Returns a :class:`ContextProvider` component"""
 
@@ -1039,6 +1133,7 @@ class ContextProvider(Component, Generic[_Type]):
         self.children = children
         self.key = key
         self.type = type
+        self.offload = None
         self.value = value
 
     def render(self) -> VdomDict:
@@ -1095,6 +1190,21 @@ class ReactPyConfig(TypedDict, total=False):
     reconnect_max_retries: int
     reconnect_backoff_multiplier: float
     async_rendering: bool
+    diff_updates: bool
+    batch_updates: bool
+    batch_updates_window: int
+    render_time_slice: int
+    unmount_concurrency: int
+    unmount_timeout: float
+    metrics: bool
+    max_pending_events: int
+    repeated_events: Literal["queue", "coalesce", "drop"]
+    send_buffer_size: int
+    msgpack: bool
+    compression: bool
+    compact_models: bool
+    multiplex: bool
+    max_mounts: int
     debug: bool
     tests_default_timeout: int
 
@@ -1,8 +1,11 @@
 # ruff: noqa: S701
 import asyncio
 from pathlib import Path
+from unittest.mock import patch
 
+import orjson
 import pytest
+from asgiref.testing import ApplicationCommunicator
 from jinja2 import Environment as JinjaEnvironment
 from jinja2 import FileSystemLoader as JinjaFileSystemLoader
 from requests import request
@@ -11,9 +14,17 @@ from starlette.routing import Route
 from starlette.templating import Jinja2Templates
 
 import reactpy
-from reactpy.config import REACTPY_PATH_PREFIX, REACTPY_TESTS_DEFAULT_TIMEOUT
+from reactpy.config import (
+    REACTPY_MAX_MOUNTS,
+    REACTPY_MAX_PENDING_EVENTS,
+    REACTPY_METRICS,
+    REACTPY_MULTIPLEX,
+    REACTPY_PATH_PREFIX,
+    REACTPY_TESTS_DEFAULT_TIMEOUT,
+)
 from reactpy.executors.asgi.middleware import ReactPyMiddleware
-from reactpy.testing import BackendFixture, DisplayFixture
+from reactpy.templatetags.jinja import component
+from reactpy.testing import BackendFixture, DisplayFixture, StaticEventHandler, poll
 
 from .. import pytestmark  # noqa: F401
 
@@ -122,6 +133,313 @@ async def test_static_file_not_found():
         assert response.status_code == 404
 
 
+async def test_metrics_route():
+    async def app(scope, receive, send): ...
+
+    app = ReactPyMiddleware(app, [])
+
+    with patch.object(REACTPY_METRICS, "current", True):
+        async with BackendFixture(app) as server:
+            url = f"http://{server.host}:{server.port}{REACTPY_PATH_PREFIX.current}metrics"
+            response = await asyncio.to_thread(
+                request, "GET", url, timeout=REACTPY_TESTS_DEFAULT_TIMEOUT.current
+            )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE reactpy_component_renders_total counter" in response.text
+    assert "\nreactpy_pending_renders " in response.text
+
+
+CLICK_HANDLER = StaticEventHandler()
+CLICKS = []
+
+
+@reactpy.component
+def Clicker():
+    def handle_click(value):
+        CLICKS.append(value)
+
+    return reactpy.html.button({"onClick": CLICK_HANDLER.use(handle_click)})
+
+
+BLOCK_HANDLER = StaticEventHandler()
+
+
+@reactpy.component
+def Blocker():
+    async def handle_click(value):
+        await asyncio.Event().wait()
+
+    return reactpy.html.button({"onClick": BLOCK_HANDLER.use(handle_click)})
+
+
+async def test_multiplexed_root_components():
+    async def app(scope, receive, send): ...
+
+    app = ReactPyMiddleware(
+        app, ["tests.sample.SampleApp", "tests.test_asgi.test_middleware.Clicker"]
+    )
+    path = f"{REACTPY_PATH_PREFIX.current}multiplex"
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "scheme": "ws",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"http_pathname=/",
+        "root_path": "",
+        "headers": [],
+        "subprotocols": ["reactpy.json"],
+    }
+
+    communicator = ApplicationCommunicator(app, scope)
+    await communicator.send_input({"type": "websocket.connect"})
+    assert (await communicator.receive_output())["type"] == "websocket.accept"
+
+    for mount_id, component_path in [
+        ("a", "tests.sample.SampleApp/"),
+        ("b", "tests.test_asgi.test_middleware.Clicker/"),
+    ]:
+        message = {
+            "type": "layout-mount",
+            "mountId": mount_id,
+            "componentPath": component_path,
+        }
+        await communicator.send_input(
+            {"type": "websocket.receive", "text": orjson.dumps(message).decode()}
+        )
+    updates = [
+        orjson.loads((await communicator.receive_output())["text"]) for _ in range(2)
+    ]
+    assert {u["mountId"] for u in updates} == {"a", "b"}
+    assert all(u["type"] == "layout-update" for u in updates)
+
+    for message in [
+        {"type": "layout-unmount", "mountId": "a"},
+        {
+            "type": "layout-event",
+            "mountId": "b",
+            "target": CLICK_HANDLER.target,
+            "data": [1],
+        },
+    ]:
+        await communicator.send_input(
+            {"type": "websocket.receive", "text": orjson.dumps(message).decode()}
+        )
+    await poll(lambda: CLICKS).until_equals([1])
+    await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+    await communicator.wait()
+
+
+async def test_multiplexed_mounts_are_limited():
+    async def app(scope, receive, send): ...
+
+    app = ReactPyMiddleware(
+        app, ["tests.sample.SampleApp", "tests.test_asgi.test_middleware.Clicker"]
+    )
+    path = f"{REACTPY_PATH_PREFIX.current}multiplex"
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "scheme": "ws",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"http_pathname=/",
+        "root_path": "",
+        "headers": [],
+        "subprotocols": ["reactpy.json"],
+    }
+
+    async def send_message(message):
+        await communicator.send_input(
+            {"type": "websocket.receive", "text": orjson.dumps(message).decode()}
+        )
+
+    with patch.object(REACTPY_MAX_MOUNTS, "current", 1):
+        communicator = ApplicationCommunicator(app, scope)
+        await communicator.send_input({"type": "websocket.connect"})
+        assert (await communicator.receive_output())["type"] == "websocket.accept"
+
+        for mount_id, component_path in [
+            ("a", "tests.sample.SampleApp/"),
+            # the id is already mounted
+            ("a", "tests.test_asgi.test_middleware.Clicker/"),
+            # too many components are mounted
+            ("b", "tests.test_asgi.test_middleware.Clicker/"),
+        ]:
+            await send_message(
+                {
+                    "type": "layout-mount",
+                    "mountId": mount_id,
+                    "componentPath": component_path,
+                }
+            )
+        update = orjson.loads((await communicator.receive_output())["text"])
+        assert update["mountId"] == "a"
+        assert await communicator.receive_nothing()
+
+        await send_message({"type": "layout-unmount", "mountId": "a"})
+        await send_message(
+            {
+                "type": "layout-mount",
+                "mountId": "b",
+                "componentPath": "tests.test_asgi.test_middleware.Clicker/",
+            }
+        )
+        update = orjson.loads((await communicator.receive_output())["text"])
+        assert update["mountId"] == "b"
+
+        await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+        await communicator.wait()
+
+
+async def test_busy_multiplexed_mount_does_not_block_others():
+    async def app(scope, receive, send): ...
+
+    app = ReactPyMiddleware(
+        app,
+        [
+            "tests.test_asgi.test_middleware.Blocker",
+            "tests.test_asgi.test_middleware.Clicker",
+        ],
+    )
+    path = f"{REACTPY_PATH_PREFIX.current}multiplex"
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "scheme": "ws",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"http_pathname=/",
+        "root_path": "",
+        "headers": [],
+        "subprotocols": ["reactpy.json"],
+    }
+
+    async def send_message(message):
+        await communicator.send_input(
+            {"type": "websocket.receive", "text": orjson.dumps(message).decode()}
+        )
+
+    with patch.object(REACTPY_MAX_PENDING_EVENTS, "current", 1):
+        communicator = ApplicationCommunicator(app, scope)
+        await communicator.send_input({"type": "websocket.connect"})
+        assert (await communicator.receive_output())["type"] == "websocket.accept"
+
+        for mount_id, component_path in [
+            ("a", "tests.test_asgi.test_middleware.Blocker/"),
+            ("b", "tests.test_asgi.test_middleware.Clicker/"),
+        ]:
+            await send_message(
+                {
+                    "type": "layout-mount",
+                    "mountId": mount_id,
+                    "componentPath": component_path,
+                }
+            )
+        for _ in range(2):
+            await communicator.receive_output()
+
+        # more events than the blocked mount may have pending
+        await send_message(
+            {
+                "type": "layout-event-batch",
+                "mountId": "a",
+                "events": [
+                    {
+                        "type": "layout-event",
+                        "target": BLOCK_HANDLER.target,
+                        "data": [i],
+                    }
+                    for i in range(5)
+                ],
+            }
+        )
+        await send_message({"type": "layout-unmount", "mountId": "a"})
+        await send_message(
+            {
+                "type": "layout-event",
+                "mountId": "b",
+                "target": CLICK_HANDLER.target,
+                "data": ["busy"],
+            }
+        )
+        await poll(lambda: "busy" in CLICKS).until_is(True)
+
+        await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+        await communicator.wait()
+
+
+async def test_invalid_or_failed_multiplexed_mounts_are_answered_with_errors():
+    async def app(scope, receive, send): ...
+
+    app = ReactPyMiddleware(app, ["tests.test_asgi.test_middleware.Clicker"])
+    path = f"{REACTPY_PATH_PREFIX.current}multiplex"
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "scheme": "ws",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"http_pathname=/",
+        "root_path": "",
+        "headers": [],
+        "subprotocols": ["reactpy.json"],
+    }
+
+    async def send_message(message):
+        await communicator.send_input(
+            {"type": "websocket.receive", "text": orjson.dumps(message).decode()}
+        )
+
+    async def receive_message():
+        return orjson.loads((await communicator.receive_output())["text"])
+
+    with patch.object(REACTPY_MAX_MOUNTS, "current", 1):
+        communicator = ApplicationCommunicator(app, scope)
+        await communicator.send_input({"type": "websocket.connect"})
+        assert (await communicator.receive_output())["type"] == "websocket.accept"
+
+        await send_message({"type": "layout-mount", "mountId": "a"})
+        assert await receive_message() == {
+            "type": "layout-mount-error",
+            "mountId": "a",
+            "error": "No componentPath was given",
+        }
+
+        await send_message(
+            {"type": "layout-mount", "mountId": "a", "componentPath": "not.found/"}
+        )
+        error = await receive_message()
+        assert error["type"] == "layout-mount-error"
+        assert error["mountId"] == "a"
+
+        # neither mount counts towards the limit
+        await send_message(
+            {
+                "type": "layout-mount",
+                "mountId": "b",
+                "componentPath": "tests.test_asgi.test_middleware.Clicker/",
+            }
+        )
+        update = await receive_message()
+        assert update["type"] == "layout-update"
+        assert update["mountId"] == "b"
+
+        await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+        await communicator.wait()
+
+
+def test_templatetag_multiplex():
+    assert "multiplex: false" in component("tests.sample.SampleApp")
+    with patch.object(REACTPY_MULTIPLEX, "current", True):
+        assert "multiplex: true" in component("tests.sample.SampleApp")
+
+
 async def test_templatetag_bad_kwargs(browser):
     """Override for the display fixture that uses ReactPyMiddleware."""
     templates = Jinja2Templates(
@@ -1,6 +1,12 @@
 import asyncio
+import re
+import zlib
 from collections.abc import MutableMapping
+from pathlib import Path
+from unittest.mock import patch
 
+import msgpack
+import orjson
 import pytest
 from asgi_tools import ResponseText
 from asgiref.testing import ApplicationCommunicator
@@ -8,13 +14,31 @@ from requests import request
 
 import reactpy
 from reactpy import html
+from reactpy.config import (
+    REACTPY_COMPACT_MODELS,
+    REACTPY_COMPRESSION,
+    REACTPY_MSGPACK,
+    REACTPY_PATH_PREFIX,
+)
+from reactpy.core._compact import CompactModelDecoder
+from reactpy.executors.asgi.middleware import COMPRESSION_DICTIONARY
 from reactpy.executors.asgi.standalone import ReactPy
-from reactpy.testing import BackendFixture, DisplayFixture, poll
+from reactpy.testing import BackendFixture, DisplayFixture, StaticEventHandler, poll
 from reactpy.testing.common import REACTPY_TESTS_DEFAULT_TIMEOUT
 from reactpy.types import Connection, Location
 
 from .. import pytestmark  # noqa: F401
 
+CLIENT_PROTOCOL_FILE = (
+    Path(reactpy.__file__).parents[1]
+    / "js"
+    / "packages"
+    / "@reactpy"
+    / "client"
+    / "src"
+    / "protocol.ts"
+)
+
 
 async def test_display_simple_hello_world(display: DisplayFixture):
     @reactpy.component
@@ -265,3 +289,240 @@ async def test_custom_lifespan_app():
         @app.lifespan
         async def custom_lifespan_app2(scope, receive, send) -> None:
             pass
+
+
+async def test_event_batch_message():
+    handler = StaticEventHandler()
+    clicks = []
+
+    def handle_click(value):
+        clicks.append(value)
+
+    @reactpy.component
+    def sample():
+        return html.button({"onClick": handler.use(handle_click)})
+
+    app = ReactPy(sample)
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "scheme": "ws",
+        "path": REACTPY_PATH_PREFIX.current,
+        "raw_path": REACTPY_PATH_PREFIX.current.encode(),
+        "query_string": b"http_pathname=/",
+        "root_path": "",
+        "headers": [],
+        "subprotocols": [],
+    }
+
+    communicator = ApplicationCommunicator(app, scope)
+    await communicator.send_input({"type": "websocket.connect"})
+    assert (await communicator.receive_output())["type"] == "websocket.accept"
+    assert (await communicator.receive_output())["type"] == "websocket.send"
+
+    events = [
+        {"type": "layout-event", "target": handler.target, "data": [i]}
+        for i in range(3)
+    ]
+    await communicator.send_input(
+        {
+            "type": "websocket.receive",
+            "text": orjson.dumps(
+                {"type": "layout-event-batch", "events": events}
+            ).decode(),
+        }
+    )
+    await poll(lambda: clicks).until_equals([0, 1, 2])
+
+    await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+    await communicator.wait()
+
+
+async def test_msgpack_subprotocol():
+    handler = StaticEventHandler()
+    clicks = []
+
+    def handle_click(value):
+        clicks.append(value)
+
+    @reactpy.component
+    def sample():
+        return html.button({"onClick": handler.use(handle_click)})
+
+    app = ReactPy(sample)
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "scheme": "ws",
+        "path": REACTPY_PATH_PREFIX.current,
+        "raw_path": REACTPY_PATH_PREFIX.current.encode(),
+        "query_string": b"http_pathname=/",
+        "root_path": "",
+        "headers": [],
+        "subprotocols": ["reactpy.msgpack", "reactpy.json"],
+    }
+
+    # JSON is preferred unless MessagePack is enabled
+    communicator = ApplicationCommunicator(app, scope)
+    await communicator.send_input({"type": "websocket.connect"})
+    accept = await communicator.receive_output()
+    assert accept == {"type": "websocket.accept", "subprotocol": "reactpy.json"}
+    await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+    await communicator.wait()
+
+    with patch.object(REACTPY_MSGPACK, "current", True):
+        communicator = ApplicationCommunicator(app, scope)
+        await communicator.send_input({"type": "websocket.connect"})
+        accept = await communicator.receive_output()
+    assert accept == {"type": "websocket.accept", "subprotocol": "reactpy.msgpack"}
+
+    update = await communicator.receive_output()
+    assert "text" not in update
+    assert msgpack.unpackb(update["bytes"])["type"] == "layout-update"
+
+    event = {"type": "layout-event", "target": handler.target, "data": [1]}
+    await communicator.send_input(
+        {"type": "websocket.receive", "bytes": msgpack.packb(event)}
+    )
+    await poll(lambda: clicks).until_equals([1])
+
+    await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+    await communicator.wait()
+
+
+async def test_binary_frames_are_ignored_unless_msgpack_is_negotiated():
+    handler = StaticEventHandler()
+    clicks = []
+
+    def handle_click(value):
+        clicks.append(value)
+
+    @reactpy.component
+    def sample():
+        return html.button({"onClick": handler.use(handle_click)})
+
+    app = ReactPy(sample)
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "scheme": "ws",
+        "path": REACTPY_PATH_PREFIX.current,
+        "raw_path": REACTPY_PATH_PREFIX.current.encode(),
+        "query_string": b"http_pathname=/",
+        "root_path": "",
+        "headers": [],
+        "subprotocols": ["reactpy.json"],
+    }
+
+    communicator = ApplicationCommunicator(app, scope)
+    await communicator.send_input({"type": "websocket.connect"})
+    accept = await communicator.receive_output()
+    assert accept == {"type": "websocket.accept", "subprotocol": "reactpy.json"}
+    assert "text" in await communicator.receive_output()
+
+    for frame, value in [("bytes", 1), ("text", 2)]:
+        event = {"type": "layout-event", "target": handler.target, "data": [value]}
+        data = (
+            msgpack.packb(event) if frame == "bytes" else orjson.dumps(event).decode()
+        )
+        await communicator.send_input({"type": "websocket.receive", frame: data})
+    # the connection is still open after the binary frame
+    await poll(lambda: clicks).until_equals([2])
+
+    await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+    await communicator.wait()
+
+
+async def test_compressed_updates():
+    handler = StaticEventHandler()
+
+    @reactpy.component
+    def sample():
+        count, set_count = reactpy.hooks.use_state(0)
+        return html.button(
+            {"onClick": handler.use(lambda: set_count(count + 1))}, count
+        )
+
+    app = ReactPy(sample)
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "scheme": "ws",
+        "path": REACTPY_PATH_PREFIX.current,
+        "raw_path": REACTPY_PATH_PREFIX.current.encode(),
+        "query_string": b"http_pathname=/",
+        "root_path": "",
+        "headers": [],
+        "subprotocols": ["reactpy.json+deflate", "reactpy.json"],
+    }
+
+    with patch.object(REACTPY_COMPRESSION, "current", True):
+        communicator = ApplicationCommunicator(app, scope)
+        await communicator.send_input({"type": "websocket.connect"})
+        accept = await communicator.receive_output()
+    assert accept["subprotocol"] == "reactpy.json+deflate"
+
+    # the stream continues across messages
+    decompressor = zlib.decompressobj(
+        wbits=-zlib.MAX_WBITS, zdict=COMPRESSION_DICTIONARY
+    )
+    first = await communicator.receive_output()
+    assert b'"children":["0"]' in decompressor.decompress(first["bytes"])
+
+    event = {"type": "layout-event", "target": handler.target, "data": []}
+    await communicator.send_input(
+        {"type": "websocket.receive", "text": orjson.dumps(event).decode()}
+    )
+    second = await communicator.receive_output()
+    assert b'"children":["1"]' in decompressor.decompress(second["bytes"])
+
+    await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+    await communicator.wait()
+
+
+def test_compression_dictionary_matches_client():
+    source = CLIENT_PROTOCOL_FILE.read_text()
+    start = source.index("const COMPRESSION_DICTIONARY")
+    literal = source[start : source.index(");", start)]
+    client_dictionary = "".join(re.findall(r"'([^'\\]*)'", literal)).encode()
+    assert client_dictionary == COMPRESSION_DICTIONARY
+
+
+async def test_compact_models():
+    @reactpy.component
+    def sample():
+        return html.div({"className": "greeting"}, "Hello")
+
+    app = ReactPy(sample)
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "scheme": "ws",
+        "path": REACTPY_PATH_PREFIX.current,
+        "raw_path": REACTPY_PATH_PREFIX.current.encode(),
+        "query_string": b"http_pathname=/",
+        "root_path": "",
+        "headers": [],
+        "subprotocols": ["reactpy.msgpack+compact", "reactpy.msgpack"],
+    }
+
+    with (
+        patch.object(REACTPY_COMPACT_MODELS, "current", True),
+        patch.object(REACTPY_MSGPACK, "current", True),
+    ):
+        communicator = ApplicationCommunicator(app, scope)
+        await communicator.send_input({"type": "websocket.connect"})
+        accept = await communicator.receive_output()
+    assert accept["subprotocol"] == "reactpy.msgpack+compact"
+
+    update = msgpack.unpackb((await communicator.receive_output())["bytes"])
+    assert "greeting" in update["strings"]
+    assert "greeting" in str(CompactModelDecoder().decode_message(update)["model"])
+
+    await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+    await communicator.wait()
@@ -0,0 +1,121 @@
+from unittest.mock import patch
+
+import reactpy
+from reactpy.core import _compact
+from reactpy.core._compact import CompactModelDecoder, CompactModelEncoder
+from reactpy.core._diff import diff_models
+from reactpy.core.layout import Layout
+
+
+@reactpy.component
+def Table():
+    def handle_click(event):
+        return None
+
+    return reactpy.html.table(
+        {"className": "table"},
+        [
+            reactpy.html.tr(
+                {"key": i, "className": "row", "style": {"textAlign": "right"}},
+                reactpy.html.td(
+                    {"onClick": reactpy.event(handle_click, prevent_default=True)}, i
+                ),
+            )
+            for i in range(3)
+        ],
+    )
+
+
+async def test_compact_model_round_trip():
+    async with Layout(Table()) as layout:
+        update = await layout.render()
+
+    encoder = CompactModelEncoder()
+    encoded = encoder.encode_message(update)
+
+    table = encoded["model"]["c"][0]
+    assert set(table) == {"t", "a", "c"}
+    row = table["c"][0]
+    assert encoded["strings"][row["t"]] == "tr"
+    # strings are only sent the first time they are referred to
+    assert len(encoded["strings"]) == len(set(encoded["strings"]))
+    assert row["a"][2:] == table["c"][1]["a"][2:]
+    assert row["c"][0]["e"][1] == {"t": row["c"][0]["e"][1]["t"], "p": True}
+
+    assert CompactModelDecoder().decode_message(encoded) == update
+
+
+def test_compact_changes_round_trip():
+    old = {"tagName": "ul", "children": [{"tagName": "li", "children": ["a"]}]}
+    new = {
+        "tagName": "ul",
+        "attributes": {"className": "list"},
+        "children": [
+            {"tagName": "li", "children": ["a"]},
+            {"tagName": "li", "attributes": {"className": "list"}, "children": ["b"]},
+        ],
+    }
+    encoder = CompactModelEncoder()
+    decoder = CompactModelDecoder()
+    messages = [
+        {"type": "layout-update", "path": "", "model": old},
+        {"type": "layout-update", "path": "", "changes": diff_models(old, new)},
+        {
+            "type": "layout-update-batch",
+            "updates": [
+                {
+                    "type": "layout-update",
+                    "path": "",
+                    "changes": [
+                        {"op": "replace", "path": "/children", "value": ["c"]},
+                        {"op": "remove", "path": "/attributes"},
+                    ],
+                }
+            ],
+        },
+        {"type": "other"},
+    ]
+    for message in messages:
+        encoded = encoder.encode_message(message)
+        assert decoder.decode_message(encoded) == message
+
+    change = encoder.encode_message(messages[1])["changes"][-1]
+    assert "value" not in change
+    assert change["vdom"]["a"] == [2, 3]
+
+
+def test_compact_string_table_is_limited():
+    encoder = CompactModelEncoder()
+    decoder = CompactModelDecoder()
+    update = {
+        "type": "layout-update",
+        "path": "",
+        "model": {"tagName": "div", "attributes": {"className": "a", "id": "b"}},
+    }
+    with patch.object(_compact, "MAX_STRINGS", 2):
+        encoded = encoder.encode_message(update)
+    assert encoded["strings"] == ["div", "className"]
+    assert encoded["model"]["a"] == [1, "a", "id", "b"]
+    assert decoder.decode_message(encoded) == update
+
+
+def test_compact_literal_class_names_and_styles_round_trip():
+    encoder = CompactModelEncoder()
+    decoder = CompactModelDecoder()
+    update = {
+        "type": "layout-update",
+        "path": "",
+        "model": {
+            "tagName": "div",
+            "attributes": {"className": "a", "style": {"color": "red"}},
+            "children": [
+                # literals which look like the encoded form of other values
+                {"tagName": "div", "attributes": {"className": 0, "style": "b"}},
+                {"tagName": "div", "attributes": {"className": [1], "style": [2]}},
+                {"tagName": "div", "attributes": {"className": None, "style": []}},
+            ],
+        },
+    }
+    encoded = encoder.encode_message(update)
+    assert encoded["model"]["c"][0]["a"] == [1, [0], 3, ["b"]]
+    assert decoder.decode_message(encoded) == update
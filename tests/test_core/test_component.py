@@ -1,3 +1,5 @@
+import pytest
+
 import reactpy
 from reactpy.testing import DisplayFixture
 
@@ -71,3 +73,11 @@ async def test_pre_tags_are_rendered_correctly(display: DisplayFixture):
     assert (
         await pre.evaluate("node => node.innerHTML")
     ) == "<span>this<span>is</span>some</span>pre-formatted text"
+
+
+def test_component_cannot_be_offloaded_to_process():
+    with pytest.raises(ValueError, match="offload"):
+
+        @reactpy.component(offload="process")
+        def Heavy():
+            return None
@@ -0,0 +1,82 @@
+import random
+import time
+
+import pytest
+
+from reactpy.core._diff import diff_models
+from tests.tooling.layout import apply_changes
+
+
+def _keyed_list(keys, content=str):
+    return {
+        "tagName": "ul",
+        "children": [
+            {"tagName": "li", "attributes": {"key": k}, "children": [content(k)]}
+            for k in keys
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    "old_keys, new_keys, expected_ops",
+    [
+        ("abcde", "abcde", []),
+        ("abcde", "eabcd", ["move"]),
+        ("abcde", "bcdea", ["move"]),
+        ("abcde", "aebcd", ["move"]),
+        ("abcde", "adcbe", ["move", "move"]),
+        ("abc", "abxc", ["add"]),
+        ("abc", "ac", ["remove"]),
+        ("abc", "cxa", ["remove", "move", "add"]),
+    ],
+)
+def test_diff_keyed_children_moves_rather_than_replaces(
+    old_keys, new_keys, expected_ops
+):
+    old = _keyed_list(old_keys)
+    new = _keyed_list(new_keys)
+    changes = diff_models(old, new)
+    assert sorted(c["op"] for c in changes) == sorted(expected_ops)
+    assert apply_changes(old, "", changes) == new
+
+
+def test_diff_keyed_children_of_moved_elements():
+    old = _keyed_list("abc")
+    new = _keyed_list("cab", content=lambda key: key.upper() if key == "c" else key)
+    changes = diff_models(old, new)
+    assert changes == [
+        {"op": "move", "from": "/children/2", "path": "/children/0"},
+        {"op": "replace", "path": "/children/0/children/0", "value": "C"},
+    ]
+    assert apply_changes(old, "", changes) == new
+
+
+def test_diff_unkeyed_children_by_index():
+    old = {"tagName": "div", "children": ["a", {"tagName": "b"}]}
+    new = {"tagName": "div", "children": [{"tagName": "b"}, "a"]}
+    changes = diff_models(old, new)
+    assert {c["op"] for c in changes} == {"replace"}
+    assert apply_changes(old, "", changes) == new
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_diff_keyed_children_random(seed):
+    rand = random.Random(seed)
+    old_keys = rand.sample(range(30), rand.randint(0, 20))
+    new_keys = rand.sample(range(30), rand.randint(0, 20))
+    old = _keyed_list(old_keys)
+    new = _keyed_list(new_keys, content=lambda key: str(key * rand.randint(1, 2)))
+    changes = diff_models(old, new)
+    assert apply_changes(old, "", changes) == new
+    assert sum(c["op"] == "move" for c in changes) <= len(old_keys)
+
+
+def test_diff_many_reversed_keyed_children_quickly():
+    size = 20_000
+    old = _keyed_list(range(size))
+    new = _keyed_list(reversed(range(size)))
+    start = time.perf_counter()
+    changes = diff_models(old, new)
+    # this took several seconds when the positions of children were found by search
+    assert time.perf_counter() - start < 2
+    assert [c["op"] for c in changes] == ["move"] * (size - 1)
@@ -17,8 +17,9 @@ from tests.tooling.common import DEFAULT_TYPE_DELAY
 def test_event_handler_repr():
     handler = EventHandler(lambda: None)
     assert repr(handler) == (
-        f"EventHandler(function={handler.function}, prevent_default=False, "
-        f"stop_propagation=False, target={handler.target!r})"
+        f"EventHandler(debounce_ms=None, fields=None, function={handler.function}, "
+        f"prevent_default=False, stop_propagation=False, target={handler.target!r}, "
+        "throttle_ms=None)"
     )
 
 
@@ -62,6 +63,69 @@ def test_event_handler_equivalence():
 
     assert EventHandler(func, target="123") != EventHandler(func, target="456")
 
+    assert EventHandler(func, throttle_ms=100) != EventHandler(func, throttle_ms=200)
+
+
+def test_event_handler_rate_limits():
+    handler = reactpy.event(lambda: None, throttle_ms=100)
+    assert handler.throttle_ms == 100
+    assert handler.debounce_ms is None
+
+    handler = reactpy.event(lambda: None, debounce_ms=100)
+    assert handler.throttle_ms is None
+    assert handler.debounce_ms == 100
+
+    with pytest.raises(ValueError, match=r"cannot be both throttled and debounced"):
+        EventHandler(lambda data: None, throttle_ms=100, debounce_ms=100)
+
+    with pytest.raises(ValueError, match=r"Expected debounce_ms to be a positive"):
+        EventHandler(lambda data: None, debounce_ms=0)
+
+
+def test_event_handler_fields():
+    handler = reactpy.event(lambda event: None, fields=["target.value", "key"])
+    assert handler.fields == ("target.value", "key")
+    assert EventHandler(lambda data: None).fields is None
+
+    with pytest.raises(TypeError, match=r"Expected fields to be a sequence"):
+        EventHandler(lambda data: None, fields="key")
+
+
+async def test_fields_are_included_in_model():
+    @component
+    def Input():
+        return html.input(
+            {"onKeyDown": reactpy.event(lambda event: None, fields=["key"])}
+        )
+
+    async with Layout(Input()) as layout:
+        update = await layout.render()
+
+    handler = update["model"]["children"][0]["eventHandlers"]["onKeyDown"]
+    assert handler["fields"] == ["key"]
+
+
+async def test_rate_limits_are_included_in_model():
+    @component
+    def Input():
+        return html.input(
+            {
+                "onChange": reactpy.event(lambda: None, debounce_ms=250),
+                "onScroll": reactpy.event(lambda: None, throttle_ms=50),
+                "onClick": lambda: None,
+            }
+        )
+
+    async with Layout(Input()) as layout:
+        update = await layout.render()
+
+    handlers = update["model"]["children"][0]["eventHandlers"]
+    assert handlers["onChange"]["debounce"] == 250
+    assert "throttle" not in handlers["onChange"]
+    assert handlers["onScroll"]["throttle"] == 50
+    assert "debounce" not in handlers["onScroll"]
+    assert handlers["onClick"].keys() == {"target", "preventDefault", "stopPropagation"}
+
 
 async def test_to_event_handler_function():
     call_args = reactpy.Ref(None)
@@ -96,6 +160,8 @@ async def test_merge_event_handler_empty_list():
         ({"stop_propagation": True}, {"stop_propagation": False}),
         ({"prevent_default": True}, {"prevent_default": False}),
         ({"target": "this"}, {"target": "that"}),
+        ({"throttle_ms": 100}, {"debounce_ms": 100}),
+        ({"fields": ["key"]}, {}),
     ],
 )
 async def test_merge_event_handlers_raises_on_mismatch(kwargs_1, kwargs_2):
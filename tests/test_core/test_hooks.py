@@ -1349,3 +1349,36 @@ def test_use_effect_exception_on_async_function():
                 await layout.render()
 
         asyncio.run(run_test())
+
+
+async def test_use_effect_runs_in_batch_without_creating_tasks():
+    effect_runs = []
+    cleanup_runs = []
+    show = reactpy.Ref(None)
+
+    @reactpy.component
+    def Child(index):
+        @use_effect(dependencies=[])
+        def effect():
+            effect_runs.append(index)
+            return lambda: cleanup_runs.append(index)
+
+        return reactpy.html.div()
+
+    @reactpy.component
+    def Parent():
+        children, show.current = reactpy.use_state(True)
+        return reactpy.html.div(
+            [Child(i, key=i) for i in range(50)] if children else []
+        )
+
+    async with Layout(Parent()) as layout:
+        await layout.render()
+        await asyncio.sleep(0)
+        assert sorted(effect_runs) == list(range(50))
+        # no task is left waiting to clean up each effect
+        assert len(asyncio.all_tasks()) < 50
+
+        show.current(False)
+        await layout.render()
+        assert sorted(cleanup_runs) == list(range(50))
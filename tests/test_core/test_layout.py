@@ -3,17 +3,32 @@ import contextlib
 import gc
 import random
 import re
-from unittest.mock import patch
+import threading
+import time
+from unittest.mock import ANY, patch
 from weakref import finalize
 from weakref import ref as weakref
 
 import pytest
+from fastjsonschema import JsonSchemaException
 
 import reactpy
 from reactpy import html
-from reactpy.config import REACTPY_ASYNC_RENDERING, REACTPY_DEBUG
+from reactpy.config import (
+    REACTPY_ASYNC_RENDERING,
+    REACTPY_BATCH_UPDATES,
+    REACTPY_BATCH_UPDATES_WINDOW,
+    REACTPY_CHECK_VDOM_SPEC,
+    REACTPY_DEBUG,
+    REACTPY_DIFF_UPDATES,
+    REACTPY_METRICS,
+    REACTPY_RENDER_TIME_SLICE,
+    REACTPY_TESTS_DEFAULT_TIMEOUT,
+    REACTPY_UNMOUNT_CONCURRENCY,
+    REACTPY_UNMOUNT_TIMEOUT,
+)
 from reactpy.core.component import component
-from reactpy.core.hooks import use_async_effect, use_effect, use_state
+from reactpy.core.hooks import HOOK_STACK, use_async_effect, use_effect, use_state
 from reactpy.core.layout import Layout
 from reactpy.testing import (
     HookCatcher,
@@ -1463,9 +1478,9 @@ async def test_deduplicate_async_renders_nested():
                 while layout._render_tasks:
                     await asyncio.wait_for(layout.render(), timeout=1.0)
             assert parent_render_count.current == 3
-            # Child: 1 (init) + 1 (scen1) + 2 (scen2: Child task + Parent task) = 4
-            # We expect 4 because Child task runs first and isn't cancelled.
-            assert child_render_count.current == 4
+            # Child: 1 (init) + 1 (scen1) + 1 (scen2: Parent task) = 3
+            # The Child task is dropped because its ancestor is pending.
+            assert child_render_count.current == 3
 
             # Scenario 3: Root, Parent, Child all update
             set_root_state.current(1)
@@ -1479,7 +1494,7 @@ async def test_deduplicate_async_renders_nested():
                     await asyncio.wait_for(layout.render(), timeout=1.0)
             assert root_render_count.current == 2
             assert parent_render_count.current == 4
-            # Child: 4 (prev) + 1 (Root->Parent->Child) = 5
+            # Child: 3 (prev) + 1 (Root->Parent->Child) = 4
             # Root update triggers Parent update.
             # Parent update triggers Child update.
             # The explicit Parent and Child updates should be cancelled/deduplicated.
@@ -1487,8 +1502,7 @@ async def test_deduplicate_async_renders_nested():
             # (which is triggered by Root), it might not be cancelled in time.
             # However, with proper deduplication, we aim for 5.
             # If it is 6, it means one of the updates slipped through.
-            # Given the current implementation, let's assert <= 6 and ideally 5.
-            assert child_render_count.current <= 6
+            assert child_render_count.current == 4
 
 
 async def test_deduplicate_async_renders_rapid():
@@ -1517,3 +1531,1094 @@ async def test_deduplicate_async_renders_rapid():
             # Should not be 1 + 10 = 11.
             # Likely 1 + 1 (or maybe 1 + 2 if timing is loose).
             assert render_count.current < 5
+
+
+async def test_diff_updates_only_send_changes():
+    set_count = Ref(None)
+
+    @component
+    def Counter():
+        count, set_count.current = use_state(0)
+        return html.div(
+            {"className": "counter", "data-count": count},
+            html.h1("Counter"),
+            html.p(f"Count: {count}"),
+        )
+
+    with patch.object(REACTPY_DIFF_UPDATES, "current", True):
+        async with layout_runner(Layout(Counter())) as runner:
+            update = await runner.layout.render()
+            assert "model" in update
+            runner.model = update["model"]
+
+            set_count.current(1)
+            update = await runner.layout.render()
+            assert update == {
+                "type": "layout-update",
+                "path": "",
+                "changes": [
+                    {
+                        "op": "replace",
+                        "path": "/children/0/attributes/data-count",
+                        "value": 1,
+                    },
+                    {
+                        "op": "replace",
+                        "path": "/children/0/children/1/children/0",
+                        "value": "Count: 1",
+                    },
+                ],
+            }
+
+
+async def test_diff_updates_produce_same_model_as_full_updates():
+    set_items = Ref(None)
+    set_label = Ref(None)
+
+    @component
+    def Label():
+        label, set_label.current = use_state("a")
+        return html.span({"title": label} if label else {}, label)
+
+    @component
+    def List():
+        items, set_items.current = use_state(["a", "b", "c"])
+        return html.ul(Label(), [html.li({"key": item}, item) for item in items])
+
+    async def render_all(diff_updates):
+        with patch.object(REACTPY_DIFF_UPDATES, "current", diff_updates):
+            models = []
+            async with layout_runner(Layout(List())) as runner:
+                models.append(await runner.render())
+                for items in (["a", "b", "c", "d"], ["a", "c"], ["d", "c"], []):
+                    set_items.current(items)
+                    models.append(await runner.render())
+                set_label.current("")
+                models.append(await runner.render())
+                set_items.current(["e"])
+                models.append(await runner.render())
+                set_label.current("b")
+                models.append(await runner.render())
+            return models
+
+    assert await render_all(True) == await render_all(False)
+
+
+async def test_diff_updates_move_keyed_components():
+    set_names = Ref(None)
+
+    @component
+    def Item(name):
+        return html.li(name)
+
+    @component
+    def List():
+        names, set_names.current = use_state(list("abcdefghij"))
+        return html.ul([Item(name, key=name) for name in names])
+
+    with patch.object(REACTPY_DIFF_UPDATES, "current", True):
+        async with layout_runner(Layout(List())) as runner:
+            await runner.render()
+
+            set_names.current(list("jabcdefghi"))
+            update = await runner.layout.render()
+            assert update["changes"] == [
+                {
+                    "op": "move",
+                    "from": "/children/0/children/9",
+                    "path": "/children/0/children/0",
+                }
+            ]
+            runner.apply(update)
+
+            set_names.current(list("jabdefgi"))
+            update = await runner.layout.render()
+            assert [c["op"] for c in update["changes"]] == ["remove", "remove"]
+            runner.apply(update)
+
+    items = runner.model["children"][0]["children"]
+    assert [item["children"][0]["children"] for item in items] == [
+        [name] for name in "jabdefgi"
+    ]
+
+
+@pytest.mark.parametrize("diff_updates", [True, False])
+async def test_descendant_render_waits_for_ancestor_render_in_progress(
+    async_rendering, diff_updates
+):
+    if not async_rendering:
+        raise pytest.skip("Async rendering not enabled")
+
+    set_parent = Ref(None)
+    set_child = Ref(None)
+
+    @component
+    def Parent():
+        count, set_parent.current = use_state(0)
+        return html.div(
+            Child(), Trigger(count), [Slow(key=f"slow-{i}") for i in range(5)]
+        )
+
+    @component
+    def Child():
+        value, set_child.current = use_state(0)
+        return html.span(str(value))
+
+    @component
+    def Trigger(count):
+        # the child was already rendered as part of this render of the parent
+        if count == 1:
+            set_child.current(1)
+        return html.b(str(count))
+
+    @component
+    def Slow():
+        # use up the time slice so the parent render yields after each of these
+        time.sleep(0.002)
+        return html.p("slow")
+
+    with (
+        patch.object(REACTPY_DIFF_UPDATES, "current", diff_updates),
+        patch.object(REACTPY_RENDER_TIME_SLICE, "current", 1),
+    ):
+        async with layout_runner(Layout(Parent())) as runner:
+            await runner.render()
+            set_parent.current(1)
+            await runner.render()
+            tree = await runner.render()
+
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(runner.render(), 0.1)
+                raise AssertionError("unexpected render")  # nocov
+
+    (div,) = tree["children"]
+    assert len(div["children"]) == 7
+    assert div["children"][0]["children"][0]["children"] == ["1"]
+    assert div["children"][1]["children"][0]["children"] == ["1"]
+
+
+async def test_memo_component_is_not_skipped_while_descendant_renders(async_rendering):
+    if not async_rendering:
+        raise pytest.skip("Async rendering not enabled")
+
+    set_parent = Ref(None)
+    set_child = Ref(None)
+
+    @component
+    def Parent():
+        count, set_parent.current = use_state(0)
+        return html.div(Middle(), [Slow(key=f"slow-{i}") for i in range(5)], str(count))
+
+    @reactpy.memo
+    def Middle():
+        return Child()
+
+    @component
+    def Child():
+        value, set_child.current = use_state(0)
+        return html.span(
+            str(value), Trigger(value), [Slow(key=f"slow-{i}") for i in range(3)]
+        )
+
+    @component
+    def Trigger(value):
+        # the parent renders while this render of the child is in progress
+        if value == 1:
+            set_parent.current(1)
+        return html.b(str(value))
+
+    @component
+    def Slow():
+        time.sleep(0.002)
+        return html.p("slow")
+
+    with patch.object(REACTPY_RENDER_TIME_SLICE, "current", 1):
+        async with layout_runner(Layout(Parent())) as runner:
+            await runner.render()
+            set_child.current(1)
+            tree = await runner.render()
+            with contextlib.suppress(asyncio.TimeoutError):
+                while True:
+                    tree = await asyncio.wait_for(runner.render(), 0.1)
+
+    (div,) = tree["children"]
+    assert len(div["children"]) == 7
+    assert div["children"][-1] == "1"
+    span = div["children"][0]["children"][0]["children"][0]
+    assert span["children"][0] == "1"
+
+
+async def test_batch_updates_combines_renders_that_complete_together(async_rendering):
+    if not async_rendering:
+        raise pytest.skip("Async rendering not enabled")
+
+    setters = {}
+
+    @component
+    def Item(name):
+        value, setters[name] = use_state(0)
+        return html.li(f"{name}: {value}")
+
+    @component
+    def List():
+        return html.ul([Item(name, key=name) for name in "abc"])
+
+    with patch.object(REACTPY_BATCH_UPDATES, "current", True):
+        async with layout_runner(Layout(List())) as runner:
+            await runner.render()
+
+            for name in "abc":
+                setters[name](1)
+
+            update = await runner.layout.render()
+            assert update["type"] == "layout-update-batch"
+            assert [u["path"] for u in update["updates"]] == [
+                "/children/0/children/0",
+                "/children/0/children/1",
+                "/children/0/children/2",
+            ]
+
+            setters["a"](2)
+            update = await runner.layout.render()
+            assert update["type"] == "layout-update"
+
+
+async def test_batch_updates_window_waits_for_later_renders(async_rendering):
+    if not async_rendering:
+        raise pytest.skip("Async rendering not enabled")
+
+    setters = {}
+
+    @component
+    def Item(name):
+        value, setters[name] = use_state(0)
+        return html.li(f"{name}: {value}")
+
+    @component
+    def List():
+        return html.ul([Item(name, key=name) for name in "ab"])
+
+    async def set_later():
+        await asyncio.sleep(0.05)
+        setters["b"](1)
+
+    with (
+        patch.object(REACTPY_BATCH_UPDATES, "current", True),
+        patch.object(REACTPY_BATCH_UPDATES_WINDOW, "current", 500),
+    ):
+        async with layout_runner(Layout(List())) as runner:
+            await runner.render()
+
+            setters["a"](1)
+            task = asyncio.create_task(set_later())
+            update = await runner.layout.render()
+            await task
+            assert update["type"] == "layout-update-batch"
+            assert len(update["updates"]) == 2
+
+
+async def test_render_of_descendant_is_dropped_when_ancestor_is_pending(
+    async_rendering,
+):
+    if not async_rendering:
+        raise pytest.skip("Async rendering not enabled")
+
+    render_counts = {"parent": 0, "child": 0, "grandchild": 0}
+    hooks = {}
+
+    def counted(name):
+        def decorator(function):
+            def wrapper():
+                render_counts[name] += 1
+                hooks[name] = HOOK_STACK.current_hook()
+                return function()
+
+            return component(wrapper)
+
+        return decorator
+
+    @counted("grandchild")
+    def GrandChild():
+        return html.span("grandchild")
+
+    @counted("child")
+    def Child():
+        return html.div(GrandChild())
+
+    @counted("parent")
+    def Parent():
+        return html.div(Child())
+
+    async with layout_runner(Layout(Parent())) as runner:
+        await runner.render()
+        assert render_counts == {"parent": 1, "child": 1, "grandchild": 1}
+
+        # schedule deepest first to show order of scheduling does not matter
+        hooks["grandchild"].schedule_render()
+        hooks["parent"].schedule_render()
+        hooks["child"].schedule_render()
+
+        update = await runner.layout.render()
+        assert update["path"] == ""
+
+        await asyncio.sleep(0.05)
+        assert not runner.layout._render_tasks
+        assert render_counts == {"parent": 2, "child": 2, "grandchild": 2}
+
+
+async def test_memo_component_skips_render_when_props_are_unchanged():
+    render_counts = {}
+    set_label = Ref(None)
+    set_items = Ref(None)
+    clicked = []
+
+    @reactpy.memo
+    def Row(name):
+        render_counts[name] = render_counts.get(name, 0) + 1
+        return html.li({"onClick": lambda event: clicked.append(name)}, name)
+
+    @component
+    def List():
+        label, set_label.current = use_state("list")
+        items, set_items.current = use_state(["a", "b", "c"])
+        return html.div(html.h1(label), html.ul([Row(i, key=i) for i in items]))
+
+    async with layout_runner(Layout(List())) as runner:
+        tree = await runner.render()
+        assert render_counts == {"a": 1, "b": 1, "c": 1}
+
+        set_label.current("new label")
+        new_tree = await runner.render()
+        assert render_counts == {"a": 1, "b": 1, "c": 1}
+        assert (
+            new_tree["children"][0]["children"][1]
+            == (tree["children"][0]["children"][1])
+        )
+
+        # reordering reuses the rows (and their event handlers) at new positions
+        set_items.current(["c", "a", "d"])
+        tree = await runner.render()
+        assert render_counts == {"a": 1, "b": 1, "c": 1, "d": 1}
+        rows = tree["children"][0]["children"][1]["children"]
+        assert [r["children"][0]["children"][0] for r in rows] == ["c", "a", "d"]
+
+        await runner.trigger(rows[0]["children"][0], "onClick", {})
+        assert clicked == ["c"]
+
+
+async def test_memo_component_renders_when_props_change():
+    render_count = Ref(0)
+    set_value = Ref(None)
+
+    @reactpy.memo
+    def Child(value):
+        render_count.current += 1
+        return html.span(str(value))
+
+    @component
+    def Parent():
+        value, set_value.current = use_state(0)
+        return html.div(Child(value))
+
+    async with layout_runner(Layout(Parent())) as runner:
+        await runner.render()
+        assert render_count.current == 1
+
+        set_value.current(1)
+        tree = await runner.render()
+        assert render_count.current == 2
+        assert tree["children"][0]["children"][0]["children"][0] == {
+            "tagName": "span",
+            "children": ["1"],
+        }
+
+
+async def test_memo_component_with_custom_comparator():
+    render_count = Ref(0)
+    set_value = Ref(None)
+
+    @reactpy.memo(
+        props_are_equal=lambda old, new: old["value"] // 10 == new["value"] // 10
+    )
+    def Child(value):
+        render_count.current += 1
+        return html.span(str(value))
+
+    @component
+    def Parent():
+        value, set_value.current = use_state(0)
+        return html.div(Child(value))
+
+    async with layout_runner(Layout(Parent())) as runner:
+        await runner.render()
+
+        set_value.current(5)
+        await runner.render()
+        assert render_count.current == 1
+
+        set_value.current(15)
+        await runner.render()
+        assert render_count.current == 2
+
+
+async def test_memo_component_renders_on_own_state_and_context_change():
+    render_count = Ref(0)
+    set_child_state = Ref(None)
+    set_parent_state = Ref(None)
+    set_context_value = Ref(None)
+    Context = reactpy.create_context("default")
+
+    @reactpy.memo
+    def Child():
+        render_count.current += 1
+        state, set_child_state.current = use_state(0)
+        return html.span(f"{reactpy.use_context(Context)} {state}")
+
+    @component
+    def Parent():
+        _, set_parent_state.current = use_state(0)
+        return html.div(Child())
+
+    @component
+    def Root():
+        value, set_context_value.current = use_state("a")
+        return Context(Parent(), value=value)
+
+    async with layout_runner(Layout(Root())) as runner:
+        await runner.render()
+        assert render_count.current == 1
+
+        set_child_state.current(1)
+        await runner.render()
+        assert render_count.current == 2
+
+        # the child's own render is dropped in favor of the parent's so this checks
+        # that a memo component with a pending render is not skipped
+        set_child_state.current(2)
+        set_parent_state.current(1)
+        await runner.render()
+        assert render_count.current == 3
+
+        set_parent_state.current(2)
+        await runner.render()
+        assert render_count.current == 3
+
+        set_context_value.current("b")
+        tree = await runner.render()
+        assert render_count.current == 4
+        assert "b 2" in str(tree)
+
+
+async def test_memo_component_skip_keeps_pending_render_of_descendant():
+    render_counts = {"grandchild": 0}
+    set_parent_state = Ref(None)
+    set_grandchild_state = Ref(None)
+
+    @component
+    def GrandChild():
+        render_counts["grandchild"] += 1
+        state, set_grandchild_state.current = use_state(0)
+        return html.span(str(state))
+
+    @reactpy.memo
+    def Child():
+        return html.div(GrandChild())
+
+    @component
+    def Parent():
+        _, set_parent_state.current = use_state(0)
+        return html.div(Child())
+
+    async with layout_runner(Layout(Parent())) as runner:
+        await runner.render()
+
+        # the grandchild's render is dropped in favor of the parent's, which skips the
+        # memo component between them
+        set_grandchild_state.current(1)
+        set_parent_state.current(1)
+        await runner.render()
+        tree = await runner.render()
+        assert render_counts["grandchild"] == 2
+        assert "'1'" in str(tree)
+
+        # the grandchild does not stay marked as having a pending render
+        set_grandchild_state.current(2)
+        tree = await runner.render()
+        assert render_counts["grandchild"] == 3
+        assert "'2'" in str(tree)
+
+
+async def test_memo_component_renders_when_callback_closure_changes():
+    render_count = Ref(0)
+    set_value = Ref(None)
+    clicked = []
+
+    @reactpy.memo
+    def Child(on_click):
+        render_count.current += 1
+        return html.button({"onClick": on_click})
+
+    @component
+    def Parent():
+        value, set_value.current = use_state(0)
+        return html.div(Child(lambda event: clicked.append(value)))
+
+    async with layout_runner(Layout(Parent())) as runner:
+        await runner.render()
+
+        set_value.current(1)
+        tree = await runner.render()
+        assert render_count.current == 2
+
+        button = tree["children"][0]["children"][0]["children"][0]
+        await runner.trigger(button, "onClick", {})
+        assert clicked == [1]
+
+
+async def test_event_handler_targets_are_compact_and_unique():
+    @component
+    def Table():
+        return html.table(
+            [
+                html.tr({"key": i, "onClick": lambda event: None}, str(i))
+                for i in range(100)
+            ]
+        )
+
+    async with layout_runner(Layout(Table())) as runner:
+        tree = await runner.render()
+
+    targets = [
+        row["eventHandlers"]["onClick"]["target"]
+        for row in tree["children"][0]["children"]
+    ]
+    assert len(set(targets)) == len(targets)
+    assert all(len(t) <= 2 for t in targets)
+
+
+async def test_update_path_follows_element_after_reorder():
+    set_items = Ref(None)
+    set_counts = {}
+
+    @component
+    def Counter(name):
+        count, set_counts[name] = use_state(0)
+        return html.span(f"{name}: {count}")
+
+    @component
+    def List():
+        items, set_items.current = use_state(["a", "b", "c"])
+        return html.div([html.div({"key": i}, Counter(i)) for i in items])
+
+    async with layout_runner(Layout(List())) as runner:
+        await runner.render()
+
+        set_items.current(["c", "b", "a"])
+        await runner.render()
+
+        set_counts["a"](1)
+        tree = await runner.render()
+
+    rows = tree["children"][0]["children"]
+    assert [row["children"][0]["children"][0]["children"][0] for row in rows] == [
+        "c: 0",
+        "b: 0",
+        "a: 1",
+    ]
+
+
+async def test_renders_caused_by_events_are_started_first(async_rendering):
+    if not async_rendering:
+        raise pytest.skip("Async rendering not enabled")
+
+    set_ticker = Ref(None)
+    set_input = Ref(None)
+
+    @component
+    def Ticker():
+        count, set_ticker.current = use_state(0)
+        return html.div(str(count))
+
+    @component
+    def Input():
+        value, set_input.current = use_state("")
+        return html.input({"value": value, "onChange": set_input.current})
+
+    @component
+    def Root():
+        return html.div(Ticker(), Input())
+
+    async with Layout(Root()) as layout:
+        await layout.render()
+
+        set_ticker.current(1)
+        (target,) = layout._event_handlers
+        await layout.deliver(event_message(target, "a"))
+
+        first = await layout.render()
+        second = await layout.render()
+
+    assert first["path"] == "/children/0/children/1"
+    assert second["path"] == "/children/0/children/0"
+
+
+async def test_background_renders_are_deferred_and_superseded(async_rendering):
+    if not async_rendering:
+        raise pytest.skip("Async rendering not enabled")
+
+    set_child = Ref(None)
+    set_parent = Ref(None)
+    set_other = Ref(None)
+    child_render_count = Ref(0)
+
+    @component
+    def Child():
+        child_render_count.current += 1
+        count, set_child.current = use_state(0)
+        return html.div(str(count))
+
+    @component
+    def Parent():
+        count, set_parent.current = use_state(0)
+        return html.div(Child(), str(count))
+
+    @component
+    def Other():
+        count, set_other.current = use_state(0)
+        return html.div(str(count))
+
+    @component
+    def Root():
+        return html.div(Parent(), Other())
+
+    async with Layout(Root()) as layout:
+        await layout.render()
+        assert child_render_count.current == 1
+
+        # deferred until the default render is done
+        reactpy.start_transition(lambda: set_child.current(1))
+        set_other.current(1)
+        assert (await layout.render())["path"] == "/children/0/children/1"
+        assert (await layout.render())["path"] == (
+            "/children/0/children/0/children/0/children/0"
+        )
+        assert child_render_count.current == 2
+
+        # superseded by a render of its parent
+        reactpy.start_transition(lambda: set_child.current(2))
+        set_other.current(2)
+        await asyncio.sleep(0)
+        set_parent.current(1)
+        paths = {(await layout.render())["path"], (await layout.render())["path"]}
+        assert paths == {"/children/0/children/0", "/children/0/children/1"}
+        assert child_render_count.current == 3
+
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(layout.render(), 0.1)
+            raise AssertionError("unexpected render")  # nocov
+
+
+async def test_render_of_ancestor_covers_deferred_render(async_rendering):
+    if not async_rendering:
+        raise pytest.skip("Async rendering not enabled")
+
+    set_parent = Ref(None)
+    set_child = Ref(None)
+    child_render_count = Ref(0)
+
+    @component
+    def Parent():
+        count, set_parent.current = use_state(0)
+        return html.div(Slow(count), Child())
+
+    @component
+    def Slow(count):
+        # the render of the parent yields here, before it reaches the child
+        if count == 1:
+            set_child.current(1)
+        time.sleep(0.002)
+        return html.div(str(count))
+
+    @component
+    def Child():
+        child_render_count.current += 1
+        value, set_child.current = use_state(0)
+        return html.div(f"child: {value}")
+
+    with patch.object(REACTPY_RENDER_TIME_SLICE, "current", 1):
+        async with layout_runner(Layout(Parent())) as runner:
+            await runner.render()
+            set_parent.current(1)
+            tree = await runner.render()
+            assert child_render_count.current == 2
+            assert "child: 1" in str(tree)
+
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(runner.render(), 0.1)
+                raise AssertionError("unexpected render")  # nocov
+
+    assert child_render_count.current == 2
+
+
+async def test_render_yields_to_event_loop_after_time_slice():
+    @component
+    def BigList():
+        return html.ul([html.li({"key": i}, str(i)) for i in range(10_000)])
+
+    ticks = Ref(0)
+
+    async def count_ticks():
+        while True:
+            ticks.current += 1
+            await asyncio.sleep(0)
+
+    with patch.object(REACTPY_RENDER_TIME_SLICE, "current", 1):
+        async with layout_runner(Layout(BigList())) as runner:
+            ticker = asyncio.create_task(count_ticks())
+            try:
+                tree = await runner.render()
+            finally:
+                ticker.cancel()
+
+    assert ticks.current > 5
+    items = tree["children"][0]["children"]
+    assert len(items) == 10_000
+    assert items[-1]["children"] == ["9999"]
+
+
+@pytest.mark.parametrize("diff_updates", [True, False])
+async def test_time_slice_does_not_change_final_model(async_rendering, diff_updates):
+    set_parent = Ref(None)
+    set_child = Ref(None)
+
+    @component
+    def Parent():
+        count, set_parent.current = use_state(0)
+        return html.ul(
+            Child(),
+            [Item(i, count, key=f"item-{i}") for i in range(5)],
+            html.li(f"count: {count}"),
+        )
+
+    @component
+    def Child():
+        value, set_child.current = use_state(0)
+        return html.li(f"child: {value}")
+
+    @component
+    def Item(index, count):
+        # descendants re-render while the render of the parent is sliced
+        if index == 2 and count == 1:
+            set_child.current(count)
+        time.sleep(0.002)
+        return html.li(f"item {index}: {count}")
+
+    async def render_final_model(time_slice):
+        with (
+            patch.object(REACTPY_DIFF_UPDATES, "current", diff_updates),
+            patch.object(REACTPY_RENDER_TIME_SLICE, "current", time_slice),
+        ):
+            async with layout_runner(Layout(Parent())) as runner:
+                await runner.render()
+                set_parent.current(1)
+                tree = await runner.render()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    while True:
+                        tree = await asyncio.wait_for(runner.render(), 0.1)
+        return tree
+
+    assert await render_final_model(1) == await render_final_model(0)
+
+
+async def test_offloaded_component_renders_in_thread():
+    render_threads = []
+    set_count = Ref(None)
+    Context = reactpy.create_context("default")
+
+    @reactpy.component(offload="thread")
+    def Heavy():
+        render_threads.append(threading.get_ident())
+        count, set_count.current = use_state(0)
+        return html.div(f"{reactpy.use_context(Context)} {count}", Light())
+
+    @component
+    def Light():
+        return html.span("light")
+
+    @component
+    def Root():
+        return Context(Heavy(), value="context")
+
+    async with layout_runner(Layout(Root())) as runner:
+        tree = await runner.render()
+        assert "context 0" in str(tree)
+
+        set_count.current(1)
+        tree = await runner.render()
+        assert "context 1" in str(tree)
+        assert "light" in str(tree)
+
+    assert len(render_threads) == 2
+    assert threading.get_ident() not in render_threads
+
+
+async def test_cancelled_offloaded_render_holds_hook_until_thread_is_done(
+    async_rendering,
+):
+    if not async_rendering:
+        raise pytest.skip("Async rendering not enabled")
+
+    set_parent = Ref(None)
+    set_child = Ref(None)
+    release = threading.Event()
+    rendering = Ref(0)
+    max_rendering = Ref(0)
+
+    @component
+    def Parent():
+        count, set_parent.current = use_state(0)
+        return html.div(Child(), str(count))
+
+    @reactpy.component(offload="thread")
+    def Child():
+        rendering.current += 1
+        max_rendering.current = max(max_rendering.current, rendering.current)
+        value, set_child.current = use_state(0)
+        if value == 1:
+            release.wait(REACTPY_TESTS_DEFAULT_TIMEOUT.current)
+        rendering.current -= 1
+        return html.span(str(value))
+
+    async with layout_runner(Layout(Parent())) as runner:
+        await runner.render()
+
+        set_child.current(1)
+        await poll(lambda: rendering.current).until_equals(1)
+        # the render of the parent cancels the one of the child which is in progress
+        set_parent.current(1)
+        await asyncio.sleep(0.05)
+        release.set()
+
+        tree = await runner.render()
+        assert tree["children"][0]["children"] == [
+            {"tagName": "", "children": [{"tagName": "span", "children": ["1"]}]},
+            "1",
+        ]
+
+    assert max_rendering.current == 1
+
+
+async def test_unmount_cleans_up_effects_concurrently_with_limit():
+    running = Ref(0)
+    max_running = Ref(0)
+    stopped = []
+    show = Ref(None)
+
+    @component
+    def Child(index):
+        async def effect(stop):
+            await stop.wait()
+            running.current += 1
+            max_running.current = max(max_running.current, running.current)
+            await asyncio.sleep(0.01)
+            running.current -= 1
+            stopped.append(index)
+
+        HOOK_STACK.current_hook().add_effect(effect)
+        return html.div(index)
+
+    @component
+    def Parent():
+        children, show.current = use_state(True)
+        return html.div([Child(i, key=i) for i in range(10)] if children else [])
+
+    with patch.object(REACTPY_UNMOUNT_CONCURRENCY, "current", 3):
+        async with layout_runner(Layout(Parent())) as runner:
+            await runner.render()
+            show.current(False)
+            await runner.render()
+
+            assert sorted(stopped) == list(range(10))
+            assert max_running.current == 3
+
+
+async def test_unmount_cancels_effects_which_do_not_stop():
+    show = Ref(None)
+    cancelled = Ref(False)
+
+    @component
+    def Child():
+        async def effect(stop):
+            try:
+                await asyncio.Event().wait()  # ignores the stop event
+            except asyncio.CancelledError:
+                cancelled.current = True
+                raise
+
+        HOOK_STACK.current_hook().add_effect(effect)
+        return html.div()
+
+    @component
+    def Parent():
+        child, show.current = use_state(True)
+        return html.div(Child() if child else "gone")
+
+    with patch.object(REACTPY_UNMOUNT_TIMEOUT, "current", 0.01):
+        async with layout_runner(Layout(Parent())) as runner:
+            await runner.render()
+            show.current(False)
+            await asyncio.wait_for(runner.render(), 1)
+
+    assert cancelled.current
+
+
+async def test_static_element_reuses_its_model():
+    header = reactpy.static(html.header(html.h1("Title"), html.p("Subtitle")))
+    set_count = Ref(None)
+
+    @component
+    def Page():
+        count, set_count.current = use_state(0)
+        return html.div(header, html.p(str(count)))
+
+    async with Layout(Page()) as layout:
+        update = await layout.render()
+        assert update["model"]["children"][0]["children"][0] is header.model
+
+        set_count.current(1)
+        update = await layout.render()
+        assert update["model"]["children"][0]["children"][0] is header.model
+        assert update["model"]["children"][0]["children"][1] == {
+            "tagName": "p",
+            "children": ["1"],
+        }
+
+
+async def test_static_element_replacing_dynamic_element_unmounts_it():
+    footer = reactpy.static(html.footer({"key": "footer"}, "static"))
+    set_static = Ref(None)
+    unmounted = Ref(False)
+
+    @component
+    def Child():
+        use_effect(lambda: lambda: unmounted.set_current(True), [])
+        return html.span("dynamic")
+
+    @component
+    def Page():
+        is_static, set_static.current = use_state(False)
+        if is_static:
+            return html.div(footer)
+        return html.div(
+            html.footer({"key": "footer", "onClick": lambda event: None}, Child())
+        )
+
+    async with layout_runner(Layout(Page())) as runner:
+        await runner.render()
+        assert len(runner.layout._event_handlers) == 1
+
+        set_static.current(True)
+        tree = await runner.render()
+        assert tree["children"][0]["children"][0] == footer.model
+        assert unmounted.current
+        assert not runner.layout._event_handlers
+
+
+async def test_layout_stats():
+    handler = StaticEventHandler()
+
+    @component
+    def Counter():
+        count, set_count = use_state(0)
+        return html.button(
+            {"onClick": handler.use(lambda event: set_count(count + 1))},
+            Label(count),
+        )
+
+    @component
+    def Label(count):
+        return html.span(count)
+
+    with patch.object(REACTPY_METRICS, "current", True):
+        async with layout_runner(Layout(Counter())) as runner:
+            await runner.render()
+            stats = runner.layout.stats()
+            assert stats["updates"] == 1
+            # the counter, the button, the label, and the span
+            assert stats["nodes_visited"] == 4
+            assert stats["component_renders"]["Counter"]["count"] == 1
+            assert stats["component_renders"]["Label"]["count"] == 1
+            assert stats["event_updates"] == 0
+
+            await runner.layout.deliver(event_message(handler.target, {}))
+            await runner.render()
+            stats = runner.layout.stats()
+            assert stats["updates"] == 2
+            assert stats["nodes_visited"] == 8
+            assert stats["component_renders"]["Counter"]["count"] == 2
+            assert stats["component_renders"]["Counter"]["seconds"] > 0
+            assert stats["event_updates"] == 1
+            assert stats["event_update_seconds"] > 0
+            assert stats["pending_renders"] == 0
+
+
+async def test_layout_stats_are_not_recorded_by_default():
+    @component
+    def Root():
+        return html.div()
+
+    async with layout_runner(Layout(Root())) as runner:
+        await runner.render()
+        stats = runner.layout.stats()
+        assert stats["updates"] == 0
+        assert stats["component_renders"] == {}
+
+
+async def test_only_elements_which_render_are_validated():
+    set_count = Ref(None)
+    validated = []
+
+    @component
+    def Root():
+        return html.div(html.p("unchanged"), Counter())
+
+    @component
+    def Counter():
+        count, set_count.current = use_state(0)
+        return html.span(count)
+
+    with patch(
+        "reactpy.core.layout.validate_vdom_json_element", side_effect=validated.append
+    ):
+        async with layout_runner(Layout(Root())) as runner:
+            await runner.render()
+            # the root, the div, the paragraph, the counter, and the span
+            assert len(validated) == 5
+
+            validated.clear()
+            set_count.current(1)
+            await runner.render()
+            assert validated == [{"tagName": "span", "children": ["1"]}, ANY]
+
+
+@pytest.mark.parametrize("debug", [True, False])
+async def test_invalid_vdom_raises_error_from_render(debug):
+    @component
+    def Root():
+        return html.div(Child())
+
+    @component
+    def Child():
+        return reactpy.types.VdomDict(tagName=1)
+
+    # options derived from REACTPY_DEBUG are not restored by unittest.mock.patch
+    original_debug = REACTPY_DEBUG.current
+    REACTPY_DEBUG.current = debug
+    REACTPY_CHECK_VDOM_SPEC.current = True
+    try:
+        async with Layout(Root()) as layout:
+            # not rendered as an error in the component
+            with pytest.raises(JsonSchemaException, match=r"data\.tagName must be"):
+                await layout.render()
+    finally:
+        REACTPY_DEBUG.current = original_debug
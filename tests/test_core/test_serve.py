@@ -1,15 +1,25 @@
 import asyncio
+import json
 import sys
 from collections.abc import Sequence
 from typing import Any
+from unittest.mock import patch
 
 import pytest
+from anyio import create_task_group
 from jsonpointer import set_pointer
 
 import reactpy
+from reactpy.config import (
+    REACTPY_BATCH_UPDATES,
+    REACTPY_MAX_PENDING_EVENTS,
+    REACTPY_REPEATED_EVENTS,
+    REACTPY_SEND_BUFFER_SIZE,
+)
 from reactpy.core.hooks import use_effect
 from reactpy.core.layout import Layout
-from reactpy.core.serve import serve_layout
+from reactpy.core.serve import _EventDispatcher, serve_layout
+from reactpy.core.tracing import ChromeTraceSink, set_tracer
 from reactpy.testing import StaticEventHandler
 from reactpy.types import LayoutUpdateMessage
 from tests.tooling.aio import Event
@@ -149,3 +159,220 @@ async def test_dispatcher_handles_more_than_one_event_at_a_time():
         await second_event_did_execute.wait()
     finally:
         task.cancel()
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="ExceptionGroup not available")
+async def test_dispatch_is_traced(tmp_path):
+    events, _ = make_events_and_expected_model()
+    _, send, recv = make_send_recv_callbacks(events)
+    sink = ChromeTraceSink(tmp_path / "trace.json")
+    set_tracer(sink)
+    try:
+        with pytest.raises(ExceptionGroup):
+            await asyncio.wait_for(serve_layout(Layout(Counter()), send, recv), 1)
+    finally:
+        set_tracer(None)
+        sink.close()
+
+    trace_events = json.loads((tmp_path / "trace.json").read_text())
+    renders = [e for e in trace_events if e["cat"] == "render"]
+    assert len(renders) == 5
+    assert {e["name"] for e in renders} == {"Counter"}
+    assert renders[0]["args"] == {"key": None, "path": "/"}
+    assert len([e for e in trace_events if e["cat"] == "deliver"]) == 4
+    # the last update is not traced since sending it fails
+    assert len([e for e in trace_events if e["cat"] == "send"]) == 4
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in trace_events)
+
+
+async def serve_handler(function, events):
+    """Serve a layout with a single event handler and deliver the given event data"""
+    handler = StaticEventHandler()
+    did_render = Event()
+
+    @reactpy.component
+    def Button():
+        use_effect(did_render.set)
+        return reactpy.html.button({"onClick": handler.use(function)})
+
+    recv_queue = asyncio.Queue()
+    task = asyncio.create_task(
+        serve_layout(Layout(Button()), asyncio.Queue().put, recv_queue.get)
+    )
+    await did_render.wait()
+    for data in events:
+        await recv_queue.put(event_message(handler.target, data))
+    return task
+
+
+@pytest.mark.parametrize(
+    "policy, expected",
+    [
+        ("queue", [0, 1, 2, 3]),
+        ("coalesce", [0, 3]),
+        ("drop", [0]),
+    ],
+)
+async def test_repeated_events_for_one_target(policy, expected):
+    delivered = []
+    release = asyncio.Event()
+
+    async def handle(value):
+        delivered.append(value)
+        await release.wait()
+
+    with patch.object(REACTPY_REPEATED_EVENTS, "current", policy):
+        task = await serve_handler(handle, range(4))
+    try:
+        # events for the same target are handled one at a time
+        await asyncio.sleep(0.1)
+        assert delivered == [0]
+        release.set()
+        await asyncio.sleep(0.1)
+        assert delivered == expected
+    finally:
+        task.cancel()
+
+
+async def test_max_pending_events():
+    handlers = [StaticEventHandler() for _ in range(3)]
+    started = []
+    release = asyncio.Event()
+    did_render = Event()
+
+    @reactpy.component
+    def Buttons():
+        use_effect(did_render.set)
+
+        def make_handler(index):
+            async def handle():
+                started.append(index)
+                await release.wait()
+
+            return handlers[index].use(handle)
+
+        return reactpy.html.div(
+            *[reactpy.html.button({"onClick": make_handler(i)}) for i in range(3)]
+        )
+
+    recv_queue = asyncio.Queue()
+    with patch.object(REACTPY_MAX_PENDING_EVENTS, "current", 2):
+        task = asyncio.create_task(
+            serve_layout(Layout(Buttons()), asyncio.Queue().put, recv_queue.get)
+        )
+        await did_render.wait()
+    try:
+        for handler in handlers:
+            await recv_queue.put(event_message(handler.target))
+        await asyncio.sleep(0.1)
+        assert started == [0, 1]
+        release.set()
+        await asyncio.sleep(0.1)
+        assert started == [0, 1, 2]
+    finally:
+        task.cancel()
+
+
+async def test_pending_event_slots_are_released_when_delivery_fails():
+    class FailingLayout:
+        async def deliver(self, event):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("failed to deliver")
+
+    with patch.object(REACTPY_MAX_PENDING_EVENTS, "current", 2):
+        with pytest.raises(ExceptionGroup):
+            async with create_task_group() as task_group:
+                dispatcher = _EventDispatcher(task_group, FailingLayout())
+                # the second event is queued behind the first
+                await dispatcher.dispatch(event_message("a"))
+                await dispatcher.dispatch(event_message("a"))
+
+    assert dispatcher._slots.value == 2
+
+
+class ScriptedLayout:
+    """A layout whose updates are given by the test rather than rendered"""
+
+    def __init__(self):
+        self.updates = asyncio.Queue()
+        self.render_count = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+    async def render(self):
+        self.render_count += 1
+        return await self.updates.get()
+
+    async def deliver(self, event):  # nocov
+        return None
+
+
+async def serve_blocked_client(layout):
+    """Serve a layout to a client which receives nothing until it is released"""
+    sent = []
+    release = asyncio.Event()
+
+    async def send(message):
+        await release.wait()
+        sent.append(message)
+
+    task = asyncio.create_task(serve_layout(layout, send, asyncio.Event().wait))
+    return sent, release, task
+
+
+@pytest.mark.parametrize("batch_updates", [False, True])
+async def test_unsent_updates_are_dropped_when_replaced(batch_updates):
+    layout = ScriptedLayout()
+    with patch.object(REACTPY_BATCH_UPDATES, "current", batch_updates):
+        sent, release, task = await serve_blocked_client(layout)
+        await asyncio.sleep(0.01)
+    try:
+        first = {"type": "layout-update", "path": "", "model": {"tagName": ""}}
+        await layout.updates.put(first)
+        await asyncio.sleep(0.01)  # the first update is now being sent
+
+        updates = [
+            {"type": "layout-update", "path": "/children/0", "model": "a"},
+            {"type": "layout-update", "path": "/children/1", "changes": []},
+            {"type": "layout-update", "path": "/children/0", "model": "c"},
+            {"type": "layout-update", "path": "", "changes": []},
+            {"type": "layout-update", "path": "/children/1", "model": "e"},
+        ]
+        for update in updates:
+            await layout.updates.put(update)
+        await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.sleep(0.01)
+
+        # batches are only sent to clients when they have been enabled
+        assert sent == (
+            [first, {"type": "layout-update-batch", "updates": updates[1:]}]
+            if batch_updates
+            else [first, *updates[1:]]
+        )
+    finally:
+        task.cancel()
+
+
+async def test_send_buffer_size():
+    layout = ScriptedLayout()
+    with patch.object(REACTPY_SEND_BUFFER_SIZE, "current", 1):
+        sent, release, task = await serve_blocked_client(layout)
+        await asyncio.sleep(0.01)
+    try:
+        for i in range(3):
+            await layout.updates.put(
+                {"type": "layout-update", "path": f"/{i}", "model": i}
+            )
+        await asyncio.sleep(0.01)
+        # one update is being sent while the next fills the buffer
+        assert layout.render_count == 2
+        release.set()
+        await asyncio.sleep(0.01)
+        assert [update["model"] for update in sent] == [0, 1, 2]
+    finally:
+        task.cancel()
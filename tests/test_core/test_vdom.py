@@ -6,7 +6,12 @@ from fastjsonschema import JsonSchemaException
 import reactpy
 from reactpy.config import REACTPY_DEBUG
 from reactpy.core.events import EventHandler
-from reactpy.core.vdom import Vdom, is_vdom, validate_vdom_json
+from reactpy.core.vdom import (
+    Vdom,
+    is_vdom,
+    validate_vdom_json,
+    validate_vdom_json_element,
+)
 from reactpy.types import VdomDict, VdomTypeDict
 
 FAKE_EVENT_HANDLER = EventHandler(lambda data: None)
@@ -299,6 +304,14 @@ def test_invalid_vdom(value, error_message_pattern):
         validate_vdom_json(value)
 
 
+def test_validate_vdom_json_element_does_not_validate_children():
+    validate_vdom_json_element({"tagName": "div", "children": [{"tagName": None}]})
+    with pytest.raises(JsonSchemaException, match=r"data\.children\[0\] must be"):
+        validate_vdom_json_element({"tagName": "div", "children": [None]})
+    with pytest.raises(JsonSchemaException, match=r"data\.attributes must be object"):
+        validate_vdom_json_element({"tagName": "div", "attributes": None})
+
+
 @pytest.mark.skipif(not REACTPY_DEBUG.current, reason="Only warns in debug mode")
 def test_warn_cannot_verify_keypath_for_genereators():
     with pytest.warns(UserWarning) as record:
@@ -343,3 +356,79 @@ def test_invalid_vdom_keys():
 
     with pytest.raises(ValueError, match=r"VdomDict requires a 'tagName' key."):
         reactpy.types.VdomDict(foo="bar")
+
+
+def test_static_model_matches_model_rendered_by_layout():
+    element = reactpy.html.div(
+        {"className": "header", "key": "header"},
+        reactpy.html.h1("Title", None, 1),
+        reactpy.html.img({"src": "logo.png"}),
+    )
+    assert reactpy.static(element).model == {
+        "tagName": "div",
+        "attributes": {"className": "header", "key": "header"},
+        "children": [
+            {"tagName": "h1", "children": ["Title", "1"]},
+            {"tagName": "img", "attributes": {"src": "logo.png"}},
+        ],
+    }
+
+
+def test_static_element_cannot_have_components_or_event_handlers():
+    @reactpy.component
+    def Child():
+        return None
+
+    with pytest.raises(ValueError, match="cannot contain components"):
+        reactpy.static(reactpy.html.div(Child()))
+
+    with pytest.raises(ValueError, match="cannot have event handlers"):
+        reactpy.static(
+            reactpy.html.div(reactpy.html.button({"onClick": lambda event: None}))
+        )
+
+
+def test_static_element_is_immutable():
+    element = reactpy.static(
+        reactpy.html.div(
+            {"className": "a", "style": {"color": "red"}},
+            reactpy.html.span({"id": "b"}, "hello"),
+        )
+    )
+    for change in [
+        lambda: element.__setitem__("children", ["hello"]),
+        lambda: element.__delitem__("children"),
+        lambda: element.update(tagName="p"),
+        lambda: element.setdefault("importSource", {}),
+        lambda: element.pop("attributes"),
+        element.popitem,
+        element.clear,
+        lambda: element.__ior__({"tagName": "p"}),
+    ]:
+        with pytest.raises(TypeError, match="cannot be changed"):
+            change()
+
+    with pytest.raises(TypeError):
+        element["attributes"]["className"] = "b"
+    with pytest.raises(TypeError):
+        element["attributes"]["style"]["color"] = "blue"
+    with pytest.raises(AttributeError):
+        element["children"].append("world")
+    (child,) = element["children"]
+    with pytest.raises(TypeError, match="cannot be changed"):
+        child["children"] = ["world"]
+    with pytest.raises(TypeError):
+        child["attributes"]["id"] = "c"
+
+
+def test_static_model_does_not_change_with_given_element():
+    style = {"color": "red"}
+    element = reactpy.html.div({"style": style}, reactpy.html.span("hello"))
+    static_element = reactpy.static(element)
+    style["color"] = "blue"
+    element["children"][0]["children"] = ["world"]
+    assert static_element.model == {
+        "tagName": "div",
+        "attributes": {"style": {"color": "red"}},
+        "children": [{"tagName": "span", "children": ["hello"]}],
+    }
@@ -3,12 +3,13 @@ from __future__ import annotations
 import logging
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
+from copy import deepcopy
 from typing import Any
 
-from jsonpointer import set_pointer
+from jsonpointer import JsonPointer, resolve_pointer, set_pointer
 
 from reactpy.core.layout import Layout
-from reactpy.types import VdomJson
+from reactpy.types import LayoutUpdateChange, LayoutUpdateMessage, VdomJson
 from tests.tooling.common import event_message
 
 logger = logging.getLogger(__name__)
@@ -27,14 +28,23 @@ class LayoutRunner:
 
     async def render(self) -> VdomJson:
         update = await self.layout.render()
+        if update["type"] == "layout-update-batch":
+            for batched_update in update["updates"]:
+                self.apply(batched_update)
+        else:
+            self.apply(update)
+        return self.model
+
+    def apply(self, update: LayoutUpdateMessage) -> None:
         logger.info(f"Rendering element at {update['path'] or '/'!r}")
-        if not update["path"]:
+        if "changes" in update:
+            self.model = apply_changes(self.model, update["path"], update["changes"])
+        elif not update["path"]:
             self.model = update["model"]
         else:
             self.model = set_pointer(
                 self.model, update["path"], update["model"], inplace=False
             )
-        return self.model
 
     async def trigger(self, element: VdomJson, event_name: str, *data: Any) -> None:
         event_handler = element.get("eventHandlers", {}).get(event_name, {})
@@ -42,3 +52,24 @@ class LayoutRunner:
         if not event_handler:
             raise ValueError(f"Element has no event handler for {event_name}")
         await self.layout.deliver(event_message(event_handler["target"], *data))
+
+
+def apply_changes(model: Any, path: str, changes: list[LayoutUpdateChange]) -> VdomJson:
+    """Apply the changes of a layout update to a copy of the given model"""
+    model = deepcopy(model)
+    target = resolve_pointer(model, path)
+    for change in changes:
+        if change["op"] == "move":
+            from_parent, from_part = JsonPointer(change["from"]).to_last(target)
+            value = from_parent.pop(from_part)
+            parent, part = JsonPointer(change["path"]).to_last(target)
+            parent.insert(part, value)
+            continue
+        parent, part = JsonPointer(change["path"]).to_last(target)
+        if change["op"] == "remove":
+            del parent[part]
+        elif change["op"] == "add" and isinstance(parent, list):
+            parent.insert(part, change["value"])
+        else:
+            parent[part] = change["value"]
+    return model